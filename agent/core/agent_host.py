@@ -0,0 +1,195 @@
+"""Shared Agent Host - Serve many agents from one Python process
+
+Each agent normally runs as its own Python process that imports gradio (and
+often llama_index) on its own. In shared-host mode a single host process runs
+one uvicorn/FastAPI server and mounts every agent's Gradio app under
+``/agents/<name>/`` with ``gr.mount_gradio_app``, so agents share imported
+libraries and the event loop.
+
+Agent scripts are loaded with the multi-server host's ``load_blocks``: each
+runs unchanged in its own module namespace, so module globals stay separate
+per agent, and its ``launch()`` call is intercepted so the Blocks instance and
+the launch options are captured instead of blocking in ``launch()``.
+
+This file runs as a script (``python agent_host.py --port N``) and is also
+imported by ``AgentRunner`` for the small HTTP client at the bottom, so it
+only imports the standard library at module level.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import sys
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+AGENT_MOUNT_PREFIX = "/agents"
+CONTROL_PREFIX = "/_host"
+
+
+def agent_mount_path(name: str) -> str:
+    """URL path an agent is mounted under"""
+    return f"{AGENT_MOUNT_PREFIX}/{name}"
+
+
+class AgentHost:
+    """Loads agent scripts and mounts their Gradio apps on one FastAPI app"""
+
+    def __init__(self, app):
+        self.app = app
+        self._agents: Dict[str, Dict[str, Any]] = {}
+
+    async def add_agent(self, name: str, agent_file: Path) -> str:
+        """Load ``agent_file`` and mount it; returns the mount path"""
+        import gradio as gr
+
+        # Same launch capture as the multi-server host
+        from gradio_mcp_playground.multi_server import load_blocks, mount_options
+
+        if name in self._agents:
+            await self.remove_agent(name)
+
+        blocks, launch_kwargs = await asyncio.to_thread(
+            load_blocks, agent_file, {"AGENT_NAME": name}
+        )
+
+        path = agent_mount_path(name)
+        gr.mount_gradio_app(self.app, blocks, path=path, **mount_options(launch_kwargs))
+        gradio_app = self.app.routes[-1].app
+
+        # The host is already serving, so run the startup events that the
+        # host lifespan would otherwise run for this app
+        stack = contextlib.AsyncExitStack()
+        await stack.enter_async_context(gradio_app.router.lifespan_context(gradio_app))
+        blocks.run_startup_events()
+        await blocks.run_extra_startup_events()
+
+        self._agents[name] = {
+            "path": path,
+            "file": str(agent_file),
+            "blocks": blocks,
+            "stack": stack,
+        }
+        return path
+
+    async def remove_agent(self, name: str) -> bool:
+        """Unmount an agent and stop its queue"""
+        entry = self._agents.pop(name, None)
+        if entry is None:
+            return False
+
+        self.app.router.routes = [
+            route
+            for route in self.app.router.routes
+            if getattr(route, "path", None) != entry["path"]
+        ]
+        entry["blocks"]._queue.close()
+        entry["blocks"].is_running = False
+        with contextlib.suppress(Exception):
+            await entry["stack"].aclose()
+        return True
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "agents": {
+                name: {"path": info["path"], "file": info["file"]}
+                for name, info in self._agents.items()
+            },
+        }
+
+
+def create_app():
+    """Create the host FastAPI app with its control endpoints"""
+    from fastapi import FastAPI, HTTPException
+
+    app = FastAPI(title="Gradio MCP Agent Host")
+    host = AgentHost(app)
+    app.state.host = host
+
+    @app.get(f"{CONTROL_PREFIX}/health")
+    async def health():
+        return host.describe()
+
+    @app.post(f"{CONTROL_PREFIX}/agents")
+    async def add_agent(payload: Dict[str, str]):
+        name = payload.get("name", "")
+        agent_file = Path(payload.get("file", ""))
+        if not name or not agent_file.is_file():
+            raise HTTPException(status_code=400, detail="name and an existing file are required")
+        try:
+            path = await host.add_agent(name, agent_file)
+        except Exception as e:
+            raise HTTPException(status_code=400, detail=f"{type(e).__name__}: {e}")
+        return {"name": name, "path": path}
+
+    @app.delete(f"{CONTROL_PREFIX}/agents/{{name}}")
+    async def remove_agent(name: str):
+        if not await host.remove_agent(name):
+            raise HTTPException(status_code=404, detail=f"Agent '{name}' is not mounted")
+        return {"name": name, "removed": True}
+
+    return app
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Serve several agents from one process")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--workspace", default=None, help="Directory agents import siblings from")
+    args = parser.parse_args(argv)
+
+    if args.workspace:
+        sys.path.insert(0, args.workspace)
+
+    import uvicorn
+
+    uvicorn.run(create_app(), host=args.host, port=args.port, log_level="warning")
+
+
+class SharedHostClient:
+    """Minimal HTTP client for a running host's control endpoints"""
+
+    def __init__(self, port: int, host: str = "127.0.0.1", timeout: float = 120.0):
+        self.base_url = f"http://{host}:{port}{CONTROL_PREFIX}"
+        self.timeout = timeout
+
+    def _request(
+        self, method: str, path: str, payload: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.base_url + path,
+            data=data,
+            method=method,
+            headers={"Content-Type": "application/json"},
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                return json.loads(response.read() or b"{}")
+        except urllib.error.HTTPError as e:
+            try:
+                detail = json.loads(e.read()).get("detail", str(e))
+            except ValueError:
+                detail = str(e)
+            raise RuntimeError(detail) from None
+
+    def add_agent(self, name: str, agent_file: Path) -> str:
+        return self._request("POST", "/agents", {"name": name, "file": str(agent_file)})["path"]
+
+    def remove_agent(self, name: str) -> bool:
+        try:
+            return self._request("DELETE", f"/agents/{name}").get("removed", False)
+        except RuntimeError:
+            return False
+
+    def health(self) -> Dict[str, Any]:
+        return self._request("GET", "/health")
+
+
+if __name__ == "__main__":
+    main()
@@ -14,11 +14,60 @@ import signal
 import psutil
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Dict, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any
 import logging
 
+from .agent_host import SharedHostClient
+
 logger = logging.getLogger(__name__)
 
+# Notify open dashboards when agents start or stop
+try:
+    from gradio_mcp_playground.change_bus import TOPIC_AGENTS, get_change_bus
+except ImportError:
+    get_change_bus = None
+
+# Share port reservations with GradioMCPServer and other runners
+try:
+    from gradio_mcp_playground.port_allocator import get_port_allocator
+except ImportError:
+    get_port_allocator = None
+
+# Launch agents from the pre-forked interpreter with heavy imports loaded
+try:
+    from gradio_mcp_playground.prefork import spawn_app
+except ImportError:
+    spawn_app = None
+
+# Probe the agent's port so start_agent returns once it is actually serving
+try:
+    from gradio_mcp_playground.readiness import wait_until_ready
+except ImportError:
+    wait_until_ready = None
+
+# Seconds a serving agent gets to accept HTTP before start_agent gives up
+AGENT_READY_TIMEOUT = 60.0
+
+# Sample agent CPU/memory in the background instead of on every status call
+try:
+    from gradio_mcp_playground.metrics_sampler import get_metrics_sampler
+except ImportError:
+    get_metrics_sampler = None
+
+# Keep reading agent stdout/stderr so a chatty agent never blocks on a full pipe
+try:
+    from gradio_mcp_playground.output_drain import OutputDrain
+    from gradio_mcp_playground.cache_manager import get_cache_manager
+    from gradio_mcp_playground.utils import tail_lines
+except ImportError:
+    OutputDrain = None
+
+
+def _publish_agents_changed() -> None:
+    """Tell the dashboard change bus that the set of agents changed"""
+    if get_change_bus:
+        get_change_bus().publish(TOPIC_AGENTS)
+
 
 class AgentProcess:
     """Represents a running agent process with metadata"""
@@ -32,6 +81,28 @@ class AgentProcess:
         self.status = "starting"
         self.error_count = 0
         self.last_error = None
+        self._proc = None
+        self.output = None
+        self.ready_seconds: Optional[float] = None
+        self.shared_host = False  # Mounted in the shared host process
+        self.url_path = None
+    
+    @property
+    def metrics_key(self) -> str:
+        """Key of this agent in the metrics sampler"""
+        return f"agent:{self.name}"
+    
+    def _latest_sample(self):
+        """Most recent background sample, if the sampler has one"""
+        if get_metrics_sampler:
+            return get_metrics_sampler().latest(self.metrics_key)
+        return None
+    
+    def _handle(self) -> psutil.Process:
+        """Cached process handle so cpu_percent() has a previous reading"""
+        if self._proc is None or self._proc.pid != self.pid:
+            self._proc = psutil.Process(self.pid)
+        return self._proc
     
     @property
     def pid(self) -> int:
@@ -59,8 +130,10 @@ class AgentProcess:
         """Get memory usage in MB"""
         try:
             if self.is_running:
-                proc = psutil.Process(self.pid)
-                return proc.memory_info().rss / 1024 / 1024  # Convert to MB
+                sample = self._latest_sample()
+                if sample:
+                    return sample.rss_mb
+                return self._handle().memory_info().rss / 1024 / 1024  # Convert to MB
         except:
             pass
         return None
@@ -69,8 +142,10 @@ class AgentProcess:
         """Get CPU usage percentage"""
         try:
             if self.is_running:
-                proc = psutil.Process(self.pid)
-                return proc.cpu_percent()
+                sample = self._latest_sample()
+                if sample:
+                    return sample.cpu_percent
+                return self._handle().cpu_percent()
         except:
             pass
         return None
@@ -79,13 +154,30 @@ class AgentProcess:
 class AgentRunner:
     """Manages agent processes - starting, stopping, and monitoring"""
     
-    def __init__(self, workspace_dir: Optional[Path] = None):
+    def __init__(self, workspace_dir: Optional[Path] = None, shared_host: Optional[bool] = None):
         self.workspace_dir = workspace_dir or Path.cwd() / "agent_workspace"
         self.workspace_dir.mkdir(exist_ok=True)
         
         # Registry of running processes
         self.running_agents: Dict[str, AgentProcess] = {}
         
+        # Optionally mount agents in one shared host process instead
+        if shared_host is None:
+            shared_host = os.environ.get("GMP_AGENT_SHARED_HOST", "0") == "1"
+        self.shared_host = shared_host
+        self._host_process = None
+        self._host_port: Optional[int] = None
+        self._host_client: Optional[SharedHostClient] = None
+        self._host_output = None
+        self._host_lock = threading.Lock()
+        
+        # Per-agent output logs, kept out of the config dir and the workspace:
+        # both are watched by the dashboard, so every log line would refresh it
+        if OutputDrain:
+            self.log_dir = get_cache_manager().cache_dir / "logs" / "agents"
+        else:
+            self.log_dir = self.workspace_dir / "logs"
+        
         # Port management for web interfaces
         self._port_counter = 7860
         self._used_ports = set()
@@ -94,8 +186,13 @@ class AgentRunner:
         import atexit
         atexit.register(self.cleanup_all)
     
-    def _get_next_port(self) -> int:
+    def _get_next_port(self, name: str = "") -> int:
         """Get next available port for agent web interface"""
+        if get_port_allocator:
+            port = get_port_allocator().reserve(label=f"agent:{name}")
+            self._used_ports.add(port)
+            return port
+        
         while self._port_counter in self._used_ports:
             self._port_counter += 1
         
@@ -107,6 +204,8 @@ class AgentRunner:
     def _release_port(self, port: int) -> None:
         """Release a port back to the pool"""
         self._used_ports.discard(port)
+        if get_port_allocator:
+            get_port_allocator().release(port)
     
     def _create_agent_file(self, name: str, code: str) -> Path:
         """Create a Python file for the agent code in agents directory"""
@@ -125,13 +224,22 @@ class AgentRunner:
         lines = code.split('\n')
         return '\n'.join(indent + line if line.strip() else line for line in lines)
     
-    def start_agent(self, name: str, code: str) -> Tuple[bool, str, Dict[str, Any]]:
+    def start_agent(
+        self,
+        name: str,
+        code: str,
+        wait_ready: Optional[bool] = None,
+        ready_timeout: float = AGENT_READY_TIMEOUT
+    ) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Start an agent as a persistent background process
         
         Args:
             name: Unique name for the agent
             code: Python code to execute as the agent
+            wait_ready: Wait until the agent serves HTTP on its port. Defaults
+                to waiting when the code launches a Gradio app.
+            ready_timeout: Seconds to wait for the agent to start serving
             
         Returns:
             Tuple of (success, message, metadata)
@@ -179,8 +287,11 @@ class AgentRunner:
                     "line": e.lineno
                 }
             
+            if self.shared_host:
+                return self._start_shared_agent(name, agent_file, ready_timeout)
+            
             # Get port for web interface (if the code uses Gradio)
-            port = self._get_next_port()
+            port = self._get_next_port(name)
             logger.info(f"Assigned port {port} to agent '{name}'")
             
             # Set up environment
@@ -188,47 +299,84 @@ class AgentRunner:
             env['PYTHONPATH'] = str(Path(__file__).parent.parent.parent)
             env['AGENT_NAME'] = name
             env['AGENT_PORT'] = str(port)
+            env['GRADIO_SERVER_PORT'] = str(port)  # Honoured by a bare launch()
             
             logger.info(f"Starting process for agent '{name}' on port {port}")
             
-            # Start the process
-            process = subprocess.Popen(
-                [sys.executable, str(agent_file)],
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                env=env,
-                cwd=self.workspace_dir,  # Use agents directory as working directory
-                preexec_fn=os.setsid if os.name != 'nt' else None,
-                encoding='utf-8',  # Handle Unicode characters
-                errors='replace'  # Replace any problematic characters
-            )
+            # Start the process (forked from the warm pre-fork zygote if available)
+            process = self._spawn(agent_file, env)
+            
+            # The port now lives as long as the agent process
+            if get_port_allocator:
+                get_port_allocator().assign(port, process.pid)
             
             # Create agent process object
             agent_process = AgentProcess(name, process, agent_file, port)
             self.running_agents[name] = agent_process
-            
-            # Give it a moment to start
-            time.sleep(0.5)
+            if OutputDrain:
+                agent_process.output = OutputDrain(self.log_dir / f"{name}.log")
+                agent_process.output.attach(process.stdout, "stdout")
+                agent_process.output.attach(process.stderr, "stderr")
+            if get_metrics_sampler:
+                get_metrics_sampler().track(agent_process.metrics_key, process.pid)
+            
+            if wait_ready is None:
+                wait_ready = '.launch(' in code
+            
+            if wait_ready and wait_until_ready:
+                # Return only once the agent accepts HTTP on its port
+                readiness = wait_until_ready(port, process=process, timeout=ready_timeout)
+            else:
+                # Nothing to probe; just make sure it did not die on startup
+                time.sleep(0.5)
+                readiness = None
             
             # Check if it started successfully
             if not agent_process.is_running:
-                logger.error(f"Process for agent '{name}' died immediately")
-                # Process died immediately, get error info
+                logger.error(f"Process for agent '{name}' died during startup")
+                # Process died, get error info
                 try:
-                    stdout, stderr = process.communicate(timeout=1)
+                    if agent_process.output:
+                        # The drainers own the pipes; wait for them to hit EOF
+                        agent_process.output.join(timeout=1)
+                        stdout = "\n".join(agent_process.output.tail(label="stdout"))
+                        stderr = "\n".join(agent_process.output.tail(label="stderr"))
+                    else:
+                        stdout, stderr = process.communicate(timeout=1)
                     error_msg = stderr if stderr else "Process died immediately"
                     logger.error(f"Agent '{name}' stderr: {stderr}")
                     logger.error(f"Agent '{name}' stdout: {stdout}")
                 except Exception as e:
                     error_msg = f"Failed to get process output: {str(e)}"
                     logger.error(f"Exception getting output for '{name}': {e}")
+                exit_code = process.poll()
                 self._cleanup_agent(name)
                 return False, f"Agent failed to start: {error_msg}", {
                     "status": "startup_failed",
-                    "error": error_msg
+                    "error": error_msg,
+                    "exit_code": exit_code
+                }
+            
+            if readiness is not None and not readiness.ready:
+                # Alive but not serving: stop it rather than leave a dead iframe
+                logger.error(f"Agent '{name}' {readiness.reason}")
+                recent = self.get_logs(name, 20)
+                self.stop_agent(name)
+                error_msg = readiness.reason
+                if recent:
+                    error_msg += "\n" + "\n".join(recent)
+                return False, f"Agent failed to start: {error_msg}", {
+                    "status": "startup_timeout",
+                    "error": readiness.reason,
+                    "elapsed_seconds": readiness.elapsed
                 }
             
+            if readiness is not None:
+                agent_process.ready_seconds = readiness.elapsed
+                logger.info(f"Agent '{name}' serving on port {port} after {readiness.elapsed:.2f}s")
+            
             agent_process.status = "running"
+            _publish_agents_changed()
             logger.info(f"✅ Successfully started agent '{name}' with PID {process.pid} on port {port}")
             
             return True, f"Agent '{name}' started successfully", {
@@ -236,6 +384,7 @@ class AgentRunner:
                 "pid": process.pid,
                 "port": port,
                 "start_time": agent_process.start_time.isoformat(),
+                "time_to_ready": agent_process.ready_seconds,
                 "agent_file": str(agent_file)
             }
             
@@ -246,6 +395,154 @@ class AgentRunner:
                 "error": str(e)
             }
     
+    def _spawn(self, script: Path, env: Dict[str, str], args: Tuple[str, ...] = ()):
+        """Start ``python script`` with piped, text-mode output in the workspace"""
+        if spawn_app:
+            return spawn_app(
+                script,
+                args,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                env=env,
+                cwd=self.workspace_dir,  # Use agents directory as working directory
+                start_new_session=os.name != 'nt',
+                encoding='utf-8',  # Handle Unicode characters
+                errors='replace'  # Replace any problematic characters
+            )
+        return subprocess.Popen(
+            [sys.executable, str(script), *args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            env=env,
+            cwd=self.workspace_dir,  # Use agents directory as working directory
+            preexec_fn=os.setsid if os.name != 'nt' else None,
+            encoding='utf-8',  # Handle Unicode characters
+            errors='replace'  # Replace any problematic characters
+        )
+    
+    def _ensure_shared_host(self, timeout: float) -> Tuple[bool, str]:
+        """Start the shared agent host process if it is not running"""
+        if self._host_process is not None and self._host_process.poll() is None:
+            return True, "running"
+        
+        self._stop_shared_host()
+        port = self._get_next_port("shared-host")
+        env = os.environ.copy()
+        env['PYTHONPATH'] = str(Path(__file__).parent.parent.parent)
+        
+        logger.info(f"Starting shared agent host on port {port}")
+        host_script = Path(__file__).with_name("agent_host.py")
+        process = self._spawn(
+            host_script, env, ("--port", str(port), "--workspace", str(self.workspace_dir))
+        )
+        if get_port_allocator:
+            get_port_allocator().assign(port, process.pid)
+        if OutputDrain:
+            self._host_output = OutputDrain(self.log_dir / "_shared_host.log")
+            self._host_output.attach(process.stdout, "stdout")
+            self._host_output.attach(process.stderr, "stderr")
+        self._host_process = process
+        self._host_port = port
+        self._host_client = SharedHostClient(port)
+        
+        if wait_until_ready:
+            readiness = wait_until_ready(
+                port, process=process, timeout=timeout, http_path="/_host/health"
+            )
+            if not readiness.ready:
+                error_msg = readiness.reason
+                if self._host_output:
+                    self._host_output.join(timeout=1)
+                    error_msg += "\n" + "\n".join(self._host_output.tail(20, label="stderr"))
+                self._stop_shared_host()
+                return False, error_msg
+        return True, "started"
+    
+    def _stop_shared_host(self) -> None:
+        """Stop the shared agent host process and release its port"""
+        process, self._host_process = self._host_process, None
+        if process is not None and process.poll() is None:
+            logger.info(f"Stopping shared agent host (PID: {process.pid})")
+            try:
+                if os.name != 'nt':
+                    os.killpg(os.getpgid(process.pid), signal.SIGTERM)
+                else:
+                    process.terminate()
+                process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait(timeout=2)
+            except ProcessLookupError:
+                pass
+        if self._host_port:
+            self._release_port(self._host_port)
+            self._host_port = None
+        if self._host_output:
+            self._host_output.close()
+            self._host_output = None
+        self._host_client = None
+    
+    def _start_shared_agent(
+        self, name: str, agent_file: Path, ready_timeout: float
+    ) -> Tuple[bool, str, Dict[str, Any]]:
+        """Mount an agent in the shared host process"""
+        with self._host_lock:
+            ok, error_msg = self._ensure_shared_host(ready_timeout)
+            if not ok:
+                return False, f"Shared agent host failed to start: {error_msg}", {
+                    "status": "startup_failed",
+                    "error": error_msg
+                }
+            
+            started = time.monotonic()
+            try:
+                url_path = self._host_client.add_agent(name, agent_file)
+            except Exception as e:
+                error_msg = str(e)
+                logger.error(f"Shared host could not load agent '{name}': {error_msg}")
+                return False, f"Agent failed to start: {error_msg}", {
+                    "status": "startup_failed",
+                    "error": error_msg
+                }
+            
+            process = self._host_process
+            port = self._host_port
+        
+        agent_process = AgentProcess(name, process, agent_file, port)
+        agent_process.shared_host = True
+        agent_process.url_path = url_path
+        self.running_agents[name] = agent_process
+        if get_metrics_sampler:
+            get_metrics_sampler().track(agent_process.metrics_key, process.pid)
+        
+        if wait_until_ready:
+            readiness = wait_until_ready(
+                port, process=process, timeout=ready_timeout, http_path=f"{url_path}/"
+            )
+            if not readiness.ready:
+                self.stop_agent(name)
+                return False, f"Agent failed to start: {readiness.reason}", {
+                    "status": "startup_timeout",
+                    "error": readiness.reason,
+                    "elapsed_seconds": readiness.elapsed
+                }
+        agent_process.ready_seconds = time.monotonic() - started
+        
+        agent_process.status = "running"
+        _publish_agents_changed()
+        logger.info(f"✅ Mounted agent '{name}' at {url_path} in shared host on port {port}")
+        
+        return True, f"Agent '{name}' started successfully", {
+            "status": "running",
+            "pid": process.pid,
+            "port": port,
+            "url_path": url_path,
+            "shared_host": True,
+            "start_time": agent_process.start_time.isoformat(),
+            "time_to_ready": agent_process.ready_seconds,
+            "agent_file": str(agent_file)
+        }
+    
     def stop_agent(self, name: str) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Stop a running agent process
@@ -271,6 +568,21 @@ class AgentRunner:
                     "status": "already_stopped"
                 }
             
+            if agent_process.shared_host:
+                # Unmount from the shared host; stop the host with its last agent
+                uptime = agent_process.uptime
+                with self._host_lock:
+                    if self._host_client:
+                        self._host_client.remove_agent(name)
+                    self._cleanup_agent(name)
+                    if not any(a.shared_host for a in self.running_agents.values()):
+                        self._stop_shared_host()
+                return True, f"Agent '{name}' stopped successfully", {
+                    "status": "stopped",
+                    "uptime_seconds": uptime.total_seconds(),
+                    "pid": agent_process.pid
+                }
+            
             # Try graceful shutdown first
             pid = agent_process.pid
             logger.info(f"Stopping agent '{name}' (PID: {pid})")
@@ -316,6 +628,16 @@ class AgentRunner:
                 "error": str(e)
             }
     
+    @staticmethod
+    def agent_url(info: Dict[str, Any], host: str = "localhost") -> str:
+        """Browser URL of a started agent from its status or start metadata
+        
+        Agents in the shared host are served under their mount path
+        (``url_path``), not at the host's root.
+        """
+        url_path = info.get("url_path")
+        return f"http://{host}:{info['port']}" + (f"{url_path}/" if url_path else "")
+    
     def get_status(self, name: str) -> Tuple[bool, str, Dict[str, Any]]:
         """
         Get status information for an agent
@@ -355,6 +677,7 @@ class AgentRunner:
             uptime = agent_process.uptime
             memory_mb = agent_process.get_memory_usage()
             cpu_percent = agent_process.get_cpu_percent()
+            sample = agent_process._latest_sample()
             
             status_info = {
                 "status": "running",
@@ -364,8 +687,13 @@ class AgentRunner:
                 "uptime_seconds": uptime.total_seconds(),
                 "uptime_human": str(uptime).split('.')[0],  # Remove microseconds
                 "start_time": agent_process.start_time.isoformat(),
+                "time_to_ready": agent_process.ready_seconds,
+                "shared_host": agent_process.shared_host,
+                "url_path": agent_process.url_path,
                 "memory_mb": memory_mb,
                 "cpu_percent": cpu_percent,
+                "num_fds": sample.num_fds if sample else None,
+                "num_threads": sample.num_threads if sample else None,
                 "error_count": agent_process.error_count,
                 "agent_file": str(agent_process.code_file)
             }
@@ -384,12 +712,33 @@ class AgentRunner:
         if name in self.running_agents:
             agent_process = self.running_agents[name]
             
-            # Release the port
-            if agent_process.port:
+            # Release the port (a shared host's port belongs to the host)
+            if agent_process.port and not agent_process.shared_host:
                 self._release_port(agent_process.port)
             
+            if get_metrics_sampler:
+                get_metrics_sampler().untrack(agent_process.metrics_key)
+            
+            if agent_process.output:
+                agent_process.output.close()
+            
             # Remove from registry
             del self.running_agents[name]
+            _publish_agents_changed()
+    
+    def get_logs(self, name: str, lines: int = 50) -> List[str]:
+        """Get the most recent stdout/stderr lines of an agent"""
+        agent_process = self.running_agents.get(name)
+        if agent_process and agent_process.output:
+            return agent_process.output.tail(lines)
+        if agent_process and agent_process.shared_host and self._host_output:
+            return self._host_output.tail(lines)
+        
+        # Agent is gone; fall back to its log file
+        log_file = self.log_dir / f"{name}.log"
+        if OutputDrain and log_file.exists():
+            return [line.rstrip('\n') for line in tail_lines(log_file, lines)]
+        return []
     
     def list_agents(self) -> Dict[str, Dict[str, Any]]:
         """Get status of all agents"""
@@ -410,6 +759,8 @@ class AgentRunner:
                 self.stop_agent(name)
             except Exception as e:
                 logger.error(f"Error stopping agent '{name}' during cleanup: {e}")
+        
+        self._stop_shared_host()
 
 
 # Global instance for the module
@@ -431,9 +782,9 @@ def get_agent_runner() -> AgentRunner:
     return _agent_runner
 
 # Convenience functions using the global instance
-def start_agent(name: str, code: str) -> Tuple[bool, str, Dict[str, Any]]:
+def start_agent(name: str, code: str, **kwargs) -> Tuple[bool, str, Dict[str, Any]]:
     """Start an agent process"""
-    return get_agent_runner().start_agent(name, code)
+    return get_agent_runner().start_agent(name, code, **kwargs)
 
 def stop_agent(name: str) -> Tuple[bool, str, Dict[str, Any]]:
     """Stop an agent process"""
@@ -6,13 +6,64 @@ and public server discovery capabilities.
 
 import asyncio
 import json
+import os
 import re
+import time
+from collections import defaultdict
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Set
 from dataclasses import dataclass
 from datetime import datetime
 import httpx
 
+try:
+    import aiohttp
+
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+try:
+    from gradio_mcp_playground.search_index import SearchIndex
+except ImportError:
+    SearchIndex = None
+
+try:
+    import numpy as np
+    from gradio_mcp_playground.search_index import STOPWORDS, TfidfMatrix, top_indices
+except ImportError:
+    TfidfMatrix = None
+
+try:
+    from gradio_mcp_playground.cache_manager import get_cache_manager
+except ImportError:
+    get_cache_manager = None
+
+# Relative weight of a term match in each field of an enhanced server entry
+SEARCH_FIELD_WEIGHTS = {
+    "name": 2.5,
+    "tags": 2.0,
+    "semantic_keywords": 1.5,
+    "description": 1.0,
+    "use_cases": 0.7,
+}
+
+# Servers sharing a tag this common are not compared through it; such a tag
+# says little about similarity and would make the similarity pass quadratic
+MAX_TAG_FANOUT = 200
+SIMILAR_SERVERS_LIMIT = 3
+
+# Seconds before a public source is asked again (GMP_DISCOVERY_INTERVAL)
+DEFAULT_DISCOVERY_INTERVAL = 3600
+DISCOVERY_TIMEOUT = 10.0
+
+# Text similarity share of a requirements match score, the weighted similarity a
+# server needs to be considered at all (about one described capability, like the
+# scan's "Supports ..." score), and the score a match needs
+TEXT_MATCH_WEIGHT = 0.8
+TEXT_MATCH_THRESHOLD = 0.15
+MATCH_THRESHOLD = 0.2
+
 
 @dataclass 
 class ServerMatch:
@@ -30,17 +81,29 @@ class EnhancedRegistry:
         try:
             import sys
             sys.path.append(str(Path(__file__).parent.parent.parent))
-            from gradio_mcp_playground.registry import ServerRegistry
-            self.gmp_registry = ServerRegistry()
+            from gradio_mcp_playground.registry import get_registry
+            self.gmp_registry = get_registry()
         except ImportError:
             self.gmp_registry = None
         
         # Local enhanced registry
         self.enhanced_registry = {}
+        self._search_index = SearchIndex(SEARCH_FIELD_WEIGHTS, fuzzy=True) if SearchIndex else None
+        # Built on first use from the complete registry; None when stale
+        self._similarity_graph: Optional[Dict[str, List[str]]] = None
+        self._match_model = None
         self.public_sources = [
             "https://api.github.com/search/repositories?q=gradio+mcp+server",
             "https://huggingface.co/api/spaces?search=mcp",
         ]
+        self.discovery_interval = float(
+            os.environ.get("GMP_DISCOVERY_INTERVAL", DEFAULT_DISCOVERY_INTERVAL)
+        )
+        self.cache_manager = get_cache_manager() if get_cache_manager else None
+        # source URL -> {server ID: server as parsed}, to merge changes only
+        self._discovered: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Latest fetch per source, for when the on-disk cache is disabled
+        self._discovery_entries: Dict[str, Dict[str, Any]] = {}
         
         # Load enhanced registry data
         self._load_enhanced_registry()
@@ -60,6 +123,19 @@ class EnhancedRegistry:
             if server_id:
                 enhanced_server = self._enhance_server_info(server)
                 self.enhanced_registry[server_id] = enhanced_server
+                self._index_server(server_id, enhanced_server)
+    
+    def _index_server(self, server_id: str, server: Dict[str, Any]) -> None:
+        """Add an enhanced server's searchable text to the search index"""
+        if self._search_index is None:
+            return
+        self._search_index.add(server_id, {
+            "name": server.get("name", ""),
+            "description": server.get("description", ""),
+            "tags": " ".join(server.get("tags", [])),
+            "semantic_keywords": " ".join(server.get("semantic_keywords", [])),
+            "use_cases": " ".join(server.get("use_cases", [])),
+        })
     
     def _get_fallback_registry(self) -> List[Dict[str, Any]]:
         """Fallback registry when GMP registry is not available"""
@@ -139,8 +215,7 @@ class EnhancedRegistry:
         # Add required skills
         enhanced["required_skills"] = self._extract_required_skills(server)
         
-        # Add similar servers
-        enhanced["similar_servers"] = self._find_similar_servers(server)
+        # Similar servers need the whole registry, see get_similar_servers()
         
         return enhanced
     
@@ -288,60 +363,171 @@ class EnhancedRegistry:
         
         return skills[:3]  # Return top 3 skills
     
-    def _find_similar_servers(self, server: Dict[str, Any]) -> List[str]:
-        """Find similar servers in the registry"""
+    @staticmethod
+    def _similarity(server: Dict[str, Any], other: Dict[str, Any]) -> float:
+        """Similarity of two servers: same category plus tag overlap (0.0 to 1.0)"""
         
-        similar = []
-        current_id = server.get("id", "")
-        current_category = server.get("category", "")
-        current_tags = set(server.get("tags", []))
+        score = 0.0
+        if server.get("category") is not None and other.get("category") == server.get("category"):
+            score += 0.5
         
-        for other_id, other_server in self.enhanced_registry.items():
-            if other_id == current_id:
-                continue
-            
-            similarity_score = 0.0
-            
-            # Category match
-            if other_server.get("category") == current_category:
-                similarity_score += 0.5
+        tags = set(server.get("tags", []))
+        other_tags = set(other.get("tags", []))
+        score += 0.5 * len(tags & other_tags) / max(len(tags | other_tags), 1)
+        return score
+    
+    def _build_similarity_graph(self) -> Dict[str, List[str]]:
+        """Most similar servers for every server in one pass
+        
+        Candidates come from category and tag inverted indexes instead of
+        comparing every pair of servers. Same-category servers that share no
+        tag all score 0.5, so only the first few of them (by ID) are scored.
+        """
+        
+        by_category = defaultdict(list)
+        by_tag = defaultdict(list)
+        for server_id, server in sorted(self.enhanced_registry.items()):
+            if server.get("category") is not None:
+                by_category[server["category"]].append(server_id)
+            for tag in set(server.get("tags", [])):
+                by_tag[tag].append(server_id)
+        
+        graph = {}
+        for server_id, server in self.enhanced_registry.items():
+            candidates = set()
+            for tag in set(server.get("tags", [])):
+                if len(by_tag[tag]) <= MAX_TAG_FANOUT:
+                    candidates.update(by_tag[tag])
             
-            # Tag overlap
-            other_tags = set(other_server.get("tags", []))
-            tag_overlap = len(current_tags & other_tags) / max(len(current_tags | other_tags), 1)
-            similarity_score += tag_overlap * 0.5
+            same_category = by_category.get(server.get("category"), [])
+            filled = 0
+            for other_id in same_category:
+                if filled >= SIMILAR_SERVERS_LIMIT:
+                    break
+                if other_id != server_id and other_id not in candidates:
+                    candidates.add(other_id)
+                    filled += 1
+            candidates.discard(server_id)
             
-            if similarity_score > 0.3:
-                similar.append(other_id)
+            scored = []
+            for other_id in candidates:
+                score = self._similarity(server, self.enhanced_registry[other_id])
+                if score > 0.3:
+                    scored.append((-score, other_id))
+            scored.sort()
+            graph[server_id] = [other_id for _, other_id in scored[:SIMILAR_SERVERS_LIMIT]]
+        
+        return graph
+    
+    def get_similar_servers(self, server_id: str) -> List[str]:
+        """IDs of the servers most similar to ``server_id``"""
         
-        return similar[:3]  # Return top 3 similar servers
+        if self._similarity_graph is None:
+            self._similarity_graph = self._build_similarity_graph()
+        return self._similarity_graph.get(server_id, [])
     
-    async def find_matching_servers(self, requirements: Dict[str, Any]) -> List[ServerMatch]:
-        """Find servers matching requirements with confidence scores"""
+    def _build_match_model(self):
+        """TF-IDF matrix over server descriptions, keywords and use cases
+        
+        Returned with per-server complexity scores and categories as arrays,
+        in the matrix's row order.
+        """
+        
+        documents = {
+            server_id: " ".join([
+                server.get("description", ""),
+                " ".join(server.get("semantic_keywords", [])),
+                " ".join(server.get("use_cases", [])),
+            ])
+            for server_id, server in self.enhanced_registry.items()
+        }
+        servers = self.enhanced_registry.values()
+        complexity = np.array([server.get("complexity_score", 0.5) for server in servers])
+        categories = np.array([server.get("category", "") for server in servers], dtype=object)
+        return TfidfMatrix(documents, STOPWORDS), complexity, categories
+    
+    async def find_matching_servers(
+        self, requirements: Dict[str, Any], limit: Optional[int] = None
+    ) -> List[ServerMatch]:
+        """Find servers matching requirements with confidence scores
         
-        matches = []
+        Args:
+            requirements: Intent requirements (functionality, ui_preferences)
+            limit: Maximum number of matches
+        
+        Returns:
+            Matches above the confidence threshold, most confident first;
+            confidences are in [0, 1]
+        """
         
         # Extract search criteria from requirements
         search_terms = self._extract_search_terms(requirements)
         functionality = requirements.get("functionality", [])
         ui_prefs = requirements.get("ui_preferences", {})
         
+        if TfidfMatrix is None:
+            return self._find_matching_servers_by_scan(
+                search_terms, functionality, ui_prefs, limit
+            )
+        
+        if self._match_model is None:
+            self._match_model = self._build_match_model()
+        matrix, complexity, categories = self._match_model
+        
+        # Every server's score at once: cosine similarity to the requested
+        # functionality plus preference bonuses, for servers similar enough
+        text_scores = TEXT_MATCH_WEIGHT * matrix.scores(" ".join(functionality))
+        scores = text_scores.copy()
+        complexity_pref = ui_prefs.get("complexity", "medium")
+        if complexity_pref == "simple":
+            scores += np.where(complexity < 0.4, 0.2, 0.0)
+        elif complexity_pref == "advanced":
+            scores += np.where(complexity > 0.6, 0.2, 0.0)
+        elif complexity_pref == "medium":
+            scores += np.where((complexity >= 0.3) & (complexity <= 0.7), 0.1, 0.0)
+        if search_terms:
+            scores += 0.1 * np.isin(categories, list(set(search_terms)))
+        scores[text_scores < TEXT_MATCH_THRESHOLD] = 0.0
+        
+        matches = []
+        for row in top_indices(scores, limit, MATCH_THRESHOLD):
+            server = self.enhanced_registry[matrix.doc_ids[row]]
+            _, reasons = self._calculate_match_score(server, search_terms, functionality, ui_prefs)
+            matches.append(ServerMatch(
+                server=server,
+                confidence=min(float(scores[row]), 1.0),
+                match_reasons=reasons
+            ))
+        
+        return matches
+    
+    def _find_matching_servers_by_scan(
+        self,
+        search_terms: List[str],
+        functionality: List[str],
+        ui_prefs: Dict[str, Any],
+        limit: Optional[int] = None
+    ) -> List[ServerMatch]:
+        """Score every server in turn (without numpy)"""
+        
+        matches = []
+        
         for server_id, server in self.enhanced_registry.items():
             match_score, reasons = self._calculate_match_score(
                 server, search_terms, functionality, ui_prefs
             )
             
-            if match_score > 0.2:  # Minimum threshold
+            if match_score > MATCH_THRESHOLD:
                 matches.append(ServerMatch(
                     server=server,
-                    confidence=match_score,
+                    confidence=min(match_score, 1.0),
                     match_reasons=reasons
                 ))
         
         # Sort by confidence
         matches.sort(key=lambda x: x.confidence, reverse=True)
         
-        return matches
+        return matches[:limit]
     
     def _extract_search_terms(self, requirements: Dict[str, Any]) -> List[str]:
         """Extract search terms from requirements"""
@@ -415,7 +601,19 @@ class EnhancedRegistry:
         return score, reasons
     
     async def search_servers(self, query: str) -> List[Dict[str, Any]]:
-        """Search for servers using text query"""
+        """Search for servers using text query
+        
+        Servers matching any word of the query are ranked by relevance;
+        misspelled words are matched against similarly spelled ones.
+        """
+        
+        if self._search_index is not None:
+            results = []
+            for server_id, score in self._search_index.search(query, match_all=False):
+                server_with_score = self.enhanced_registry[server_id].copy()
+                server_with_score["search_score"] = score
+                results.append(server_with_score)
+            return results
         
         query_lower = query.lower()
         results = []
@@ -456,40 +654,145 @@ class EnhancedRegistry:
         
         return results
     
-    async def discover_public_servers(self) -> List[Dict[str, Any]]:
-        """Discover servers from public sources"""
+    async def discover_public_servers(self, force: bool = False) -> List[Dict[str, Any]]:
+        """Discover servers from public sources and merge them into the registry
         
-        discovered = []
+        Results are cached per source. Sources fetched less than
+        ``discovery_interval`` seconds ago are served from the cache; the rest
+        are fetched concurrently, as conditional requests when the cache holds
+        their ETag or Last-Modified validators.
+        
+        Args:
+            force: Fetch every source regardless of the refresh interval
         
+        Returns:
+            All servers currently known from public sources
+        """
+        
+        entries = {}
         for source_url in self.public_sources:
-            try:
-                servers = await self._fetch_from_source(source_url)
-                discovered.extend(servers)
-            except Exception as e:
-                # Log error but continue with other sources
-                print(f"Error fetching from {source_url}: {e}")
+            entry = None
+            if self.cache_manager:
+                entry = self.cache_manager.get_discovery_cache(source_url)
+            entries[source_url] = entry or self._discovery_entries.get(source_url)
+        
+        now = time.time()
+        stale = [
+            source_url for source_url, entry in entries.items()
+            if force or entry is None or now - entry["fetched_at"] >= self.discovery_interval
+        ]
+        
+        if stale:
+            fetched = await self._fetch_sources({url: entries[url] for url in stale})
+            for source_url, entry in fetched.items():
+                if entry is None:
+                    continue  # keep serving the previous results
+                entries[source_url] = entry
+                self._discovery_entries[source_url] = entry
+                if self.cache_manager:
+                    self.cache_manager.set_discovery_cache(source_url, entry)
+        
+        discovered = []
+        for source_url, entry in entries.items():
+            servers = entry["servers"] if entry else []
+            self._merge_discovered(source_url, servers)
+            discovered.extend(dict(server) for server in servers)
         
         return discovered
     
-    async def _fetch_from_source(self, source_url: str) -> List[Dict[str, Any]]:
-        """Fetch servers from a public source"""
+    async def _fetch_sources(
+        self, cached: Dict[str, Optional[Dict[str, Any]]]
+    ) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Fetch several sources concurrently over one HTTP session"""
+        
+        urls = list(cached)
+        if HAS_AIOHTTP:
+            timeout = aiohttp.ClientTimeout(total=DISCOVERY_TIMEOUT)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                results = await asyncio.gather(
+                    *(self._fetch_from_source(session, url, cached[url]) for url in urls)
+                )
+        else:
+            async with httpx.AsyncClient(timeout=DISCOVERY_TIMEOUT) as client:
+                results = await asyncio.gather(
+                    *(self._fetch_from_source(client, url, cached[url]) for url in urls)
+                )
         
-        servers = []
+        return dict(zip(urls, results))
+    
+    async def _fetch_from_source(
+        self, session: Any, source_url: str, cached: Optional[Dict[str, Any]] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Fetch servers from a public source
+        
+        Args:
+            session: Shared ``aiohttp.ClientSession`` or ``httpx.AsyncClient``
+            source_url: Source to fetch
+            cached: Previous result for the source, whose validators are sent
+        
+        Returns:
+            Cache entry with the servers, validators and fetch time, or None
+            if the source could not be fetched
+        """
+        
+        headers = {}
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+        if cached and cached.get("last_modified"):
+            headers["If-Modified-Since"] = cached["last_modified"]
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(source_url, timeout=10.0)
-                data = response.json()
-                
-                if "github.com" in source_url:
-                    servers.extend(self._parse_github_results(data))
-                elif "huggingface.co" in source_url:
-                    servers.extend(self._parse_huggingface_results(data))
-        
+            if HAS_AIOHTTP and isinstance(session, aiohttp.ClientSession):
+                async with session.get(source_url, headers=headers) as response:
+                    status = response.status
+                    response_headers = response.headers
+                    data = await response.json(content_type=None) if status == 200 else None
+            else:
+                response = await session.get(source_url, headers=headers)
+                status = response.status_code
+                response_headers = response.headers
+                data = response.json() if status == 200 else None
         except Exception as e:
             print(f"Failed to fetch from {source_url}: {e}")
+            return None
         
-        return servers
+        if status == 304 and cached:
+            # Unchanged: only the fetch time moves
+            return {**cached, "fetched_at": time.time()}
+        if status != 200:
+            print(f"Failed to fetch from {source_url}: HTTP {status}")
+            return None
+        
+        servers = []
+        try:
+            if "github.com" in source_url:
+                servers.extend(self._parse_github_results(data))
+            elif "huggingface.co" in source_url:
+                servers.extend(self._parse_huggingface_results(data))
+        except Exception as e:
+            print(f"Failed to parse results from {source_url}: {e}")
+            return None
+        
+        return {
+            "servers": servers,
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+    
+    def _merge_discovered(self, source_url: str, servers: List[Dict[str, Any]]) -> None:
+        """Apply what changed in a source's servers to the registry and search index"""
+        
+        previous = self._discovered.get(source_url, {})
+        current = {server["id"]: server for server in servers}
+        
+        for server_id in previous.keys() - current.keys():
+            self.remove_server(server_id)
+        for server_id, server in current.items():
+            if previous.get(server_id) != server:
+                self.add_custom_server(server)
+        
+        self._discovered[source_url] = current
     
     def _parse_github_results(self, data: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Parse GitHub search results"""
@@ -557,7 +860,8 @@ class EnhancedRegistry:
     def get_server_recommendations(self, current_server: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Get recommendations based on current server"""
         
-        similar_ids = current_server.get("similar_servers", [])
+        server_id = current_server.get("id", current_server.get("name", ""))
+        similar_ids = self.get_similar_servers(server_id)
         recommendations = []
         
         for server_id in similar_ids:
@@ -574,11 +878,18 @@ class EnhancedRegistry:
         if server_id:
             enhanced_server = self._enhance_server_info(server)
             self.enhanced_registry[server_id] = enhanced_server
+            self._index_server(server_id, enhanced_server)
+            self._similarity_graph = None
+            self._match_model = None
     
     def remove_server(self, server_id: str) -> bool:
         """Remove a server from the registry"""
         
         if server_id in self.enhanced_registry:
             del self.enhanced_registry[server_id]
+            if self._search_index is not None:
+                self._search_index.remove(server_id)
+            self._similarity_graph = None
+            self._match_model = None
             return True
         return False
\ No newline at end of file
@@ -29,6 +29,12 @@ except ImportError as e:
     print("This may be due to missing dependencies or incorrect path.")
     get_agent_runner = None
 
+# Background sampler: dashboard reads are non-blocking ring-buffer lookups
+try:
+    from gradio_mcp_playground.metrics_sampler import get_metrics_sampler, sparkline
+except ImportError:
+    get_metrics_sampler = None
+
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -64,9 +70,20 @@ class ControlPanelUI:
         }
         
     def _get_system_metrics(self) -> Dict[str, Any]:
-        """Get comprehensive system metrics for monitoring"""
+        """Get system metrics from the background sampler without blocking"""
         try:
-            # Get disk usage for the appropriate root path
+            if get_metrics_sampler:
+                sample = get_metrics_sampler().system()
+                if sample:
+                    return {
+                        "cpu_percent": sample.cpu_percent,
+                        "memory_percent": sample.memory_percent,
+                        "disk_percent": sample.disk_percent,
+                        "process_count": sample.process_count,
+                        "uptime": time.time() - psutil.boot_time()
+                    }
+            
+            # No sample yet: fall back to the cheap, non-blocking readings
             disk_percent = 0
             try:
                 if platform.system() == 'Windows':
@@ -80,10 +97,9 @@ class ControlPanelUI:
                 disk_percent = 0
             
             return {
-                "cpu_percent": psutil.cpu_percent(interval=1),
+                "cpu_percent": psutil.cpu_percent(interval=None),
                 "memory_percent": psutil.virtual_memory().percent,
                 "disk_percent": disk_percent,
-                "network_connections": len(psutil.net_connections()),
                 "process_count": len(psutil.pids()),
                 "uptime": time.time() - psutil.boot_time()
             }
@@ -93,10 +109,28 @@ class ControlPanelUI:
                 "cpu_percent": 0,
                 "memory_percent": 0,
                 "disk_percent": 0,
-                "network_connections": 0,
                 "process_count": 0,
                 "uptime": 0
             }
+    
+    def _render_system_metrics(self) -> str:
+        """Render host metrics with sparklines of the sampled history"""
+        self.system_metrics = self._get_system_metrics()
+        metrics = self.system_metrics
+        cpu_trend = memory_trend = ""
+        if get_metrics_sampler:
+            sampler = get_metrics_sampler()
+            cpu_trend = sparkline(sampler.system_history("cpu_percent"), maximum=100)
+            memory_trend = sparkline(sampler.system_history("memory_percent"), maximum=100)
+        
+        return (
+            f"**Host CPU:** {metrics['cpu_percent']:.1f}% `{cpu_trend}` &nbsp; "
+            f"**Memory:** {metrics['memory_percent']:.1f}% `{memory_trend}` &nbsp; "
+            f"**Disk:** {metrics['disk_percent']:.1f}% &nbsp; "
+            f"**Processes:** {metrics['process_count']} &nbsp; "
+            f"**Uptime:** {self._format_uptime(metrics['uptime'])}"
+        )
+    
     def _load_enhanced_agents(self) -> Dict[str, Dict[str, str]]:
         """Load enhanced agent files from external files"""
         return self._load_agents_from_files()
@@ -284,8 +318,11 @@ class ControlPanelUI:
                 
                 if status == 'running':
                     uptime = self._format_uptime(info.get('uptime_seconds', 0))
-                    cpu = f"{info.get('cpu_percent', 0):.1f}%"
-                    memory = f"{info.get('memory_mb', 0):.1f}MB"
+                    cpu = f"{info.get('cpu_percent') or 0:.1f}%"
+                    if get_metrics_sampler:
+                        trend = sparkline(get_metrics_sampler().history(f"agent:{name}"), width=12)
+                        cpu = f"{cpu} {trend}".strip()
+                    memory = f"{info.get('memory_mb') or 0:.1f}MB"
                     port = str(info.get('port', '--'))
                 else:
                     uptime = "--"
@@ -316,11 +353,13 @@ class ControlPanelUI:
             success, message, metadata = self.agent_runner.start_agent(agent_name, agent['code'])
             
             if success:
-                port = metadata.get('port', 'Unknown')
                 result = f"✅ Agent '{agent_name}' deployed successfully!\n"
-                result += f"🌐 URL: http://localhost:{port}\n"
+                if metadata.get('port'):
+                    result += f"🌐 URL: {self.agent_runner.agent_url(metadata)}\n"
                 result += f"📋 Agent: {agent_name}\n"
                 result += f"🔧 Status: {metadata.get('status', 'Unknown')}"
+                if metadata.get('time_to_ready') is not None:
+                    result += f"\n⏱️ Ready in: {metadata['time_to_ready']:.1f}s"
             else:
                 result = f"❌ Failed to deploy agent: {message}\n"
                 if metadata:
@@ -477,8 +516,9 @@ class ControlPanelUI:
                     self.logs_buffer = self.logs_buffer[-self.max_log_lines:]
             
             # Build display
+            output = self._format_agent_output(agents_status)
             if not self.logs_buffer:
-                return header + f"[{current_time}] 📭 No status changes detected yet\n\nAgent health changes will appear here when they occur."
+                return header + f"[{current_time}] 📭 No status changes detected yet\n\nAgent health changes will appear here when they occur." + output
             
             # Show recent status changes
             recent_logs = self.logs_buffer[-20:]  # Show last 20 entries
@@ -489,11 +529,26 @@ class ControlPanelUI:
             if len(recent_logs) >= 20:
                 result += f" | Showing last {len(recent_logs)} changes"
             
-            return result
+            return result + output
             
         except Exception as e:
             logger.error(f"Error getting agent logs: {e}")
             return f"❌ Error retrieving logs: {str(e)}\n\nPlease check the agent runner configuration and try again."
+
+    def _format_agent_output(
+        self, agents_status: Dict[str, Dict[str, Any]], lines: int = 10
+    ) -> str:
+        """Format the latest stdout/stderr lines of each agent"""
+        sections = []
+        for name in agents_status:
+            output = self.agent_runner.get_logs(name, lines)
+            if output:
+                header = f"--- {name} output (last {len(output)} lines) ---"
+                sections.append(header + "\n" + "\n".join(output))
+        if not sections:
+            return ""
+        return "\n\n" + "\n\n".join(sections)
+    
     def _clear_logs(self) -> str:
         """Clear the logs display"""
         self.logs_buffer = []
@@ -713,6 +768,7 @@ class ControlPanelUI:
                         interactive=False,
                         wrap=True
                     )
+                    system_metrics_display = gr.Markdown(self._render_system_metrics())
                     
                     # Auto-refresh dashboard every 5 seconds
                     dashboard_timer = gr.Timer(5.0)
@@ -720,6 +776,10 @@ class ControlPanelUI:
                         fn=self._update_dashboard,
                         outputs=[status_grid]
                     )
+                    dashboard_timer.tick(
+                        fn=self._render_system_metrics,
+                        outputs=[system_metrics_display]
+                    )
                 
                 # Section 2: Quick Actions - Emergency Controls
                 with gr.Group():
@@ -926,6 +986,7 @@ class ControlPanelUI:
                             interactive=False,
                             wrap=True
                         )
+                        system_metrics_display = gr.Markdown(self._render_system_metrics())
                         
                         # Auto-refresh dashboard every 5 seconds
                         dashboard_timer = gr.Timer(5.0)
@@ -933,6 +994,10 @@ class ControlPanelUI:
                             fn=self._update_dashboard,
                             outputs=[status_grid]
                         )
+                        dashboard_timer.tick(
+                            fn=self._render_system_metrics,
+                            outputs=[system_metrics_display]
+                        )
                       # Section 2: Quick Actions - Emergency Controls
                     with gr.Group():
                         gr.Markdown("## ⚡ Quick Actions & Emergency Controls")
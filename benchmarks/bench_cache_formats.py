@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Cache Format Load-Time Benchmark
+
+Compares loading a server cache entry stored in the legacy pickle format
+against the versioned compact JSON format written by ``CacheManager``.
+
+Usage:
+    python benchmarks/bench_cache_formats.py [--tools 200] [--repeat 200]
+"""
+
+import argparse
+import json
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gradio_mcp_playground.cache_manager import CacheManager  # noqa: E402
+
+
+def make_server_data(tool_count: int) -> dict:
+    """Build a server cache payload shaped like MCPServerProcess.initialize output"""
+    tools = {}
+    for i in range(tool_count):
+        name = f"tool_{i}"
+        tools[name] = {
+            "name": name,
+            "description": f"Example tool number {i} that does something useful with files",
+            "inputSchema": {
+                "type": "object",
+                "properties": {
+                    "path": {"type": "string", "description": "Path to operate on"},
+                    "recursive": {"type": "boolean", "default": False},
+                    "limit": {"type": "integer", "minimum": 1, "maximum": 1000},
+                },
+                "required": ["path"],
+            },
+        }
+    return {
+        "tools": tools,
+        "server_info": {"name": "bench-server", "version": "1.0.0"},
+        "initialized_at": time.time(),
+    }
+
+
+def time_loads(load, repeat: int) -> float:
+    """Return the mean wall time of ``load()`` in milliseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        load()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tools", type=int, default=200, help="Tools per cached server")
+    parser.add_argument("--repeat", type=int, default=200, help="Loads per format")
+    args = parser.parse_args()
+
+    data = make_server_data(args.tools)
+    config = {"command": "npx", "args": ["-y", "@bench/server"]}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        cache = CacheManager(cache_dir=Path(tmpdir))
+
+        # Legacy format: pickle written in place, pretty-printed JSON for tools
+        pickle_file = Path(tmpdir) / "legacy.pkl"
+        with pickle_file.open("wb") as f:
+            pickle.dump(data, f)
+        legacy_json_file = Path(tmpdir) / "legacy.json"
+        with legacy_json_file.open("w") as f:
+            json.dump(data, f, indent=2)
+
+        # Current format
+        cache.set_server_cache("bench", config, data)
+        current_file = next(cache.servers_cache_dir.glob("bench_*.json"))
+
+        def load_pickle():
+            with pickle_file.open("rb") as f:
+                return pickle.load(f)
+
+        def load_legacy_json():
+            with legacy_json_file.open("r") as f:
+                return json.load(f)
+
+        def load_current():
+            return cache.get_server_cache("bench", config)
+
+        assert load_current() == load_pickle()
+
+        rows = [
+            (name, path.stat().st_size / 1024, time_loads(load, args.repeat))
+            for name, path, load in [
+                ("pickle (legacy servers)", pickle_file, load_pickle),
+                ("indented JSON (legacy tools)", legacy_json_file, load_legacy_json),
+                ("compact JSON (locked)", current_file, load_current),
+            ]
+        ]
+
+    print(f"{args.tools} tools per entry, {args.repeat} loads per format\n")
+    print(f"{'Format':<30} {'Size (KB)':>10} {'Load (ms)':>10}")
+    for name, size_kb, ms in rows:
+        print(f"{name:<30} {size_kb:>10.1f} {ms:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Server Launch Latency Benchmark
+
+Compares the time until a freshly launched app that imports gradio is ready,
+when started cold with ``subprocess.Popen`` versus forked from the pre-fork
+zygote used by ``GradioMCPServer.start`` and ``AgentRunner.start_agent``.
+
+Usage:
+    python benchmarks/bench_prefork_launch.py [--repeat 5] [--module gradio]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gradio_mcp_playground.prefork import HAS_PREFORK, PreforkLauncher  # noqa: E402
+
+
+def time_until_ready(launch) -> float:
+    """Return milliseconds from ``launch()`` until the app prints its ready line"""
+    start = time.perf_counter()
+    process = launch()
+    line = process.stdout.readline()
+    elapsed = (time.perf_counter() - start) * 1000
+    process.wait(timeout=30)
+    assert line.strip() == b"ready", line
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5, help="Launches per mode")
+    parser.add_argument("--module", default="gradio", help="Heavy module the app imports")
+    args = parser.parse_args()
+
+    if not HAS_PREFORK:
+        sys.exit("Pre-fork launches need a POSIX platform")
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        app = Path(tmpdir) / "app.py"
+        app.write_text(f"import {args.module}\nprint('ready', flush=True)\n")
+
+        launcher = PreforkLauncher(Path(tmpdir) / "zygote", preload=(args.module,))
+        warmup_start = time.perf_counter()
+        if not launcher.ensure_started(wait=120):
+            sys.exit("Zygote did not start")
+        warmup = time.perf_counter() - warmup_start
+
+        try:
+            cold = [
+                time_until_ready(
+                    lambda: subprocess.Popen([sys.executable, str(app)], stdout=subprocess.PIPE)
+                )
+                for _ in range(args.repeat)
+            ]
+            forked = [
+                time_until_ready(lambda: launcher.spawn(app, stdout=subprocess.PIPE))
+                for _ in range(args.repeat)
+            ]
+        finally:
+            launcher.shutdown()
+
+    print(f"App importing '{args.module}', {args.repeat} launches per mode")
+    print(f"Zygote warm-up (one time): {warmup:.2f} s\n")
+    print(f"{'Mode':<10} {'Median (ms)':>12} {'Min (ms)':>10} {'Max (ms)':>10}")
+    for name, samples in [("cold", cold), ("forked", forked)]:
+        print(
+            f"{name:<10} {statistics.median(samples):>12.1f} "
+            f"{min(samples):>10.1f} {max(samples):>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
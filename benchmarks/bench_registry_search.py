@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Registry Search Benchmark
+
+Compares a linear substring scan over every registry entry (how
+``ServerRegistry.search_mcp_servers`` used to work) against the inverted
+index, on the real registry padded with synthetic entries.
+
+Usage:
+    python benchmarks/bench_registry_search.py [--entries 5000] [--repeat 200]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from gradio_mcp_playground.registry import ServerRegistry  # noqa: E402
+
+WORDS = (
+    "file data search web github database image audio memory cloud slack calendar "
+    "email browser sql notes vector graph api weather map finance crypto code test"
+).split()
+
+QUERIES = ["file", "github", "brave search", "data sql", "calc", "nonexistent", "databse"]
+
+
+def pad_registry(registry: ServerRegistry, entries: int) -> None:
+    """Add synthetic MCP servers until the registry has ``entries`` of them"""
+    rng = random.Random(0)
+    for i in range(entries - len(registry.mcp_servers)):
+        words = rng.sample(WORDS, 4)
+        server_id = f"{words[0]}-{words[1]}-{i}"
+        registry.mcp_servers[server_id] = {
+            "name": f"{words[0].title()} {words[1].title()} Server",
+            "description": f"Work with {' and '.join(words[1:])} from your assistant.",
+            "category": rng.choice(["official", "community", "tools"]),
+            "package": f"@bench/{server_id}",
+        }
+        registry._index_entry(registry._mcp_index, server_id, registry.mcp_servers[server_id])
+
+
+def linear_search(registry: ServerRegistry, query: str) -> list:
+    """The previous per-query scan"""
+    query = query.lower()
+    results = []
+    for server_id, server_info in registry.mcp_servers.items():
+        searchable_text = (
+            f"{server_id} {server_info['name']} {server_info['description']} "
+            f"{server_info['category']} {server_info.get('package', '')}"
+        ).lower()
+        if query in searchable_text:
+            results.append({"id": server_id, "type": "mcp_server", **server_info})
+    return results
+
+
+def time_queries(search, repeat: int) -> float:
+    """Return the mean wall time of one query in microseconds"""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            search(query)
+    return (time.perf_counter() - start) * 1e6 / (repeat * len(QUERIES))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000, help="MCP servers in the registry")
+    parser.add_argument("--repeat", type=int, default=200, help="Passes over the query set")
+    args = parser.parse_args()
+
+    registry = ServerRegistry()
+    pad_registry(registry, args.entries)
+
+    start = time.perf_counter()
+    registry.search_mcp_servers("warmup")  # builds the postings
+    build_ms = (time.perf_counter() - start) * 1000
+
+    linear_us = time_queries(lambda q: linear_search(registry, q), max(1, args.repeat // 20))
+    index_us = time_queries(registry.search_mcp_servers, args.repeat)
+
+    print(f"{len(registry.mcp_servers)} MCP servers, queries: {', '.join(QUERIES)}\n")
+    print(f"Index build: {build_ms:.1f} ms\n")
+    print(f"{'Method':<20} {'Query (us)':>12}")
+    print(f"{'linear scan':<20} {linear_us:>12.1f}")
+    print(f"{'inverted index':<20} {index_us:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,32 +5,59 @@ to improve startup performance.
 """
 
 import json
-import pickle
 import hashlib
+import shutil
+import threading
 import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Tuple
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Tuple
 import platform
 import os
 import logging
 
+from .utils import atomic_write, file_lock
+
 logger = logging.getLogger(__name__)
 
+# Bump whenever the on-disk entry layout changes; older entries become misses
+# (4: tool definitions in server entries are no longer masked)
+CACHE_FORMAT_VERSION = 4
+
+# Launchers whose first positional argument names the package being run
+PACKAGE_RUNNERS = {"npx", "npx.cmd", "bunx", "uvx", "pipx"}
+
 
 class CacheManager:
     """Manages caching for MCP servers and configurations"""
     
-    # Cache TTL in seconds (24 hours by default)
+    # TTL in seconds for entries without a content fingerprint (24 hours by default)
     DEFAULT_TTL = 86400
     
+    # Maximum number of decoded entries kept in the in-process L1 cache
+    DEFAULT_L1_SIZE = 256
+
+    # Total on-disk size cap in MB; least recently used entries are evicted beyond it
+    DEFAULT_MAX_SIZE_MB = 512
+
+    # Eviction trims down to this fraction of the cap so it doesn't run on every write
+    EVICTION_LOW_WATERMARK = 0.9
+
+    # Index journal records appended before they are compacted into index.json
+    INDEX_COMPACT_RECORDS = 1000
+
+    # Cache entry types, each stored in its own subdirectory
+    CACHE_TYPES = ("servers", "tools", "configs", "discovery")
+
     # Sensitive keys to mask in cache
     SENSITIVE_KEYS = {
         'token', 'key', 'password', 'secret', 'api_key', 
         'access_token', 'refresh_token', 'client_secret'
     }
     
-    def __init__(self, cache_dir: Optional[Path] = None):
-        """Initialize cache manager with optional custom cache directory"""
+    def __init__(self, cache_dir: Optional[Path] = None, max_size_mb: Optional[float] = None):
+        """Initialize cache manager with optional custom cache directory and size cap"""
         if cache_dir:
             self.cache_dir = Path(cache_dir)
         else:
@@ -43,8 +70,14 @@ class CacheManager:
         self.servers_cache_dir = self.cache_dir / "servers"
         self.tools_cache_dir = self.cache_dir / "tools"
         self.config_cache_dir = self.cache_dir / "configs"
+        self.discovery_cache_dir = self.cache_dir / "discovery"
         
-        for dir in [self.servers_cache_dir, self.tools_cache_dir, self.config_cache_dir]:
+        for dir in [
+            self.servers_cache_dir,
+            self.tools_cache_dir,
+            self.config_cache_dir,
+            self.discovery_cache_dir,
+        ]:
             dir.mkdir(exist_ok=True)
             
         # Check if caching is disabled
@@ -52,6 +85,41 @@ class CacheManager:
         
         if not self.enabled:
             logger.info("Caching is disabled via GMP_DISABLE_CACHE environment variable")
+
+        # Advisory lock shared by every process using this cache directory
+        self.lock_file = self.cache_dir / ".lock"
+
+        # In-process L1 cache of decoded entries: path -> (stat signature, data).
+        # Entries are revalidated against the file's stat so other processes'
+        # writes are picked up; returned objects are shared and must not be mutated.
+        self.l1_max_entries = int(os.environ.get('GMP_CACHE_L1_SIZE', self.DEFAULT_L1_SIZE))
+        self._l1: "OrderedDict[str, Tuple[Tuple[int, int, int], Any]]" = OrderedDict()
+        self._l1_lock = threading.Lock()
+        self._lookup_stats = {"l1_hits": 0, "l2_hits": 0, "misses": 0}
+
+        # Size index of every entry file, so stats and eviction never need to walk
+        # the cache directories. It is persisted as a snapshot (index.json) plus an
+        # append-only journal of changes since, which writes append to and readers
+        # replay from where they left off; the journal is compacted into the
+        # snapshot every INDEX_COMPACT_RECORDS records. Changed only while holding
+        # the exclusive file lock; _index_lock serializes readers in this process.
+        if max_size_mb is None:
+            max_size_mb = float(os.environ.get('GMP_CACHE_MAX_SIZE_MB', self.DEFAULT_MAX_SIZE_MB))
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.index_file = self.cache_dir / "index.json"
+        self._index: Optional[Dict[str, List[float]]] = None
+        self._index_signature: Optional[Tuple[int, int, int]] = None
+        self._type_totals: Dict[str, List[int]] = {}
+        self._pending_access: Dict[str, float] = {}
+        self.journal_file = self.cache_dir / "index.journal"
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._journal_buffer: List[list] = []
+        self._index_lock = threading.Lock()
+
+        # Server fingerprints by config: (files the marker was read from with
+        # their stat signatures, fingerprint). A lookup only re-stats those files.
+        self._fingerprints: Dict[str, Tuple[tuple, str]] = {}
     
     def _get_default_cache_dir(self) -> Path:
         """Get platform-specific cache directory"""
@@ -101,6 +169,328 @@ class CacheManager:
         else:
             return data
     
+    @contextmanager
+    def _lock(self, shared: bool = False) -> Iterator[None]:
+        """Hold the cache directory's advisory lock (shared for reads, exclusive for writes)"""
+        with file_lock(self.lock_file, shared=shared):
+            yield
+
+    def _write_entry(self, cache_file: Path, data: Any) -> None:
+        """Atomically write a versioned, compact JSON cache entry
+
+        The payload goes to a temp file in the same directory and is moved into
+        place with ``os.replace``, so readers see either the old or the new entry.
+        """
+        payload = json.dumps(
+            {"version": CACHE_FORMAT_VERSION, "data": data}, separators=(",", ":")
+        ).encode("utf-8")
+
+        with self._lock():
+            atomic_write(cache_file, payload)
+            self._l1_store(cache_file, data)
+
+            self._load_index_locked()
+            self._index_put_locked(self._index_key(cache_file), len(payload), time.time())
+            self._evict_locked()
+            self._flush_index_locked()
+
+    def _index_key(self, cache_file: Path) -> str:
+        """Index key of an entry file: '<type>/<file name>'"""
+        return f"{cache_file.parent.name}/{cache_file.name}"
+
+    def _scan_index(self) -> Dict[str, List[float]]:
+        """Rebuild the size index from the cache directories (only when it is missing)"""
+        index: Dict[str, List[float]] = {}
+        for cache_type in self.CACHE_TYPES:
+            for file in (self.cache_dir / cache_type).glob("*"):
+                if file.name.startswith("."):
+                    continue
+                try:
+                    st = file.stat()
+                except OSError:
+                    continue
+                index[f"{cache_type}/{file.name}"] = [st.st_size, st.st_mtime]
+        return index
+
+    def _load_index_locked(self) -> None:
+        """Bring the size index up to date with other processes' changes
+
+        Only journal records appended since the last load are read, unless the
+        snapshot was replaced (compacted) in the meantime.
+        """
+        signature = self._stat_signature(self.index_file)
+        if self._index is None or signature != self._index_signature:
+            self._read_snapshot_locked(signature)
+
+        try:
+            with open(self.journal_file, "rb") as f:
+                if os.fstat(f.fileno()).st_size < self._journal_offset:
+                    # Journal removed or truncated behind our back
+                    self._read_snapshot_locked(signature)
+                f.seek(self._journal_offset)
+                data = f.read()
+        except FileNotFoundError:
+            if self._journal_offset:
+                self._read_snapshot_locked(signature)
+            return
+
+        # A record being appended by a crashed writer has no newline yet
+        complete = data[: data.rfind(b"\n") + 1]
+        self._journal_offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                self._apply_record(json.loads(line))
+            except (ValueError, TypeError, IndexError) as e:
+                logger.debug(f"Skipping unreadable cache index record: {e}")
+            self._journal_records += 1
+
+    def _read_snapshot_locked(self, signature: Optional[Tuple[int, int, int]]) -> None:
+        """Load index.json (or rescan the cache if it is missing) and reset the journal position"""
+        index = None
+        if signature is not None:
+            try:
+                data = json.loads(self.index_file.read_bytes())
+                if data.get("version") == CACHE_FORMAT_VERSION:
+                    index = data["entries"]
+            except (OSError, ValueError, KeyError, AttributeError) as e:
+                logger.debug(f"Rebuilding unreadable cache index: {e}")
+
+        if index is None:
+            index = self._scan_index()
+            signature = None  # force a save so other processes see the rebuilt index
+
+        self._index = index
+        self._index_signature = signature
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._journal_buffer = []
+        self._type_totals = {cache_type: [0, 0] for cache_type in self.CACHE_TYPES}
+        for key, (size, _) in index.items():
+            totals = self._type_totals.setdefault(key.split("/", 1)[0], [0, 0])
+            totals[0] += 1
+            totals[1] += int(size)
+
+    def _apply_record(self, record: list) -> None:
+        """Apply one journal record to the in-memory index
+
+        Records are ``["put", key, size, accessed]``, ``["del", key]`` or
+        ``["access", key, accessed]``.
+        """
+        op, key = record[0], record[1]
+        if op == "put":
+            self._remove_from_index(key)
+            self._add_to_index(key, int(record[2]), record[3])
+        elif op == "del":
+            self._remove_from_index(key)
+        elif op == "access" and key in self._index and record[2] > self._index[key][1]:
+            self._index[key][1] = record[2]
+
+    def _fold_pending_access_locked(self) -> None:
+        """Move lookups recorded since the last save into the index and journal"""
+        with self._l1_lock:
+            pending, self._pending_access = self._pending_access, {}
+        for key, accessed in pending.items():
+            if key in self._index and accessed > self._index[key][1]:
+                self._index[key][1] = accessed
+                self._journal_buffer.append(["access", key, accessed])
+
+    def _flush_index_locked(self) -> None:
+        """Append this process's index changes to the journal, compacting when it is long"""
+        self._fold_pending_access_locked()
+        if self._index_signature is None or (
+            self._journal_records + len(self._journal_buffer) > self.INDEX_COMPACT_RECORDS
+        ):
+            self._save_index_locked()
+            return
+        if not self._journal_buffer:
+            return
+
+        payload = b"".join(
+            json.dumps(record, separators=(",", ":")).encode("utf-8") + b"\n"
+            for record in self._journal_buffer
+        )
+        with open(self.journal_file, "ab") as f:
+            f.write(payload)
+            self._journal_offset = f.tell()
+        self._journal_records += len(self._journal_buffer)
+        self._journal_buffer = []
+
+    def _save_index_locked(self) -> None:
+        """Compact the size index into a new snapshot and start an empty journal"""
+        self._fold_pending_access_locked()
+
+        payload = json.dumps(
+            {"version": CACHE_FORMAT_VERSION, "entries": self._index}, separators=(",", ":")
+        ).encode("utf-8")
+        atomic_write(self.index_file, payload)
+        # Readers notice the new snapshot before they look at the journal again
+        with open(self.journal_file, "wb"):
+            pass
+        self._index_signature = self._stat_signature(self.index_file)
+        self._journal_offset = 0
+        self._journal_records = 0
+        self._journal_buffer = []
+
+    def _add_to_index(self, key: str, size: int, accessed: float) -> None:
+        self._index[key] = [size, accessed]
+        totals = self._type_totals.setdefault(key.split("/", 1)[0], [0, 0])
+        totals[0] += 1
+        totals[1] += size
+
+    def _remove_from_index(self, key: str) -> None:
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            totals = self._type_totals[key.split("/", 1)[0]]
+            totals[0] -= 1
+            totals[1] -= int(entry[0])
+
+    def _index_put_locked(self, key: str, size: int, accessed: float) -> None:
+        """Add or update an entry in the size index"""
+        self._remove_from_index(key)
+        self._add_to_index(key, size, accessed)
+        self._journal_buffer.append(["put", key, size, accessed])
+
+    def _index_remove_locked(self, key: str) -> None:
+        """Remove an entry from the size index"""
+        if key in self._index:
+            self._remove_from_index(key)
+            self._journal_buffer.append(["del", key])
+
+    def _total_size(self) -> int:
+        """Total size of all indexed entries"""
+        return sum(size for _, size in self._type_totals.values())
+
+    def _evict_locked(self, max_size_bytes: Optional[int] = None) -> Tuple[int, int]:
+        """Evict least recently used entries once the cache exceeds its size cap
+
+        Returns:
+            Tuple of (entries removed, bytes freed)
+        """
+        cap = self.max_size_bytes if max_size_bytes is None else max_size_bytes
+        total = self._total_size()
+        if total <= cap:
+            return 0, 0
+
+        with self._l1_lock:
+            pending = dict(self._pending_access)
+
+        target = int(cap * self.EVICTION_LOW_WATERMARK)
+        by_last_access = sorted(
+            self._index.items(), key=lambda item: max(item[1][1], pending.get(item[0], 0))
+        )
+
+        removed = freed = 0
+        for key, (size, _) in by_last_access:
+            if total <= target:
+                break
+            path = self.cache_dir / key
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.debug(f"Failed to evict cache file {path}: {e}")
+                continue
+            self._l1_discard(path)
+            self._index_remove_locked(key)
+            total -= int(size)
+            removed += 1
+            freed += int(size)
+
+        logger.debug(f"Evicted {removed} cache entries ({freed} bytes)")
+        return removed, freed
+
+    def _note_access(self, cache_file: Path) -> None:
+        """Record an entry lookup for LRU eviction (persisted with the next index save)"""
+        with self._l1_lock:
+            self._pending_access[self._index_key(cache_file)] = time.time()
+
+    @staticmethod
+    def _stat_signature(cache_file: Path) -> Optional[Tuple[int, int, int]]:
+        """Cheap identity of a cache file's current contents"""
+        try:
+            st = cache_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _l1_store(self, cache_file: Path, data: Any) -> None:
+        """Remember a decoded entry in the L1 cache, evicting the least recently used"""
+        signature = self._stat_signature(cache_file)
+        if signature is None or self.l1_max_entries <= 0:
+            return
+
+        with self._l1_lock:
+            key = str(cache_file)
+            self._l1[key] = (signature, data)
+            self._l1.move_to_end(key)
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+
+    def _count_lookup(self, outcome: str) -> None:
+        """Record the outcome of an entry lookup for hit-ratio stats"""
+        with self._l1_lock:
+            self._lookup_stats[outcome] += 1
+
+    def _l1_discard(self, cache_file: Optional[Path] = None) -> None:
+        """Drop one entry (or everything) from the L1 cache"""
+        with self._l1_lock:
+            if cache_file is None:
+                self._l1.clear()
+            else:
+                self._l1.pop(str(cache_file), None)
+
+    def _read_entry(self, cache_file: Path) -> Optional[Any]:
+        """Read a cache entry, returning None for missing, corrupt or outdated entries
+
+        Served from the L1 cache when the file is unchanged since it was decoded.
+        """
+        signature = self._stat_signature(cache_file)
+        if signature is None:
+            self._l1_discard(cache_file)
+            self._count_lookup("misses")
+            return None
+
+        key = str(cache_file)
+        with self._l1_lock:
+            cached = self._l1.get(key)
+            if cached is not None and cached[0] == signature:
+                self._l1.move_to_end(key)
+                self._lookup_stats["l1_hits"] += 1
+                self._pending_access[self._index_key(cache_file)] = time.time()
+                return cached[1]
+
+        data = self._read_entry_from_disk(cache_file)
+        if data is None:
+            self._l1_discard(cache_file)
+            self._count_lookup("misses")
+            return None
+
+        self._count_lookup("l2_hits")
+        self._note_access(cache_file)
+        self._l1_store(cache_file, data)
+        return data
+
+    def _read_entry_from_disk(self, cache_file: Path) -> Optional[Any]:
+        """Read and decode a cache entry file"""
+        try:
+            with self._lock(shared=True):
+                raw = cache_file.read_bytes()
+        except FileNotFoundError:
+            return None
+
+        try:
+            entry = json.loads(raw)
+        except ValueError as e:
+            logger.debug(f"Discarding unreadable cache entry {cache_file}: {e}")
+            return None
+
+        if not isinstance(entry, dict) or entry.get("version") != CACHE_FORMAT_VERSION:
+            logger.debug(f"Discarding cache entry {cache_file} with unknown format")
+            return None
+
+        return entry.get("data")
+
     def _is_cache_valid(self, cache_file: Path, ttl: Optional[int] = None) -> bool:
         """Check if cache file is still valid"""
         if not cache_file.exists():
@@ -112,8 +502,140 @@ class CacheManager:
         
         return age < max_age
     
-    def get_server_cache(self, server_name: str, server_config: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Get cached server information if available"""
+    def _get_package_marker(
+        self, command: str, args: List[str], sources: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Describe the installed package/binary a server runs, as cheaply as possible
+
+        Uses the resolved executable's mtime, the mtime of any script paths in the
+        arguments and, for package runners like npx/uvx, the installed package version.
+        Paths the marker depends on are appended to ``sources``.
+        """
+        marker: Dict[str, Any] = {}
+        if sources is None:
+            sources = []
+
+        resolved = shutil.which(command) if command else None
+        if resolved:
+            sources.append(resolved)
+            try:
+                marker["bin"] = [resolved, os.stat(resolved).st_mtime_ns]
+            except OSError:
+                marker["bin"] = [resolved, None]
+
+        scripts = []
+        for arg in args:
+            if not isinstance(arg, str) or not arg or arg.startswith("-"):
+                continue
+            # Also watched when missing, in case the script appears later
+            sources.append(arg)
+            if not os.path.isfile(arg):
+                continue
+            try:
+                scripts.append([arg, os.stat(arg).st_mtime_ns])
+            except OSError:
+                continue
+        if scripts:
+            marker["scripts"] = scripts
+
+        runner = Path(command).name.lower() if command else ""
+        if runner in PACKAGE_RUNNERS:
+            package = next(
+                (a for a in args if isinstance(a, str) and a and not a.startswith("-")), None
+            )
+            if package:
+                marker["package"] = [
+                    package,
+                    self._get_installed_package_version(runner, package, sources),
+                ]
+
+        return marker
+
+    def _get_installed_package_version(
+        self, runner: str, package_spec: str, sources: Optional[List[str]] = None
+    ) -> Optional[str]:
+        """Look up the locally installed version of a package started by a runner
+
+        For npx, the cache directory and the ``package.json`` the version was read
+        from are appended to ``sources``.
+        """
+        # Strip a version suffix such as "@scope/pkg@1.2.3" or "pkg==1.2.3"
+        if runner in ("uvx", "pipx"):
+            name = package_spec.split("==")[0].split("[")[0]
+            try:
+                from importlib import metadata
+
+                return metadata.version(name)
+            except Exception:
+                return None
+
+        name = package_spec
+        at = package_spec.rfind("@")
+        if at > 0:
+            name = package_spec[:at]
+
+        # npx installs packages into per-spec directories under ~/.npm/_npx
+        npx_dir = Path.home() / ".npm" / "_npx"
+        newest: Optional[Tuple[float, str, Path]] = None
+        for package_json in npx_dir.glob(f"*/node_modules/{name}/package.json"):
+            try:
+                mtime = package_json.stat().st_mtime
+                if newest is None or mtime > newest[0]:
+                    version = json.loads(package_json.read_text(encoding="utf-8")).get("version")
+                    newest = (mtime, version, package_json)
+            except (OSError, ValueError):
+                continue
+
+        if sources is not None:
+            # A new per-spec directory changes the directory's own mtime
+            sources.append(str(npx_dir))
+            if newest:
+                sources.append(str(newest[2]))
+        return newest[1] if newest else None
+
+    def get_server_fingerprint(self, server_config: Dict[str, Any]) -> str:
+        """Fingerprint everything that can change a server's tool schemas
+
+        Covers command, args, environment variable *names* (never values) and
+        the installed package/binary marker. Fingerprints are memoized per config
+        and reused while the files the marker was derived from keep their stat
+        signatures, so lookups skip the PATH and npx cache scans.
+        """
+        command = server_config.get('command', '')
+        args = list(server_config.get('args', []))
+        env_names = sorted((server_config.get('env') or {}).keys())
+
+        memo_key = json.dumps(
+            [command, args, env_names, os.environ.get('PATH', '')], sort_keys=True, default=str
+        )
+        memo = self._fingerprints.get(memo_key)
+        if memo is not None and self._sources_signature(p for p, _ in memo[0]) == memo[0]:
+            return memo[1]
+
+        sources: List[str] = []
+        fingerprint = self._get_cache_key({
+            'command': command,
+            'args': args,
+            'env_names': env_names,
+            'package': self._get_package_marker(command, args, sources),
+        })
+        self._fingerprints[memo_key] = (self._sources_signature(sources), fingerprint)
+        return fingerprint
+
+    def _sources_signature(self, paths: Iterable[str]) -> tuple:
+        """Pair each path with its stat signature (None if missing)"""
+        return tuple((path, self._stat_signature(Path(path))) for path in paths)
+
+    def get_server_cache(self, server_name: str, server_config: Dict[str, Any],
+                         server_version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Get cached server information if its fingerprint still matches
+
+        Args:
+            server_name: Name of the server
+            server_config: Server config with command, args and optionally env
+            server_version: ``serverInfo.version`` reported by a running server, if known.
+                A mismatch with the cached version is treated as a miss.
+        """
         if not self.enabled:
             return None
             
@@ -125,22 +647,31 @@ class CacheManager:
             # Don't include env vars in key as they may contain secrets
         })
         
-        cache_file = self.servers_cache_dir / f"{server_name}_{cache_key}.pkl"
+        cache_file = self.servers_cache_dir / f"{server_name}_{cache_key}.json"
         
-        if self._is_cache_valid(cache_file):
-            try:
-                with cache_file.open('rb') as f:
-                    cached_data = pickle.load(f)
-                logger.debug(f"Cache hit for server {server_name}")
-                return cached_data
-            except Exception as e:
-                logger.debug(f"Failed to load cache for {server_name}: {e}")
-                
-        return None
+        try:
+            entry = self._read_entry(cache_file)
+        except Exception as e:
+            logger.debug(f"Failed to load cache for {server_name}: {e}")
+            return None
+
+        if not entry:
+            return None
+
+        if entry.get('fingerprint') != self.get_server_fingerprint(server_config):
+            logger.debug(f"Cache fingerprint changed for server {server_name}")
+            return None
+
+        if server_version is not None and entry.get('server_version') != server_version:
+            logger.debug(f"Server {server_name} reported a new version {server_version}")
+            return None
+
+        logger.debug(f"Cache hit for server {server_name}")
+        return entry.get('server_data')
     
     def set_server_cache(self, server_name: str, server_config: Dict[str, Any], 
                         server_data: Dict[str, Any]):
-        """Cache server information"""
+        """Cache server information together with its fingerprint"""
         if not self.enabled:
             return
             
@@ -151,14 +682,23 @@ class CacheManager:
             'args': server_config.get('args', []),
         })
         
-        cache_file = self.servers_cache_dir / f"{server_name}_{cache_key}.pkl"
+        cache_file = self.servers_cache_dir / f"{server_name}_{cache_key}.json"
         
         try:
-            # Mask sensitive data before caching
-            masked_data = self._mask_sensitive_data(server_data)
-            
-            with cache_file.open('wb') as f:
-                pickle.dump(masked_data, f)
+            # Mask sensitive data before caching. Tool definitions are schemas the
+            # server publishes, and tools or properties named e.g. "search_keywords"
+            # or "api_key" must come back intact to be served as live definitions.
+            masked_data = {
+                key: value if key == 'tools' else self._mask_sensitive_data(value)
+                for key, value in server_data.items()
+            }
+            server_info = server_data.get('server_info') or {}
+
+            self._write_entry(cache_file, {
+                'fingerprint': self.get_server_fingerprint(server_config),
+                'server_version': server_info.get('version'),
+                'server_data': masked_data,
+            })
             logger.debug(f"Cached server data for {server_name}")
         except Exception as e:
             logger.debug(f"Failed to cache server {server_name}: {e}")
@@ -170,12 +710,14 @@ class CacheManager:
             
         cache_file = self.tools_cache_dir / f"{server_name}_tools.json"
         
-        if self._is_cache_valid(cache_file):
-            try:
-                with cache_file.open('r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.debug(f"Failed to load tools cache for {server_name}: {e}")
+        if not self._is_cache_valid(cache_file):
+            self._count_lookup("misses")
+            return None
+
+        try:
+            return self._read_entry(cache_file)
+        except Exception as e:
+            logger.debug(f"Failed to load tools cache for {server_name}: {e}")
                 
         return None
     
@@ -187,8 +729,7 @@ class CacheManager:
         cache_file = self.tools_cache_dir / f"{server_name}_tools.json"
         
         try:
-            with cache_file.open('w') as f:
-                json.dump(tools, f, indent=2)
+            self._write_entry(cache_file, tools)
             logger.debug(f"Cached {len(tools)} tools for {server_name}")
         except Exception as e:
             logger.debug(f"Failed to cache tools for {server_name}: {e}")
@@ -199,24 +740,30 @@ class CacheManager:
             return None
             
         # Check if original file has been modified
-        original_path = Path(config_path)
-        if not original_path.exists():
+        try:
+            original_mtime = Path(config_path).stat().st_mtime
+        except OSError:
             return None
             
         cache_key = self._get_cache_key(config_path)
         cache_file = self.config_cache_dir / f"{cache_key}.json"
         
-        if cache_file.exists():
-            # Compare modification times
-            if original_path.stat().st_mtime > cache_file.stat().st_mtime:
-                # Original file is newer, cache is invalid
-                return None
+        try:
+            cache_mtime = cache_file.stat().st_mtime
+        except OSError:
+            self._count_lookup("misses")
+            return None
+
+        # Compare modification times
+        if original_mtime > cache_mtime:
+            # Original file is newer, cache is invalid
+            self._count_lookup("misses")
+            return None
                 
-            try:
-                with cache_file.open('r') as f:
-                    return json.load(f)
-            except Exception as e:
-                logger.debug(f"Failed to load config cache for {config_path}: {e}")
+        try:
+            return self._read_entry(cache_file)
+        except Exception as e:
+            logger.debug(f"Failed to load config cache for {config_path}: {e}")
                 
         return None
     
@@ -229,59 +776,161 @@ class CacheManager:
         cache_file = self.config_cache_dir / f"{cache_key}.json"
         
         try:
-            with cache_file.open('w') as f:
-                json.dump(config_data, f, indent=2)
+            self._write_entry(cache_file, config_data)
             logger.debug(f"Cached config file {config_path}")
         except Exception as e:
             logger.debug(f"Failed to cache config {config_path}: {e}")
     
+    def get_discovery_cache(self, source_url: str) -> Optional[Dict[str, Any]]:
+        """Get the last fetch of a public discovery source, however old
+
+        Stale entries are still useful: their ETag / Last-Modified validators
+        let the next fetch be a conditional request.
+        """
+        if not self.enabled:
+            return None
+
+        cache_file = self.discovery_cache_dir / f"{self._get_cache_key(source_url)}.json"
+
+        try:
+            return self._read_entry(cache_file)
+        except Exception as e:
+            logger.debug(f"Failed to load discovery cache for {source_url}: {e}")
+
+        return None
+
+    def set_discovery_cache(self, source_url: str, entry: Dict[str, Any]):
+        """Cache the parsed servers and response validators of a discovery source"""
+        if not self.enabled:
+            return
+
+        cache_file = self.discovery_cache_dir / f"{self._get_cache_key(source_url)}.json"
+
+        try:
+            self._write_entry(cache_file, entry)
+            logger.debug(f"Cached discovery results for {source_url}")
+        except Exception as e:
+            logger.debug(f"Failed to cache discovery results for {source_url}: {e}")
+
     def clear_cache(self, cache_type: Optional[str] = None):
         """Clear cache (all or specific type)"""
-        if cache_type == "servers":
-            dirs_to_clear = [self.servers_cache_dir]
-        elif cache_type == "tools":
-            dirs_to_clear = [self.tools_cache_dir]
-        elif cache_type == "configs":
-            dirs_to_clear = [self.config_cache_dir]
+        if cache_type in self.CACHE_TYPES:
+            types_to_clear = [cache_type]
         else:
             # Clear all
-            dirs_to_clear = [self.servers_cache_dir, self.tools_cache_dir, self.config_cache_dir]
-        
-        for dir in dirs_to_clear:
-            for file in dir.glob("*"):
-                try:
-                    file.unlink()
-                except Exception as e:
-                    logger.debug(f"Failed to delete cache file {file}: {e}")
+            types_to_clear = list(self.CACHE_TYPES)
         
+        with self._lock():
+            self._load_index_locked()
+            for type_name in types_to_clear:
+                for file in (self.cache_dir / type_name).glob("*"):
+                    try:
+                        file.unlink()
+                    except Exception as e:
+                        logger.debug(f"Failed to delete cache file {file}: {e}")
+                        continue
+                    self._index_remove_locked(f"{type_name}/{file.name}")
+            self._save_index_locked()
+
+        self._l1_discard()
         logger.info(f"Cleared cache: {cache_type or 'all'}")
+
+    def gc(self, max_size_mb: Optional[float] = None, temp_max_age: int = 3600) -> Dict[str, Any]:
+        """Reconcile the size index with disk and evict entries beyond the size cap
+
+        Args:
+            max_size_mb: Size cap to enforce, defaults to the configured cap
+            temp_max_age: Age in seconds after which leftover temp files are deleted
+
+        Returns:
+            Summary with removed entry count, bytes freed and the resulting size
+        """
+        max_size_bytes = (
+            self.max_size_bytes if max_size_mb is None else int(max_size_mb * 1024 * 1024)
+        )
+
+        with self._lock():
+            # Drop temp files left behind by crashed writers
+            temp_removed = 0
+            now = time.time()
+            for cache_type in self.CACHE_TYPES:
+                for file in (self.cache_dir / cache_type).glob(".*.tmp"):
+                    try:
+                        if now - file.stat().st_mtime > temp_max_age:
+                            file.unlink()
+                            temp_removed += 1
+                    except OSError:
+                        continue
+
+            # Full rescan, keeping known access times for files that are unchanged
+            self._load_index_locked()
+            known = self._index
+            rescanned = self._scan_index()
+            self._index = {}
+            self._type_totals = {cache_type: [0, 0] for cache_type in self.CACHE_TYPES}
+            for key, (size, mtime) in rescanned.items():
+                previous = known.get(key)
+                accessed = max(mtime, previous[1]) if previous else mtime
+                self._index_put_locked(key, int(size), accessed)
+
+            removed, freed = self._evict_locked(max_size_bytes)
+            self._save_index_locked()
+            size = self._total_size()
+
+        return {
+            "removed": removed,
+            "freed": freed,
+            "temp_files_removed": temp_removed,
+            "size": size,
+            "max_size": max_size_bytes,
+        }
     
     def get_cache_stats(self) -> Dict[str, Any]:
-        """Get cache statistics"""
+        """Get cache statistics from the size index (no directory scan)
+
+        Only takes the shared lock and replays journal records written since the
+        last call.
+        """
+        with self._lock(shared=True), self._index_lock:
+            self._load_index_locked()
+            rebuilt = self._index_signature is None
+            type_totals = {name: list(totals) for name, totals in self._type_totals.items()}
+
+        if rebuilt:
+            # Persist a rescanned index so other processes don't rescan too
+            with self._lock():
+                self._load_index_locked()
+                if self._index_signature is None:
+                    self._save_index_locked()
+
         stats = {
             "enabled": self.enabled,
             "cache_dir": str(self.cache_dir),
-            "size": 0,
+            "size": sum(size for _, size in type_totals.values()),
+            "max_size": self.max_size_bytes,
             "files": {
-                "servers": 0,
-                "tools": 0,
-                "configs": 0
-            }
+                cache_type: type_totals.get(cache_type, [0, 0])[0]
+                for cache_type in self.CACHE_TYPES
+            },
         }
         
-        # Count files and calculate size
-        for cache_type, cache_dir in [
-            ("servers", self.servers_cache_dir),
-            ("tools", self.tools_cache_dir),
-            ("configs", self.config_cache_dir)
-        ]:
-            for file in cache_dir.glob("*"):
-                stats["files"][cache_type] += 1
-                stats["size"] += file.stat().st_size
-        
         # Convert size to human readable
         size_mb = stats["size"] / (1024 * 1024)
         stats["size_readable"] = f"{size_mb:.2f} MB"
+        stats["max_size_readable"] = f"{self.max_size_bytes / (1024 * 1024):.2f} MB"
+
+        # Lookup hit ratios for this process
+        with self._l1_lock:
+            lookup_stats = dict(self._lookup_stats)
+            stats["l1_entries"] = len(self._l1)
+        lookups = sum(lookup_stats.values())
+        stats["lookups"] = {
+            **lookup_stats,
+            "total": lookups,
+            "l1_hit_ratio": lookup_stats["l1_hits"] / lookups if lookups else 0.0,
+            "l2_hit_ratio": lookup_stats["l2_hits"] / lookups if lookups else 0.0,
+        }
+        stats["l1_max_entries"] = self.l1_max_entries
         
         return stats
 
@@ -0,0 +1,264 @@
+"""Gradio MCP Change Bus
+
+Turns file-system changes (via watchdog) and explicit in-process events into
+per-topic version numbers, so dashboards can tell in O(1) whether anything they
+display changed since their last render instead of re-running discovery.
+"""
+
+import asyncio
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple, Union
+
+# Optional file watching
+try:
+    from watchdog.observers import Observer
+
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+# Topics published by the playground
+TOPIC_SERVERS = "servers"
+TOPIC_AGENTS = "agents"
+TOPIC_HEALTH = "health"
+
+# Paths that change constantly but never affect what dashboards show
+_IGNORED_SUFFIXES = (".pyc", ".tmp", ".lock", ".swp")
+
+
+def _is_noise(path: str) -> bool:
+    return not path or "__pycache__" in path or path.endswith(_IGNORED_SUFFIXES)
+
+
+class _TopicEventHandler:
+    """watchdog handler that bumps one topic for relevant events"""
+
+    def __init__(
+        self, bus: "ChangeBus", topic: str, relevant: Optional[Callable[[str], bool]] = None
+    ):
+        self.bus = bus
+        self.topic = topic
+        self.relevant = relevant
+
+    def _is_relevant(self, path: str) -> bool:
+        if _is_noise(path):
+            return False
+        return self.relevant is None or self.relevant(path)
+
+    def dispatch(self, event) -> None:
+        # Reads produce open/close events; only writes matter. A directory's
+        # "modified" event always accompanies an event for the child itself.
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        if event.is_directory and event.event_type == "modified":
+            return
+        paths = [os.fsdecode(p) for p in (event.src_path, getattr(event, "dest_path", "")) if p]
+        if not any(self._is_relevant(p) for p in paths):
+            return
+        self.bus.publish(self.topic)
+
+
+def _wake(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class ChangeBus:
+    """Versioned change notifications keyed by topic
+
+    Every ``publish`` increments the topic's version and wakes ``wait``-ers
+    (threads) and ``wait_async``-ers (coroutines).
+    Subscribers remember the last version they rendered and only do work when
+    it moved.
+    """
+
+    def __init__(self):
+        self._versions: Dict[str, int] = {}
+        self._condition = threading.Condition()
+        self._observer = None
+        self._watches: Set[Tuple[Path, str]] = set()
+        self._async_waiters: Set[Tuple[asyncio.AbstractEventLoop, asyncio.Future]] = set()
+
+    @property
+    def is_watching(self) -> bool:
+        """Whether file watches are active (False without watchdog)"""
+        return self._observer is not None
+
+    def watch(
+        self,
+        path: Union[str, Path],
+        topic: str,
+        recursive: bool = True,
+        relevant: Optional[Callable[[str], bool]] = None,
+    ) -> bool:
+        """Publish ``topic`` whenever something under ``path`` changes
+
+        Args:
+            relevant: Optional predicate on changed paths; other changes are ignored.
+
+        Returns:
+            True if the watch is active, False if it could not be set up.
+        """
+        path = Path(path)
+        with self._condition:
+            if (path, topic) in self._watches:
+                return True
+            if not HAS_WATCHDOG or not path.is_dir():
+                return False
+            try:
+                if self._observer is None:
+                    observer = Observer()
+                    observer.daemon = True
+                    observer.start()
+                    self._observer = observer
+                self._observer.schedule(
+                    _TopicEventHandler(self, topic, relevant), str(path), recursive=recursive
+                )
+            except Exception:
+                # Watch limits reached or unsupported filesystem
+                return False
+            self._watches.add((path, topic))
+            return True
+
+    def publish(self, topic: str) -> int:
+        """Record a change on ``topic`` and return its new version"""
+        with self._condition:
+            version = self._versions.get(topic, 0) + 1
+            self._versions[topic] = version
+            self._condition.notify_all()
+            for loop, future in self._async_waiters:
+                try:
+                    loop.call_soon_threadsafe(_wake, future)
+                except RuntimeError:
+                    # The waiter's loop was closed
+                    pass
+            return version
+
+    def version(self, topic: str) -> int:
+        """Current version of ``topic`` (0 if nothing was published yet)"""
+        return self._versions.get(topic, 0)
+
+    def wait(
+        self, topics: Iterable[str], since: Dict[str, int], timeout: Optional[float] = None
+    ) -> Dict[str, int]:
+        """Block until any topic moves past the version in ``since``
+
+        Returns:
+            The current versions of ``topics`` (unchanged if the wait timed out).
+        """
+        topics = list(topics)
+
+        def current():
+            return {topic: self._versions.get(topic, 0) for topic in topics}
+
+        with self._condition:
+            self._condition.wait_for(
+                lambda: any(v != since.get(t, 0) for t, v in current().items()), timeout
+            )
+            return current()
+
+    async def wait_async(
+        self, topics: Iterable[str], since: Dict[str, int], timeout: Optional[float] = None
+    ) -> Dict[str, int]:
+        """``wait`` for coroutines: parks a future instead of a thread
+
+        Returns:
+            The current versions of ``topics`` (unchanged if the wait timed out).
+        """
+        topics = list(topics)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+
+        while True:
+            with self._condition:
+                current = {topic: self._versions.get(topic, 0) for topic in topics}
+                if any(v != since.get(t, 0) for t, v in current.items()):
+                    return current
+                waiter = (loop, loop.create_future())
+                self._async_waiters.add(waiter)
+            try:
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    return current
+                await asyncio.wait_for(waiter[1], remaining)
+            except asyncio.TimeoutError:
+                return current
+            finally:
+                with self._condition:
+                    self._async_waiters.discard(waiter)
+
+    def close(self) -> None:
+        """Stop all file watches"""
+        with self._condition:
+            observer, self._observer = self._observer, None
+            self._watches.clear()
+        if observer is not None:
+            try:
+                observer.stop()
+            except Exception:
+                pass
+
+
+_shared_bus: Optional[ChangeBus] = None
+_shared_bus_lock = threading.Lock()
+
+
+def get_change_bus() -> ChangeBus:
+    """Return the process-wide change bus"""
+    global _shared_bus
+    with _shared_bus_lock:
+        if _shared_bus is None:
+            _shared_bus = ChangeBus()
+        return _shared_bus
+
+
+def watch_server_sources(bus: ChangeBus, config_manager) -> bool:
+    """Watch everything ``config_manager.list_servers()`` is built from
+
+    Covers the config dir (``servers.json``, ``servers/``, the run registry),
+    the scripts of registered servers and Claude Desktop's config and logs.
+    Everything else written to those directories (ports, key stores, logs,
+    prefork state) is ignored so it does not trigger re-renders.
+
+    Returns:
+        True if at least the config dir is being watched.
+    """
+    from .server_manager import GradioMCPServer
+
+    watching = bus.watch(
+        config_manager.config_dir,
+        TOPIC_SERVERS,
+        relevant=config_manager._server_catalog().is_relevant_path,
+    )
+
+    claude_config_path, claude_logs_path = GradioMCPServer.find_claude_desktop_paths()
+    if claude_config_path:
+        bus.watch(
+            claude_config_path.parent,
+            TOPIC_SERVERS,
+            recursive=False,
+            relevant=lambda path: Path(path) == claude_config_path,
+        )
+        bus.watch(
+            claude_logs_path,
+            TOPIC_SERVERS,
+            recursive=False,
+            relevant=lambda path: Path(path).name.startswith("mcp-server-"),
+        )
+
+    scripts_by_dir: Dict[Path, Set[Path]] = {}
+    for server in config_manager.list_servers():
+        if server.get("source") == "local" and server.get("path"):
+            script = Path(server["path"])
+            scripts_by_dir.setdefault(script.parent, set()).add(script)
+    for directory, scripts in scripts_by_dir.items():
+        bus.watch(
+            directory,
+            TOPIC_SERVERS,
+            recursive=False,
+            relevant=lambda path, scripts=scripts: Path(path) in scripts,
+        )
+
+    return watching
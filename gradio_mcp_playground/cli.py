@@ -230,13 +230,33 @@ def list(format: str):
 
 
 @server.command()
-@click.argument("name")
+@click.argument("name", required=False)
 @click.option("--port", "-p", type=int, help="Port to run on")
 @click.option("--reload", "-r", is_flag=True, help="Enable auto-reload")
 @click.option("--public", is_flag=True, help="Create public URL")
-def start(name: str, port: Optional[int], reload: bool, public: bool):
-    """Start a Gradio MCP server"""
+@click.option("--all", "all_servers", is_flag=True, help="Serve all local servers from one process")
+@click.option(
+    "--workers", "-w", type=int, default=1, help="With --all: processes to spread servers across"
+)
+def start(
+    name: Optional[str],
+    port: Optional[int],
+    reload: bool,
+    public: bool,
+    all_servers: bool,
+    workers: int,
+):
+    """Start a Gradio MCP server, or all local servers with --all"""
     config_manager = ConfigManager()
+
+    if all_servers:
+        _start_all_servers(config_manager, port, workers)
+        return
+
+    if not name:
+        console.print("[red]Specify a server name or use --all.[/red]")
+        return
+
     server_config = config_manager.get_server(name)
 
     if not server_config:
@@ -274,6 +294,80 @@ def start(name: str, port: Optional[int], reload: bool, public: bool):
         console.print(f"[red]Error starting server: {e}[/red]")
 
 
+def _start_all_servers(config_manager: ConfigManager, port: Optional[int], workers: int):
+    """Serve every local server, mounted at /<name>/, from ``workers`` processes"""
+    import tempfile
+
+    from .multi_server import MCP_ENDPOINT, serve, split_servers
+    from .port_allocator import get_port_allocator
+
+    servers = [
+        {"name": s["name"], "path": s["path"]}
+        for s in config_manager.list_servers()
+        if s.get("source") != "claude_desktop" and s.get("path") and Path(s["path"]).is_file()
+    ]
+    if not servers:
+        console.print("[yellow]No local servers found.[/yellow]")
+        return
+
+    groups = split_servers(servers, workers)
+    allocator = get_port_allocator()
+    ports = [
+        allocator.reserve(preferred=(port + index) if port else None, label="multi-server")
+        for index in range(len(groups))
+    ]
+
+    table = Table(title=f"Serving {len(servers)} servers from {len(groups)} process(es)")
+    table.add_column("Name", style="cyan")
+    table.add_column("URL")
+    table.add_column("MCP endpoint")
+    for group, group_port in zip(groups, ports):
+        for server_config in group:
+            base = f"http://localhost:{group_port}/{server_config['name']}/"
+            table.add_row(server_config["name"], base, base + MCP_ENDPOINT)
+    console.print(table)
+
+    if len(groups) == 1:
+        try:
+            serve(groups[0], ports[0])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            allocator.release(ports[0])
+        console.print("\n[yellow]Servers stopped.[/yellow]")
+        return
+
+    # One worker process per group; each serves its servers on its own port
+    processes = []
+    with tempfile.TemporaryDirectory() as config_dir:
+        for index, (group, group_port) in enumerate(zip(groups, ports)):
+            config_path = Path(config_dir) / f"worker-{index}.json"
+            config_path.write_text(json.dumps(group))
+            process = subprocess.Popen(
+                [
+                    sys.executable,
+                    "-m",
+                    "gradio_mcp_playground.multi_server",
+                    "--config",
+                    str(config_path),
+                    "--port",
+                    str(group_port),
+                ]
+            )
+            allocator.assign(group_port, process.pid)
+            processes.append(process)
+
+        try:
+            for process in processes:
+                process.wait()
+        except KeyboardInterrupt:
+            for process in processes:
+                process.terminate()
+            for process in processes:
+                process.wait()
+    console.print("\n[yellow]Servers stopped.[/yellow]")
+
+
 @server.command()
 @click.argument("name")
 def stop(name: str):
@@ -603,7 +697,8 @@ def status():
             f"Cached Files:\n"
             f"  - Servers: {stats['files']['servers']}\n"
             f"  - Tools: {stats['files']['tools']}\n"
-            f"  - Configs: {stats['files']['configs']}",
+            f"  - Configs: {stats['files']['configs']}\n"
+            f"  - Discovery sources: {stats['files']['discovery']}",
             title="📦 Cache Statistics"
         ))
     except Exception as e:
@@ -611,7 +706,7 @@ def status():
 
 
 @cache.command()
-@click.option("--type", "-t", type=click.Choice(["all", "servers", "tools", "configs"]), default="all", help="Type of cache to clear")
+@click.option("--type", "-t", type=click.Choice(["all", "servers", "tools", "configs", "discovery"]), default="all", help="Type of cache to clear")
 def clear(type: str):
     """Clear cache"""
     try:
@@ -725,16 +820,12 @@ def cache_status():
         table.add_column("Metric", style="dim", width=25)
         table.add_column("Value", width=20)
         
-        table.add_row("Total Entries", str(stats['total_entries']))
-        table.add_row("MCP Servers Cached", str(stats['mcp_servers']))
-        table.add_row("Configs Cached", str(stats['configs']))
-        table.add_row("Models Cached", str(stats['models']))
-        table.add_row("Cache Size", f"{stats['cache_size_mb']} MB")
-        
-        if stats['oldest_entry']:
-            table.add_row("Oldest Entry", stats['oldest_entry'])
-        if stats['newest_entry']:
-            table.add_row("Newest Entry", stats['newest_entry'])
+        table.add_row("Servers Cached", str(stats['files']['servers']))
+        table.add_row("Tools Cached", str(stats['files']['tools']))
+        table.add_row("Configs Cached", str(stats['files']['configs']))
+        table.add_row("Discovery Sources Cached", str(stats['files']['discovery']))
+        table.add_row("Cache Size", stats['size_readable'])
+        table.add_row("Size Cap", stats['max_size_readable'])
         
         console.print(table)
         
@@ -803,6 +894,99 @@ def cache_refresh(server_name: Optional[str]):
         console.print(f"[red]Error refreshing cache: {e}[/red]")
 
 
+@cache.command("gc")
+@click.option("--max-size", type=float, help="Size cap in MB (defaults to GMP_CACHE_MAX_SIZE_MB)")
+def cache_gc(max_size: Optional[float]):
+    """Evict least recently used cache entries beyond the size cap"""
+    try:
+        from .cache_manager import get_cache_manager
+        
+        cache_manager = get_cache_manager()
+        result = cache_manager.gc(max_size_mb=max_size)
+        
+        console.print(
+            f"[green]✓ Removed {result['removed']} cache entries "
+            f"({result['freed'] / (1024 * 1024):.2f} MB freed)[/green]"
+        )
+        if result['temp_files_removed']:
+            console.print(f"Removed {result['temp_files_removed']} stale temp files")
+        console.print(
+            f"Cache size: {result['size'] / (1024 * 1024):.2f} MB "
+            f"of {result['max_size'] / (1024 * 1024):.2f} MB"
+        )
+        
+    except Exception as e:
+        console.print(f"[red]Error collecting cache garbage: {e}[/red]")
+
+
+@cache.command("warm")
+@click.option("--concurrency", "-c", type=int, default=4, help="Servers to start at once")
+@click.option("--server", "-s", "server_names", multiple=True, help="Only warm these servers")
+def cache_warm(concurrency: int, server_names: tuple):
+    """Prefetch tool schemas of all configured MCP servers into the cache"""
+    try:
+        import time
+
+        from .cache_manager import get_cache_manager
+        from .mcp_server_config import MCPServerConfig
+        from .parallel_server_loader import warm_servers_cache
+        
+        if not get_cache_manager().enabled:
+            console.print(
+                "[yellow]Caching is disabled (GMP_DISABLE_CACHE=1), nothing to warm.[/yellow]"
+            )
+            return
+        
+        servers = MCPServerConfig().list_servers()
+        if server_names:
+            missing = [name for name in server_names if name not in servers]
+            for name in missing:
+                console.print(f"[yellow]Server '{name}' is not configured, skipping.[/yellow]")
+            servers = {name: servers[name] for name in server_names if name in servers}
+        
+        if not servers:
+            console.print("[yellow]No MCP servers configured.[/yellow]")
+            return
+        
+        console.print(
+            f"[blue]Warming cache for {len(servers)} servers "
+            f"({concurrency} at a time)...[/blue]\n"
+        )
+        started = time.perf_counter()
+        results = warm_servers_cache(servers, max_workers=concurrency)
+        elapsed = time.perf_counter() - started
+        
+        table = Table(show_header=True, header_style="bold cyan")
+        table.add_column("Server", style="cyan")
+        table.add_column("Status")
+        table.add_column("Tools", justify="right")
+        table.add_column("Start (s)", justify="right")
+        table.add_column("Init (s)", justify="right")
+        table.add_column("Total (s)", justify="right")
+        
+        for result in results:
+            if result['success']:
+                status = "[green]cached[/green]"
+            else:
+                status = f"[red]{result['error']}[/red]"
+            table.add_row(
+                result['name'],
+                status,
+                str(result['tools']),
+                f"{result['start_time']:.2f}",
+                f"{result['init_time']:.2f}",
+                f"{result['total_time']:.2f}",
+            )
+        
+        console.print(table)
+        
+        warmed = sum(1 for result in results if result['success'])
+        console.print(f"\n[bold]{warmed}/{len(results)} servers cached in {elapsed:.2f}s[/bold]")
+        
+    except Exception as e:
+        console.print(f"[red]Error warming cache: {e}[/red]")
+
+
 @main.command()
 def examples():
     """Show example Gradio MCP servers"""
@@ -280,9 +280,9 @@ if HAS_LLAMAINDEX:
                     List of matching MCP servers with descriptions
                 """
                 try:
-                    from .registry import ServerRegistry
+                    from .registry import get_registry
 
-                    registry = ServerRegistry()
+                    registry = get_registry()
 
                     # Search for matching servers
                     results = registry.search_mcp_servers(query)
@@ -325,10 +325,10 @@ if HAS_LLAMAINDEX:
                     Information about required arguments and environment variables
                 """
                 try:
-                    from .registry import ServerRegistry
+                    from .registry import get_registry
                     from .secure_storage import SecureTokenStorage
 
-                    registry = ServerRegistry()
+                    registry = get_registry()
                     storage = SecureTokenStorage()
 
                     # Get server info
@@ -476,19 +476,21 @@ if HAS_LLAMAINDEX:
                         with open(claude_config_path) as f:
                             claude_config = json.load(f)
                             if "mcpServers" in claude_config:
+                                # API keys found in env vars, stored in one batched write
+                                imported_keys = {}
+
                                 # Import Claude Desktop servers into our local config
                                 for server_name, server_config in claude_config["mcpServers"].items():
                                     if server_name not in servers:
                                         # Extract environment variables that might contain API keys
                                         env_vars = server_config.get("env", {})
 
-                                        # Store API keys securely
+                                        # Collect API keys to store securely
                                         if env_vars:
                                             for env_key, env_value in env_vars.items():
                                                 # Common API key patterns
                                                 if any(pattern in env_key.upper() for pattern in ["TOKEN", "KEY", "SECRET", "API"]):
-                                                    storage.store_key(server_name, env_key, env_value)
-                                                    print(f"  🔐 Encrypted {env_key} for {server_name}")
+                                                    imported_keys.setdefault(server_name, {})[env_key] = env_value
 
                                         # Add server to our local config (without sensitive env vars)
                                         config.add_server(
@@ -500,6 +502,11 @@ if HAS_LLAMAINDEX:
 
                                         servers[server_name] = server_config
                                         print(f"  📎 Imported {server_name} from Claude Desktop config")
+
+                                if imported_keys and storage.store_many(imported_keys):
+                                    for server_name, server_keys in imported_keys.items():
+                                        for env_key in server_keys:
+                                            print(f"  🔐 Encrypted {env_key} for {server_name}")
                     except Exception as e:
                         print(f"Warning: Could not load Claude Desktop config: {e}")
 
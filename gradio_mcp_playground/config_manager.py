@@ -4,9 +4,13 @@ Manages configuration for Gradio MCP Playground.
 """
 
 import json
+import os
+import platform
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Import secure storage
 try:
@@ -16,129 +20,227 @@ try:
 except ImportError:
     HAS_SECURE_STORAGE = False
 
+# Optional file watching for catalog invalidation
+try:
+    from watchdog.observers import Observer
 
-class ConfigManager:
-    """Manages Gradio MCP Playground configuration"""
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
 
-    def __init__(self):
-        # Determine the correct config directory, handling WSL path differences
-        self.config_dir = self._find_config_dir()
-        self.config_path = self.config_dir / "config.json"
-        self.servers_path = self.config_dir / "servers.json"
-        self.connections_path = self.config_dir / "connections.json"
-        self._ensure_config_dir()
-        self._load_config()
+# Rebuild the server catalog at least this often (seconds), even without file
+# events, so time-based statuses (e.g. Claude Desktop "Inactive") stay honest
+CATALOG_MAX_AGE = 30.0
 
-        # Initialize secure storage if available
-        if HAS_SECURE_STORAGE:
-            try:
-                self.secure_storage = SecureTokenStorage(self.config_dir)
-            except Exception as e:
-                print(f"Warning: Could not initialize secure storage: {e}")
-                self.secure_storage = None
-        else:
-            self.secure_storage = None
+# Subdirectory of the config dir holding one record per started server
+RUN_REGISTRY_DIRNAME = "run"
 
-    def _find_config_dir(self) -> Path:
-        """Find the appropriate config directory, handling WSL environments"""
-        import os
-        import platform
-
-        # Check if we're in WSL
-        is_wsl = "microsoft" in platform.uname().release.lower()
-
-        if is_wsl:
-            # In WSL, try to find the Windows user directory
-            # First check if we can determine it from the current working directory
-            cwd = os.getcwd()
-            if cwd.startswith("/mnt/c/Users/"):
-                # Extract Windows username from path
-                parts = cwd.split("/")
-                if len(parts) > 4:
-                    windows_user = parts[4]
-                else:
-                    windows_user = None
-            else:
-                # Try environment variables
-                windows_user = os.environ.get("USER", os.environ.get("USERNAME", ""))
+# Files inside a server directory whose changes affect the catalog
+_SERVER_DIR_FILES = {"app.py", "mcp_config.json", ".mcp_server.json"}
 
-            # Also check common variations
-            possible_users = []
-            if windows_user:
-                possible_users = [windows_user, "seanp", "sean"]  # Include known usernames
-            else:
-                possible_users = ["seanp", "sean"]  # Fallback to known usernames
 
-            # Try to find existing .gradio-mcp directory
-            for user in possible_users:
-                windows_path = Path(f"/mnt/c/Users/{user}/.gradio-mcp")
-                if windows_path.exists():
-                    return windows_path
+def _stat_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """Return ``(mtime_ns, size)`` for a path, or None if it does not exist"""
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
 
-            # If none exist, check for servers directory
-            for user in possible_users:
-                windows_path = Path(f"/mnt/c/Users/{user}/.gradio-mcp")
-                servers_dir = windows_path / "servers"
-                if servers_dir.exists():
-                    return windows_path
 
-            # Default to first possible user
-            return Path(f"/mnt/c/Users/{possible_users[0]}/.gradio-mcp")
+def _pid_alive(pid: int) -> bool:
+    """Check whether a process is still running"""
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
 
-        # Default to home directory
-        return Path.home() / ".gradio-mcp"
 
-    def _ensure_config_dir(self) -> None:
-        """Ensure configuration directory exists"""
-        self.config_dir.mkdir(parents=True, exist_ok=True)
+class _CatalogEventHandler:
+    """watchdog handler that marks the catalog dirty on relevant changes"""
+
+    def __init__(self, catalog: "_ServerCatalog"):
+        self.catalog = catalog
+
+    def dispatch(self, event) -> None:
+        # Our own reads produce open/close events; only writes matter
+        if event.event_type in ("opened", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        if any(p and self.catalog.is_relevant_path(os.fsdecode(p)) for p in paths):
+            self.catalog.invalidate()
+
+
+class _ServerCatalog:
+    """In-memory, name-indexed view of all known servers
+
+    The catalog is built once from ``servers.json``, the auto-discovered
+    ``servers/`` directory and Claude Desktop, then served from memory until a
+    watched file changes. Without watchdog it falls back to comparing a stat
+    signature of the same files on each access.
+    """
+
+    def __init__(self, config_dir: Path, servers_path: Path):
+        self.config_dir = config_dir
+        self.servers_path = servers_path
+        self.servers_dir = config_dir / "servers"
+        self.run_dir = config_dir / RUN_REGISTRY_DIRNAME
+        self._lock = threading.RLock()
+        self._servers: Optional[List[Dict[str, Any]]] = None
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._built_at = 0.0
+        self._dirty = True
+        self._signature: Optional[tuple] = None
+        self._claude_config_path: Optional[Path] = None
+        self._claude_logs_path: Optional[Path] = None
+        self._observer = None
+        self._watched: set = set()
+
+    # Invalidation
+
+    def invalidate(self) -> None:
+        """Force a rebuild on the next access"""
+        self._dirty = True
+
+    def is_relevant_path(self, path: str) -> bool:
+        """Check whether a changed path can affect the catalog"""
+        changed = Path(path)
+        if changed == self.servers_path or changed == self.servers_dir:
+            return True
+        if changed.parent == self.run_dir:
+            return changed.suffix == ".json"
 
-    def _load_config(self) -> None:
-        """Load configuration from file"""
-        if self.config_path.exists():
-            with open(self.config_path) as f:
-                self.config = json.load(f)
-        else:
-            self.config = self._get_default_config()
-            self.save_config(self.config)
+        try:
+            relative = changed.relative_to(self.servers_dir)
+        except ValueError:
+            relative = None
+        if relative is not None:
+            # A server directory itself, or one of the files we read from it
+            return len(relative.parts) == 1 or changed.name in _SERVER_DIR_FILES
+
+        if self._claude_config_path and changed == self._claude_config_path:
+            return True
+        if self._claude_logs_path and changed.parent == self._claude_logs_path:
+            return changed.name.startswith("mcp-server-")
 
-    def _get_default_config(self) -> Dict[str, Any]:
-        """Get default configuration"""
-        return {
-            "default_port": 7860,
-            "auto_reload": True,
-            "mcp_protocol": "auto",
-            "log_level": "INFO",
-            "theme": "default",
-            "check_updates": True,
-        }
+        return False
 
-    def config_exists(self) -> bool:
-        """Check if configuration exists"""
-        return self.config_path.exists()
+    def _compute_signature(self) -> tuple:
+        """Stat-only fingerprint of every input, used when watchdog is unavailable"""
+        parts: List[Any] = [_stat_signature(self.servers_path), _stat_signature(self.run_dir)]
 
-    def load_config(self) -> Dict[str, Any]:
-        """Load and return configuration"""
-        return self.config.copy()
+        if self.servers_dir.is_dir():
+            for server_path in sorted(self.servers_dir.iterdir()):
+                if server_path.is_dir():
+                    parts.append(
+                        (
+                            server_path.name,
+                            tuple(
+                                _stat_signature(server_path / name)
+                                for name in sorted(_SERVER_DIR_FILES)
+                            ),
+                        )
+                    )
+
+        if self._claude_config_path:
+            parts.append(_stat_signature(self._claude_config_path))
+        if self._claude_logs_path and self._claude_logs_path.is_dir():
+            for log_file in sorted(self._claude_logs_path.glob("mcp-server-*.log")):
+                parts.append((log_file.name, _stat_signature(log_file)))
+
+        return tuple(parts)
+
+    def _is_stale(self) -> bool:
+        if self._servers is None or self._dirty:
+            return True
+        if time.monotonic() - self._built_at > CATALOG_MAX_AGE:
+            return True
+        if self._observer is None:
+            return self._compute_signature() != self._signature
+        return False
 
-    def save_config(self, config: Dict[str, Any]) -> None:
-        """Save configuration to file"""
-        self.config = config
-        with open(self.config_path, "w") as f:
-            json.dump(config, f, indent=2)
+    def _watch(self, path: Optional[Path], recursive: bool = False) -> None:
+        """Schedule a watch on a directory once; failures fall back to stat checks"""
+        if not path or path in self._watched or not path.is_dir():
+            return
+        try:
+            if self._observer is None:
+                observer = Observer()
+                observer.daemon = True
+                observer.start()
+                self._observer = observer
+            self._observer.schedule(_CatalogEventHandler(self), str(path), recursive=recursive)
+            self._watched.add(path)
+        except Exception:
+            # Watch limits reached or unsupported filesystem
+            self.close()
+
+    def close(self) -> None:
+        """Stop watching files; later accesses use stat signatures"""
+        observer, self._observer = self._observer, None
+        self._watched.clear()
+        if observer is not None:
+            try:
+                observer.stop()
+            except Exception:
+                pass
 
-    def get(self, key: str, default: Any = None) -> Any:
-        """Get a configuration value"""
-        return self.config.get(key, default)
+    # Access
 
-    def set(self, key: str, value: Any) -> None:
-        """Set a configuration value"""
-        self.config[key] = value
-        self.save_config(self.config)
+    def servers(self) -> List[Dict[str, Any]]:
+        """Return copies of all catalog entries, refreshing liveness of local servers"""
+        with self._lock:
+            if self._is_stale():
+                self._rebuild()
+            servers = [server.copy() for server in self._servers]
 
-    # Server management
+        for server in servers:
+            if server.get("source") == "local" and server.get("pid"):
+                server["running"] = _pid_alive(server["pid"])
+        return servers
 
-    def list_servers(self) -> List[Dict[str, Any]]:
-        """List all registered servers including Claude Desktop servers and auto-discovered servers"""
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """Look up a single server by name"""
+        with self._lock:
+            if self._is_stale():
+                self._rebuild()
+            server = self._index.get(name)
+            server = server.copy() if server is not None else None
+
+        if server and server.get("source") == "local" and server.get("pid"):
+            server["running"] = _pid_alive(server["pid"])
+        return server
+
+    def _rebuild(self) -> None:
+        # Clear the flag first so events that arrive mid-build trigger another pass
+        self._dirty = False
+
+        from .server_manager import GradioMCPServer
+
+        self._claude_config_path, self._claude_logs_path = (
+            GradioMCPServer.find_claude_desktop_paths()
+        )
+        if HAS_WATCHDOG and os.environ.get("GMP_DISABLE_FILE_WATCH") != "1":
+            self._watch(self.config_dir, recursive=True)
+            if self._claude_config_path:
+                self._watch(self._claude_config_path.parent)
+            self._watch(self._claude_logs_path)
+        if self._observer is None:
+            self._signature = self._compute_signature()
+
+        servers = self._discover()
+        index: Dict[str, Dict[str, Any]] = {}
+        for server in servers:
+            # First entry wins, matching the previous linear search
+            index.setdefault(server.get("name"), server)
+
+        self._servers = servers
+        self._index = index
+        self._built_at = time.monotonic()
+
+    def _discover(self) -> List[Dict[str, Any]]:
+        """Read every server source from disk"""
         servers = []
         registered_names = set()
 
@@ -169,7 +271,7 @@ class ConfigManager:
                 servers.append(server_info)
 
         # Auto-discover servers from .gradio-mcp/servers/ directory
-        servers_dir = self.config_dir / "servers"
+        servers_dir = self.servers_dir
         if servers_dir.exists() and servers_dir.is_dir():
             for server_path in servers_dir.iterdir():
                 if server_path.is_dir():
@@ -222,13 +324,162 @@ class ConfigManager:
 
         return servers
 
+
+_catalogs: Dict[Tuple[Path, Path], _ServerCatalog] = {}
+_catalogs_lock = threading.Lock()
+
+
+def _get_server_catalog(config_dir: Path, servers_path: Path) -> _ServerCatalog:
+    """Return the process-wide catalog for a config directory"""
+    key = (Path(config_dir), Path(servers_path))
+    with _catalogs_lock:
+        catalog = _catalogs.get(key)
+        if catalog is None:
+            catalog = _ServerCatalog(*key)
+            _catalogs[key] = catalog
+        return catalog
+
+
+def get_config_dir() -> Path:
+    """Find the appropriate config directory, handling WSL environments"""
+    # Check if we're in WSL
+    is_wsl = "microsoft" in platform.uname().release.lower()
+
+    if is_wsl:
+        # In WSL, try to find the Windows user directory
+        # First check if we can determine it from the current working directory
+        cwd = os.getcwd()
+        if cwd.startswith("/mnt/c/Users/"):
+            # Extract Windows username from path
+            parts = cwd.split("/")
+            if len(parts) > 4:
+                windows_user = parts[4]
+            else:
+                windows_user = None
+        else:
+            # Try environment variables
+            windows_user = os.environ.get("USER", os.environ.get("USERNAME", ""))
+
+        # Also check common variations
+        possible_users = []
+        if windows_user:
+            possible_users = [windows_user, "seanp", "sean"]  # Include known usernames
+        else:
+            possible_users = ["seanp", "sean"]  # Fallback to known usernames
+
+        # Try to find existing .gradio-mcp directory
+        for user in possible_users:
+            windows_path = Path(f"/mnt/c/Users/{user}/.gradio-mcp")
+            if windows_path.exists():
+                return windows_path
+
+        # If none exist, check for servers directory
+        for user in possible_users:
+            windows_path = Path(f"/mnt/c/Users/{user}/.gradio-mcp")
+            servers_dir = windows_path / "servers"
+            if servers_dir.exists():
+                return windows_path
+
+        # Default to first possible user
+        return Path(f"/mnt/c/Users/{possible_users[0]}/.gradio-mcp")
+
+    # Default to home directory
+    return Path.home() / ".gradio-mcp"
+
+
+class ConfigManager:
+    """Manages Gradio MCP Playground configuration"""
+
+    def __init__(self):
+        # Determine the correct config directory, handling WSL path differences
+        self.config_dir = self._find_config_dir()
+        self.config_path = self.config_dir / "config.json"
+        self.servers_path = self.config_dir / "servers.json"
+        self.connections_path = self.config_dir / "connections.json"
+        self._ensure_config_dir()
+        self._load_config()
+
+        # Initialize secure storage if available
+        if HAS_SECURE_STORAGE:
+            try:
+                self.secure_storage = SecureTokenStorage(self.config_dir)
+            except Exception as e:
+                print(f"Warning: Could not initialize secure storage: {e}")
+                self.secure_storage = None
+        else:
+            self.secure_storage = None
+
+    def _find_config_dir(self) -> Path:
+        """Find the appropriate config directory, handling WSL environments"""
+        return get_config_dir()
+
+    def _ensure_config_dir(self) -> None:
+        """Ensure configuration directory exists"""
+        self.config_dir.mkdir(parents=True, exist_ok=True)
+
+    def _load_config(self) -> None:
+        """Load configuration from file"""
+        if self.config_path.exists():
+            with open(self.config_path) as f:
+                self.config = json.load(f)
+        else:
+            self.config = self._get_default_config()
+            self.save_config(self.config)
+
+    def _get_default_config(self) -> Dict[str, Any]:
+        """Get default configuration"""
+        return {
+            "default_port": 7860,
+            "auto_reload": True,
+            "mcp_protocol": "auto",
+            "log_level": "INFO",
+            "theme": "default",
+            "check_updates": True,
+        }
+
+    def config_exists(self) -> bool:
+        """Check if configuration exists"""
+        return self.config_path.exists()
+
+    def load_config(self) -> Dict[str, Any]:
+        """Load and return configuration"""
+        return self.config.copy()
+
+    def save_config(self, config: Dict[str, Any]) -> None:
+        """Save configuration to file"""
+        self.config = config
+        with open(self.config_path, "w") as f:
+            json.dump(config, f, indent=2)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Get a configuration value"""
+        return self.config.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        """Set a configuration value"""
+        self.config[key] = value
+        self.save_config(self.config)
+
+    # Server management
+
+    def _server_catalog(self) -> _ServerCatalog:
+        return _get_server_catalog(self.config_dir, self.servers_path)
+
+    def invalidate_servers(self) -> None:
+        """Drop the cached server catalog so the next lookup re-reads disk"""
+        self._server_catalog().invalidate()
+
+    def list_servers(self) -> List[Dict[str, Any]]:
+        """List all registered servers including Claude Desktop servers and auto-discovered servers
+
+        Results come from a shared in-memory catalog that is rebuilt only when
+        the underlying files change.
+        """
+        return self._server_catalog().servers()
+
     def get_server(self, name: str) -> Optional[Dict[str, Any]]:
         """Get a specific server by name"""
-        servers = self.list_servers()
-        for server in servers:
-            if server.get("name") == name:
-                return server
-        return None
+        return self._server_catalog().get(name)
 
     def add_server(self, server_config: Dict[str, Any]) -> None:
         """Add a new server to the registry"""
@@ -250,6 +501,7 @@ class ConfigManager:
 
         with open(self.servers_path, "w") as f:
             json.dump(data, f, indent=2)
+        self.invalidate_servers()
 
     def remove_server(self, name: str) -> bool:
         """Remove a server from the registry"""
@@ -265,6 +517,7 @@ class ConfigManager:
         if len(data["servers"]) < original_count:
             with open(self.servers_path, "w") as f:
                 json.dump(data, f, indent=2)
+            self.invalidate_servers()
             return True
 
         return False
@@ -284,6 +537,7 @@ class ConfigManager:
 
                 with open(self.servers_path, "w") as f:
                     json.dump(data, f, indent=2)
+                self.invalidate_servers()
 
                 return True
 
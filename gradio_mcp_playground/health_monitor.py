@@ -0,0 +1,384 @@
+"""Gradio MCP Server Health Monitor
+
+A background thread probes every running local server's web UI and MCP
+endpoint at a fixed interval, concurrently, and keeps the results in
+fixed-size ring buffers. From the recent probes it derives latency
+percentiles, an error rate and a status (healthy, degraded or unhealthy), so a
+server whose process is alive but no longer answers shows up as unhealthy
+instead of "Running". Status changes are published on the change bus.
+"""
+
+import asyncio
+import http.client
+import math
+import os
+import threading
+import time
+import urllib.parse
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, NamedTuple, Optional, Tuple
+
+from .change_bus import TOPIC_HEALTH, get_change_bus
+
+# Optional imports
+try:
+    import aiohttp
+
+    HAS_AIOHTTP = True
+except ImportError:
+    HAS_AIOHTTP = False
+
+DEFAULT_INTERVAL = 10.0
+DEFAULT_HISTORY = 60  # ten minutes at the default interval
+DEFAULT_TIMEOUT = 5.0
+DEFAULT_WINDOW = 20  # probes that statistics and the status are computed over
+
+MCP_ENDPOINT = "gradio_api/mcp/sse"
+
+STATUS_HEALTHY = "healthy"
+STATUS_DEGRADED = "degraded"
+STATUS_UNHEALTHY = "unhealthy"
+STATUS_UNKNOWN = "unknown"
+
+STATUS_ICONS = {
+    STATUS_HEALTHY: "🟢",
+    STATUS_DEGRADED: "🟡",
+    STATUS_UNHEALTHY: "🔴",
+    STATUS_UNKNOWN: "⚪",
+}
+
+
+class ProbeSample(NamedTuple):
+    """One probe round against a server"""
+
+    timestamp: float
+    latency_ms: Optional[float]  # web UI response time; None if it failed
+    mcp_latency_ms: Optional[float]  # MCP endpoint response time, if probed
+    error: Optional[str]  # None when every endpoint answered
+
+
+class HealthReport(NamedTuple):
+    """Health derived from a server's recent probes"""
+
+    status: str
+    p50_ms: Optional[float]
+    p95_ms: Optional[float]
+    p99_ms: Optional[float]
+    error_rate: float
+    consecutive_failures: int
+    probes: int
+    last_error: Optional[str]
+    last_probe: Optional[float]
+
+
+class HealthTarget(NamedTuple):
+    """URLs probed for one server"""
+
+    url: str
+    mcp_url: Optional[str] = None
+
+
+def health_key(app_path: Any) -> str:
+    """Key of a local server (by its ``app.py`` path) in the health monitor"""
+    return f"server:{app_path}"
+
+
+def _percentile(sorted_values: List[float], q: float) -> Optional[float]:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _get_status(url: str, timeout: float) -> int:
+    """GET ``url`` with http.client and return the status once headers arrive"""
+    parts = urllib.parse.urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=timeout)
+    try:
+        connection.request("GET", parts.path or "/")
+        # The MCP endpoint is an event stream; the status line is all we need
+        return connection.getresponse().status
+    finally:
+        connection.close()
+
+
+class HealthMonitor:
+    """Background HTTP/MCP prober with per-server ring buffers
+
+    Servers are registered with ``track``, or discovered on every round by the
+    optional ``discover`` callable, which returns ``{key: HealthTarget}``.
+    Reads (``report``, ``history``) only look at buffered probes.
+    """
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        history: int = DEFAULT_HISTORY,
+        timeout: float = DEFAULT_TIMEOUT,
+        window: int = DEFAULT_WINDOW,
+        slow_ms: float = 1000.0,
+        degraded_error_rate: float = 0.1,
+        unhealthy_error_rate: float = 0.5,
+        unhealthy_after: int = 3,
+        discover: Optional[Callable[[], Dict[str, HealthTarget]]] = None,
+    ):
+        self.interval = interval
+        self.history_size = history
+        self.timeout = timeout
+        self.window = window
+        self.slow_ms = slow_ms
+        self.degraded_error_rate = degraded_error_rate
+        self.unhealthy_error_rate = unhealthy_error_rate
+        self.unhealthy_after = unhealthy_after
+        self.discover = discover
+        self._targets: Dict[str, HealthTarget] = {}
+        self._samples: Dict[str, Deque[ProbeSample]] = {}
+        self._statuses: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def track(self, key: str, url: str, mcp_url: Optional[str] = None) -> None:
+        """Probe ``url`` (and ``mcp_url``) under ``key``; history is kept if unchanged"""
+        target = HealthTarget(url, mcp_url)
+        with self._lock:
+            if self._targets.get(key) != target:
+                self._samples[key] = deque(maxlen=self.history_size)
+            self._targets[key] = target
+
+    def untrack(self, key: str) -> None:
+        """Stop probing ``key`` and drop its history"""
+        with self._lock:
+            self._targets.pop(key, None)
+            self._samples.pop(key, None)
+            self._statuses.pop(key, None)
+
+    def tracked(self) -> Dict[str, HealthTarget]:
+        """Return the tracked keys and their URLs"""
+        with self._lock:
+            return dict(self._targets)
+
+    def _sync_targets(self) -> None:
+        """Track what ``discover`` reports and forget servers that went away"""
+        targets = self.discover()
+        for key in set(self.tracked()) - set(targets):
+            self.untrack(key)
+        for key, target in targets.items():
+            self.track(key, target.url, target.mcp_url)
+
+    async def _probe_url(self, session, url: str) -> Tuple[Optional[float], Optional[str]]:
+        """Return (latency in ms, error) for one GET; 5xx and timeouts are errors"""
+        start = time.perf_counter()
+        try:
+            if session is not None:
+                async with session.get(url) as response:
+                    status = response.status
+            else:
+                status = await asyncio.wait_for(
+                    asyncio.to_thread(_get_status, url, self.timeout), self.timeout
+                )
+        except asyncio.TimeoutError:
+            return None, f"timed out after {self.timeout:g}s"
+        except Exception as e:
+            return None, f"{type(e).__name__}: {e}" if str(e) else type(e).__name__
+        latency = (time.perf_counter() - start) * 1000
+        if status >= 500:
+            return latency, f"HTTP {status}"
+        return latency, None
+
+    async def _probe_target(self, session, target: HealthTarget) -> ProbeSample:
+        probes = [self._probe_url(session, target.url)]
+        if target.mcp_url:
+            probes.append(self._probe_url(session, target.mcp_url))
+        results = await asyncio.gather(*probes)
+
+        (latency, error), mcp_latency = results[0], None
+        errors = [f"web: {error}"] if error else []
+        if target.mcp_url:
+            mcp_latency, mcp_error = results[1]
+            if mcp_error:
+                errors.append(f"MCP: {mcp_error}")
+        return ProbeSample(
+            time.time(),
+            latency if error is None else None,
+            mcp_latency,
+            "; ".join(errors) or None,
+        )
+
+    async def _probe_all(self, targets: Dict[str, HealthTarget]) -> Dict[str, ProbeSample]:
+        if HAS_AIOHTTP:
+            timeout = aiohttp.ClientTimeout(total=self.timeout)
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                samples = await asyncio.gather(
+                    *(self._probe_target(session, target) for target in targets.values())
+                )
+        else:
+            samples = await asyncio.gather(
+                *(self._probe_target(None, target) for target in targets.values())
+            )
+        return dict(zip(targets, samples))
+
+    def probe_once(self) -> None:
+        """Probe every tracked server once, concurrently"""
+        if self.discover is not None:
+            self._sync_targets()
+        targets = self.tracked()
+        if not targets:
+            return
+
+        samples = asyncio.run(self._probe_all(targets))
+
+        changed = False
+        with self._lock:
+            for key, sample in samples.items():
+                if key not in self._targets:
+                    continue  # untracked while probing
+                self._samples[key].append(sample)
+                status = self._evaluate(self._samples[key]).status
+                changed |= self._statuses.get(key) != status
+                self._statuses[key] = status
+        if changed:
+            get_change_bus().publish(TOPIC_HEALTH)
+
+    def _evaluate(self, samples: Deque[ProbeSample]) -> HealthReport:
+        recent = list(samples)[-self.window :]
+        if not recent:
+            return HealthReport(STATUS_UNKNOWN, None, None, None, 0.0, 0, 0, None, None)
+
+        latencies = sorted(s.latency_ms for s in recent if s.latency_ms is not None)
+        failures = [s for s in recent if s.error is not None]
+        error_rate = len(failures) / len(recent)
+
+        consecutive = 0
+        for sample in reversed(recent):
+            if sample.error is None:
+                break
+            consecutive += 1
+
+        p95 = _percentile(latencies, 95)
+        # One failed probe alone is a blip, not an outage
+        if consecutive >= self.unhealthy_after or (
+            len(recent) >= self.unhealthy_after and error_rate >= self.unhealthy_error_rate
+        ):
+            status = STATUS_UNHEALTHY
+        elif consecutive or error_rate >= self.degraded_error_rate or (p95 or 0) > self.slow_ms:
+            status = STATUS_DEGRADED
+        else:
+            status = STATUS_HEALTHY
+
+        return HealthReport(
+            status,
+            _percentile(latencies, 50),
+            p95,
+            _percentile(latencies, 99),
+            error_rate,
+            consecutive,
+            len(recent),
+            failures[-1].error if failures else None,
+            recent[-1].timestamp,
+        )
+
+    def report(self, key: str) -> HealthReport:
+        """Return the health of ``key`` from its buffered probes"""
+        with self._lock:
+            samples = self._samples.get(key, deque())
+            return self._evaluate(samples)
+
+    def reports(self) -> Dict[str, HealthReport]:
+        """Return the health of every tracked server"""
+        return {key: self.report(key) for key in self.tracked()}
+
+    def history(self, key: str) -> List[float]:
+        """Return buffered web UI latencies for ``key`` (failed probes as 0), oldest first"""
+        with self._lock:
+            return [s.latency_ms or 0.0 for s in self._samples.get(key, ())]
+
+    def start(self) -> None:
+        """Start the probing thread if it is not running"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="gmp-health-monitor", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the probing thread"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + self.timeout + 1)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.probe_once()
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+
+def running_server_targets() -> Dict[str, HealthTarget]:
+    """Targets for every running server in the run registry
+
+    Servers hosted by ``gmp server start --all`` are probed at their mount
+    path on the shared port.
+    """
+    from .server_manager import GradioMCPServer
+
+    targets = {}
+    for record in GradioMCPServer.find_running_servers():
+        if not record.get("running") or not record.get("port"):
+            continue
+        base = f"http://127.0.0.1:{record['port']}{record.get('mount_path', '/')}"
+        targets[health_key(record["app_path"])] = HealthTarget(base, base + MCP_ENDPOINT)
+    return targets
+
+
+def format_health(report: HealthReport) -> str:
+    """Short status text such as ``"🟡 degraded · p95 1250 ms · 10% errors"``"""
+    parts = [f"{STATUS_ICONS[report.status]} {report.status}"]
+    if report.p95_ms is not None:
+        parts.append(f"p95 {report.p95_ms:.0f} ms")
+    if report.error_rate:
+        parts.append(f"{report.error_rate:.0%} errors")
+    return " · ".join(parts)
+
+
+def annotate_servers(
+    servers: List[Dict[str, Any]], monitor: Optional[HealthMonitor] = None
+) -> List[Dict[str, Any]]:
+    """Add a ``health`` dict to each running local server in ``servers``
+
+    Entries from ``ConfigManager.list_servers()`` are copies, so they are
+    updated in place and the same list is returned.
+    """
+    monitor = monitor or get_health_monitor()
+    tracked = monitor.tracked()
+    for server in servers:
+        key = health_key(server.get("path"))
+        if server.get("source") == "local" and server.get("running") and key in tracked:
+            server["health"] = monitor.report(key)._asdict()
+    return servers
+
+
+_shared_monitor: Optional[HealthMonitor] = None
+_shared_monitor_lock = threading.Lock()
+
+
+def get_health_monitor() -> HealthMonitor:
+    """Return the process-wide monitor of running servers, starting it on first use
+
+    The probe interval can be set with ``GMP_HEALTH_INTERVAL`` (seconds).
+    """
+    global _shared_monitor
+    with _shared_monitor_lock:
+        if _shared_monitor is None:
+            interval = float(os.environ.get("GMP_HEALTH_INTERVAL", DEFAULT_INTERVAL))
+            _shared_monitor = HealthMonitor(interval=interval, discover=running_server_targets)
+        monitor = _shared_monitor
+    monitor.start()
+    return monitor
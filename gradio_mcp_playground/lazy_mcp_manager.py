@@ -39,13 +39,8 @@ class LazyMCPManager:
         # Store config for lazy loading
         self._server_configs[server_name] = server_config
         
-        # Check cache first
-        cache_key_config = {
-            "command": command,
-            "args": args,
-        }
-        
-        cached_data = self.cache_manager.get_server_cache(server_name, cache_key_config)
+        # Check cache first (fingerprint covers env var names, not their values)
+        cached_data = self.cache_manager.get_server_cache(server_name, server_config)
         if cached_data and 'tools' in cached_data:
             # Create lazy-loading tools from cache
             return self._create_lazy_tools(server_name, cached_data['tools'])
@@ -269,20 +269,15 @@ class MCPServerManager:
             # Use the proper server manager to start the server
             server_manager = GradioMCPServer(app_path)
             process = server_manager.start(port=port)
+            port = server_manager.port
 
-            # Give it a moment to start
-            import time
-
-            time.sleep(2)
-
-            # Check if process is still running
-            if process.poll() is None:
-                return f"🚀 Server '{name}' started successfully on port {port}!\n\nProcess ID: {process.pid}\nURL: http://localhost:{port}\n\n✅ Server is running in the background and properly tracked."
+            # Wait until it actually answers HTTP, or fails
+            readiness = server_manager.wait_until_ready()
+            if readiness.ready:
+                return f"🚀 Server '{name}' started successfully on port {port}!\n\nProcess ID: {process.pid}\nURL: http://localhost:{port}\nReady in: {readiness.elapsed:.1f}s\n\n✅ Server is running in the background and properly tracked."
             else:
-                # Process exited, get error info
-                stdout, stderr = process.communicate()
-                error_msg = stderr.decode("utf-8", errors="replace") if stderr else "Unknown error"
-                return f"❌ Server '{name}' failed to start:\n{error_msg}"
+                server_manager.stop()
+                return f"❌ Server '{name}' failed to start:\n{readiness.reason}"
 
         except Exception as e:
             return f"❌ Failed to start server '{name}': {str(e)}"
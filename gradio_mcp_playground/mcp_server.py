@@ -19,8 +19,10 @@ except ImportError:
     HAS_MCP = False
 
 from .config_manager import ConfigManager
-from .registry import ServerRegistry
+from .health_monitor import HealthReport, annotate_servers, format_health, get_health_monitor
+from .registry import get_registry
 from .server_manager import GradioMCPServer
+from .utils import tail_lines
 
 
 class GradioMCPManagementServer:
@@ -31,8 +33,9 @@ class GradioMCPManagementServer:
             raise ImportError("MCP package is required for server functionality")
 
         self.config_manager = ConfigManager()
-        self.registry = ServerRegistry()
+        self.registry = get_registry()
         self.server = Server("gradio-mcp-playground")
+        self.health_monitor = get_health_monitor()
 
         # Register all tools
         self._register_tools()
@@ -74,6 +77,28 @@ class GradioMCPManagementServer:
                         "additionalProperties": False,
                     },
                 ),
+                Tool(
+                    name="get_server_health",
+                    description=(
+                        "Get HTTP/MCP health of running local servers: status, latency "
+                        "percentiles and error rate from periodic probes"
+                    ),
+                    inputSchema={
+                        "type": "object",
+                        "properties": {
+                            "server_name": {
+                                "type": "string",
+                                "description": "Only report this server (default: all running)",
+                            },
+                            "refresh": {
+                                "type": "boolean",
+                                "description": "Probe now instead of using the last results",
+                                "default": False,
+                            },
+                        },
+                        "additionalProperties": False,
+                    },
+                ),
                 Tool(
                     name="get_server_logs",
                     description="Get logs for a specific server",
@@ -205,6 +230,10 @@ class GradioMCPManagementServer:
                     return await self._list_servers(arguments.get("include_details", False))
                 elif name == "get_server_info":
                     return await self._get_server_info(arguments["server_name"])
+                elif name == "get_server_health":
+                    return await self._get_server_health(
+                        arguments.get("server_name"), arguments.get("refresh", False)
+                    )
                 elif name == "get_server_logs":
                     return await self._get_server_logs(
                         arguments["server_name"], arguments.get("lines", 50)
@@ -242,7 +271,7 @@ class GradioMCPManagementServer:
 
     async def _list_servers(self, include_details: bool) -> CallToolResult:
         """List all servers"""
-        servers = self.config_manager.list_servers()
+        servers = annotate_servers(self.config_manager.list_servers(), self.health_monitor)
 
         if include_details:
             result = {
@@ -260,6 +289,8 @@ class GradioMCPManagementServer:
                 status = "🟢 Running" if server.get("running") else "⚫ Stopped"
                 if server.get("errors"):
                     status = "🔴 Error"
+                elif server.get("health"):
+                    status = format_health(HealthReport(**server["health"]))
 
                 result.append(
                     {
@@ -275,7 +306,7 @@ class GradioMCPManagementServer:
 
     async def _get_server_info(self, server_name: str) -> CallToolResult:
         """Get detailed server information"""
-        servers = self.config_manager.list_servers()
+        servers = annotate_servers(self.config_manager.list_servers(), self.health_monitor)
         server = None
 
         for s in servers:
@@ -290,6 +321,27 @@ class GradioMCPManagementServer:
 
         return CallToolResult(content=[TextContent(type="text", text=json.dumps(server, indent=2))])
 
+    async def _get_server_health(self, server_name: str, refresh: bool) -> CallToolResult:
+        """Get probe-based health of running local servers"""
+        if refresh:
+            await asyncio.to_thread(self.health_monitor.probe_once)
+
+        servers = annotate_servers(self.config_manager.list_servers(), self.health_monitor)
+        if server_name:
+            servers = [s for s in servers if s.get("name") == server_name]
+            if not servers:
+                return CallToolResult(
+                    content=[TextContent(type="text", text=f"Server '{server_name}' not found")]
+                )
+
+        result = {
+            server.get("name"): server.get("health")
+            or {"status": "running, not probed yet" if server.get("running") else "stopped"}
+            for server in servers
+            if server.get("source") == "local"
+        }
+        return CallToolResult(content=[TextContent(type="text", text=json.dumps(result, indent=2))])
+
     async def _get_server_logs(self, server_name: str, lines: int) -> CallToolResult:
         """Get server logs"""
         servers = self.config_manager.list_servers()
@@ -340,11 +392,8 @@ class GradioMCPManagementServer:
 
             if log_file.exists():
                 try:
-                    with open(log_file, encoding="utf-8") as f:
-                        log_lines = f.readlines()
-                        # Show last N lines
-                        recent_lines = log_lines[-lines:] if len(log_lines) > lines else log_lines
-                        logs_content = "".join(recent_lines)
+                    # Show last N lines
+                    logs_content = "".join(tail_lines(log_file, lines))
                 except Exception as e:
                     logs_content = f"Error reading log file: {str(e)}"
             else:
@@ -356,12 +405,7 @@ class GradioMCPManagementServer:
                 log_file = Path(server_path).parent / "server.log"
                 if log_file.exists():
                     try:
-                        with open(log_file, encoding="utf-8") as f:
-                            log_lines = f.readlines()
-                            recent_lines = (
-                                log_lines[-lines:] if len(log_lines) > lines else log_lines
-                            )
-                            logs_content = "".join(recent_lines)
+                        logs_content = "".join(tail_lines(log_file, lines))
                     except Exception as e:
                         logs_content = f"Error reading log file: {str(e)}"
                 else:
@@ -392,13 +436,27 @@ class GradioMCPManagementServer:
 
         try:
             server_mgr = GradioMCPServer(Path(server["path"]))
+            # The allocator may move off a port another server already holds
             process = server_mgr.start(port=port)
+            port = server_mgr.port
+
+            readiness = await asyncio.to_thread(server_mgr.wait_until_ready)
+            if not readiness.ready:
+                server_mgr.stop()
+                return CallToolResult(
+                    content=[
+                        TextContent(
+                            type="text",
+                            text=f"Server '{server_name}' failed to start: {readiness.reason}",
+                        )
+                    ]
+                )
 
             return CallToolResult(
                 content=[
                     TextContent(
                         type="text",
-                        text=f"Successfully started server '{server_name}' on port {port} (PID: {process.pid})",
+                        text=f"Successfully started server '{server_name}' on port {port} (PID: {process.pid}, ready in {readiness.elapsed:.1f}s)",
                     )
                 ]
             )
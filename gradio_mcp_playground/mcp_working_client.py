@@ -221,11 +221,12 @@ class MCPServerProcess:
 
     def initialize(self, skip_if_cached=False) -> bool:
         """Initialize the server connection with caching support"""
-        # Check cache first
+        # Check cache first; validity is decided by the server's fingerprint
         server_config = {
             "command": self.command,
             "args": self.args,
-            # Don't include env in cache key
+            # Only env var names are fingerprinted, values never reach the cache
+            "env": self.env,
         }
         
         cached_data = self._cache_manager.get_server_cache(self.server_id, server_config)
@@ -246,7 +247,17 @@ class MCPServerProcess:
                 },
             )
 
-            logger.info(f"Initialized {self.server_id}: {result.get('serverInfo', {})}")
+            server_info = result.get('serverInfo', {})
+            logger.info(f"Initialized {self.server_id}: {server_info}")
+
+            # Same fingerprint and same reported version: the tool list cannot have changed
+            if cached_data and 'tools' in cached_data and server_info.get('version') is not None:
+                if self._cache_manager.get_server_cache(
+                    self.server_id, server_config, server_version=server_info.get('version')
+                ):
+                    self.tools = cached_data['tools']
+                    logger.info(f"⚡ Reused {len(self.tools)} cached tools for {self.server_id}")
+                    return True
 
             # Get tools
             tools_result = self._send_request("tools/list", {})
@@ -260,7 +271,7 @@ class MCPServerProcess:
             # Cache the server data
             cache_data = {
                 'tools': self.tools,
-                'server_info': result.get('serverInfo', {}),
+                'server_info': server_info,
                 'initialized_at': time.time()
             }
             self._cache_manager.set_server_cache(self.server_id, server_config, cache_data)
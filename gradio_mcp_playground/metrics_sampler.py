@@ -0,0 +1,245 @@
+"""Gradio MCP Process Metrics Sampler
+
+A single background thread samples CPU, RSS, open file descriptors and thread
+counts for every tracked agent and server, plus host-wide CPU/memory, into
+fixed-size ring buffers. ``psutil.Process`` handles are cached between samples
+so ``cpu_percent()`` measures the interval since the previous tick instead of
+returning 0.0, and dashboards read the buffers without blocking.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, NamedTuple, Optional, Sequence
+
+# Optional imports
+try:
+    import psutil
+
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_HISTORY = 150  # five minutes at the default interval
+
+SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+class ProcessSample(NamedTuple):
+    """One measurement of a tracked process"""
+
+    timestamp: float
+    cpu_percent: float
+    rss_mb: float
+    num_fds: int
+    num_threads: int
+
+
+class SystemSample(NamedTuple):
+    """One measurement of the host"""
+
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    disk_percent: float
+    process_count: int
+
+
+class _Tracked:
+    """A cached process handle and its ring buffer"""
+
+    def __init__(self, pid: int, history: int):
+        self.pid = pid
+        self.samples: Deque[ProcessSample] = deque(maxlen=history)
+        self.alive = True
+        self.handle = None
+        if HAS_PSUTIL:
+            try:
+                self.handle = psutil.Process(pid)
+                # The first call only sets the baseline for the next one
+                self.handle.cpu_percent()
+            except (psutil.NoSuchProcess, psutil.AccessDenied):
+                self.alive = False
+
+    def sample(self, now: float) -> Optional[ProcessSample]:
+        if not self.alive or self.handle is None:
+            return None
+        try:
+            with self.handle.oneshot():
+                cpu = self.handle.cpu_percent()
+                rss = self.handle.memory_info().rss / 1024 / 1024
+                threads = self.handle.num_threads()
+                if hasattr(self.handle, "num_fds"):
+                    fds = self.handle.num_fds()
+                else:
+                    fds = self.handle.num_handles()
+        except psutil.NoSuchProcess:
+            # psutil also raises this if the PID was reused by another process
+            self.alive = False
+            return None
+        except psutil.AccessDenied:
+            return None
+
+        sample = ProcessSample(now, cpu, rss, fds, threads)
+        self.samples.append(sample)
+        return sample
+
+
+class MetricsSampler:
+    """Background sampler with per-process and host ring buffers
+
+    Processes are registered under a key such as ``agent:<name>`` or
+    ``server:<name>``. Reads (``latest``, ``history``, ``system``) only copy
+    buffered samples and never call into psutil.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, history: int = DEFAULT_HISTORY):
+        self.interval = interval
+        self.history_size = history
+        self._tracked: Dict[str, _Tracked] = {}
+        self._system: Deque[SystemSample] = deque(maxlen=history)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._disk_path = os.path.abspath(os.sep)
+
+        if HAS_PSUTIL:
+            # Baseline for the non-blocking host CPU reading
+            psutil.cpu_percent(interval=None)
+
+    def track(self, key: str, pid: int) -> None:
+        """Start sampling ``pid`` under ``key``, replacing any previous PID"""
+        with self._lock:
+            current = self._tracked.get(key)
+            if current is not None and current.pid == pid and current.alive:
+                return
+            self._tracked[key] = _Tracked(pid, self.history_size)
+
+    def untrack(self, key: str) -> None:
+        """Stop sampling ``key`` and drop its history"""
+        with self._lock:
+            self._tracked.pop(key, None)
+
+    def tracked(self) -> Dict[str, int]:
+        """Return the tracked keys and their PIDs"""
+        with self._lock:
+            return {key: entry.pid for key, entry in self._tracked.items()}
+
+    def sample_once(self) -> None:
+        """Take one sample of every tracked process and the host"""
+        if not HAS_PSUTIL:
+            return
+
+        now = time.time()
+        with self._lock:
+            entries = list(self._tracked.values())
+        for entry in entries:
+            entry.sample(now)
+
+        try:
+            disk_percent = psutil.disk_usage(self._disk_path).percent
+        except OSError:
+            disk_percent = 0.0
+        system = SystemSample(
+            now,
+            psutil.cpu_percent(interval=None),
+            psutil.virtual_memory().percent,
+            disk_percent,
+            len(psutil.pids()),
+        )
+        with self._lock:
+            self._system.append(system)
+
+    def latest(self, key: str) -> Optional[ProcessSample]:
+        """Return the most recent sample for ``key``, if it is still alive"""
+        with self._lock:
+            entry = self._tracked.get(key)
+            if entry is None or not entry.alive or not entry.samples:
+                return None
+            return entry.samples[-1]
+
+    def history(self, key: str, field: str = "cpu_percent") -> List[float]:
+        """Return the buffered values of ``field`` for ``key``, oldest first"""
+        with self._lock:
+            entry = self._tracked.get(key)
+            if entry is None:
+                return []
+            return [getattr(sample, field) for sample in entry.samples]
+
+    def system(self) -> Optional[SystemSample]:
+        """Return the most recent host sample"""
+        with self._lock:
+            return self._system[-1] if self._system else None
+
+    def system_history(self, field: str = "cpu_percent") -> List[float]:
+        """Return the buffered host values of ``field``, oldest first"""
+        with self._lock:
+            return [getattr(sample, field) for sample in self._system]
+
+    def start(self) -> None:
+        """Start the sampling thread if it is not running"""
+        if not HAS_PSUTIL:
+            return
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="gmp-metrics-sampler", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the sampling thread"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout=self.interval + 1)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.sample_once()
+            except Exception:
+                pass
+            self._stop.wait(self.interval)
+
+
+def sparkline(values: Sequence[float], width: int = 20, maximum: Optional[float] = None) -> str:
+    """Render the last ``width`` values as a unicode sparkline
+
+    Args:
+        values: Samples, oldest first
+        width: Maximum number of characters
+        maximum: Value drawn as a full bar (defaults to the largest sample)
+
+    Returns:
+        A string such as ``"▁▂▅█▃"``, empty when there are no samples
+    """
+    values = list(values)[-width:]
+    if not values:
+        return ""
+    top = maximum if maximum is not None else max(values)
+    if top <= 0:
+        return SPARK_CHARS[0] * len(values)
+    last = len(SPARK_CHARS) - 1
+    return "".join(
+        SPARK_CHARS[min(last, max(0, int(round(value / top * last))))] for value in values
+    )
+
+
+_shared_sampler: Optional[MetricsSampler] = None
+_shared_sampler_lock = threading.Lock()
+
+
+def get_metrics_sampler() -> MetricsSampler:
+    """Return the process-wide sampler, starting its thread on first use"""
+    global _shared_sampler
+    with _shared_sampler_lock:
+        if _shared_sampler is None:
+            _shared_sampler = MetricsSampler()
+        sampler = _shared_sampler
+    sampler.start()
+    return sampler
@@ -0,0 +1,230 @@
+"""Gradio MCP Multi-Server Host
+
+Serves several local Gradio MCP servers from one uvicorn process on one port.
+Each server's ``app.py`` is executed unchanged in its own module namespace
+with its ``launch()`` call intercepted, and the captured Blocks are mounted at
+``/<name>/`` with ``gr.mount_gradio_app``, so every server keeps its own UI,
+API and MCP endpoint while gradio and the event loop are shared.
+"""
+
+import contextlib
+import inspect
+import json
+import logging
+import os
+import runpy
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+MCP_ENDPOINT = "gradio_api/mcp/sse"
+
+# launch() options that only make sense for a standalone server
+_NON_MOUNT_OPTIONS = ("app", "blocks", "path", "server_name", "server_port")
+
+_load_lock = threading.Lock()
+
+
+class _Launched(Exception):
+    """Raised from the patched ``launch()`` to stop the script there"""
+
+
+@contextlib.contextmanager
+def _script_context(script: Path, env: Optional[Dict[str, str]] = None):
+    """Run code as if started from the script's directory
+
+    The working directory, ``sys.path[0]`` and ``env`` are set for the
+    duration, and modules imported from the script's directory are dropped
+    from ``sys.modules`` afterwards so two servers can both have e.g. a
+    ``utils.py`` without seeing each other's.
+    """
+    directory = str(script.parent.resolve())
+    previous_cwd = os.getcwd()
+    previous_modules = set(sys.modules)
+    previous_env = {key: os.environ.get(key) for key in (env or {})}
+
+    os.chdir(directory)
+    sys.path.insert(0, directory)
+    os.environ.update(env or {})
+    try:
+        yield
+    finally:
+        os.chdir(previous_cwd)
+        with contextlib.suppress(ValueError):
+            sys.path.remove(directory)
+        for key, value in previous_env.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        for module_name in set(sys.modules) - previous_modules:
+            module_file = getattr(sys.modules[module_name], "__file__", None) or ""
+            if module_file.startswith(directory + os.sep):
+                del sys.modules[module_name]
+
+
+def load_blocks(
+    script: Union[str, Path], env: Optional[Dict[str, str]] = None
+) -> Tuple[Any, Dict[str, Any]]:
+    """Run a Gradio app script without serving it
+
+    Args:
+        script: Path to the app (e.g. a server's ``app.py``)
+        env: Environment variables set while the script runs
+
+    Returns:
+        Tuple of (Blocks, launch keyword arguments). If the script never calls
+        ``launch()``, the last Blocks it defines is returned with no options.
+
+    Raises:
+        ValueError: If the script defines no Gradio app
+    """
+    import gradio as gr
+
+    script = Path(script).resolve()
+    captured: Dict[str, Any] = {}
+
+    def capture_launch(blocks, *args, **kwargs):
+        captured["blocks"] = blocks
+        captured["kwargs"] = kwargs
+        raise _Launched()
+
+    namespace: Dict[str, Any] = {}
+    # launch(), the working directory and sys.modules are process-wide, so
+    # scripts are loaded one at a time
+    with _load_lock:
+        original_launch = gr.Blocks.launch
+        gr.Blocks.launch = capture_launch
+        try:
+            with _script_context(script, env):
+                namespace = runpy.run_path(str(script), run_name="__main__")
+        except _Launched:
+            pass
+        finally:
+            gr.Blocks.launch = original_launch
+
+    blocks = captured.get("blocks")
+    if blocks is None:
+        candidates = [value for value in namespace.values() if isinstance(value, gr.Blocks)]
+        if not candidates:
+            raise ValueError(f"{script} does not define or launch a Gradio app")
+        blocks = candidates[-1]
+    return blocks, captured.get("kwargs", {})
+
+
+def mount_options(launch_kwargs: Dict[str, Any]) -> Dict[str, Any]:
+    """Translate captured ``launch()`` options into ``mount_gradio_app`` ones"""
+    import gradio as gr
+
+    mount_params = inspect.signature(gr.mount_gradio_app).parameters
+    options = {
+        key: value
+        for key, value in launch_kwargs.items()
+        if key in mount_params and key not in _NON_MOUNT_OPTIONS
+    }
+    options["ssr_mode"] = False
+    return options
+
+
+def create_multi_server_app(servers: List[Dict[str, Any]]):
+    """Build one FastAPI app with every server mounted at ``/<name>/``
+
+    Args:
+        servers: Server configs with at least ``name`` and ``path`` (app.py)
+
+    Returns:
+        The FastAPI app. Servers that fail to load are skipped and listed with
+        their error on the index page at ``/``.
+    """
+    import gradio as gr
+    from fastapi import FastAPI
+
+    app = FastAPI(title="Gradio MCP Servers")
+    mounted: Dict[str, Dict[str, str]] = {}
+    failed: Dict[str, str] = {}
+
+    for server in servers:
+        name = server["name"]
+        try:
+            blocks, launch_kwargs = load_blocks(server["path"])
+            options = mount_options(launch_kwargs)
+            options.setdefault("mcp_server", True)
+            gr.mount_gradio_app(app, blocks, path=f"/{name}", **options)
+        except Exception as e:
+            logger.error(f"Could not mount server '{name}': {e}")
+            failed[name] = f"{type(e).__name__}: {e}"
+            continue
+        mounted[name] = {"path": f"/{name}/", "mcp": f"/{name}/{MCP_ENDPOINT}"}
+
+    @app.get("/")
+    async def index():
+        return {"servers": mounted, "failed": failed}
+
+    app.state.mounted = mounted
+    app.state.failed = failed
+    return app
+
+
+def split_servers(servers: List[Dict[str, Any]], workers: int) -> List[List[Dict[str, Any]]]:
+    """Deal servers round-robin into at most ``workers`` non-empty groups"""
+    workers = max(1, min(workers, len(servers)))
+    return [servers[index::workers] for index in range(workers)]
+
+
+def serve(servers: List[Dict[str, Any]], port: int, host: str = "0.0.0.0") -> None:
+    """Serve ``servers`` from this process until interrupted
+
+    Each mounted server is recorded in the run registry with this process's
+    PID, the shared port and its mount path, so ``gmp server list`` and the
+    dashboards show it as running.
+    """
+    import uvicorn
+
+    from .server_manager import GradioMCPServer
+
+    app = create_multi_server_app(servers)
+    registered = []
+    for server in servers:
+        if server["name"] in app.state.mounted:
+            GradioMCPServer.register_server(
+                Path(server["path"]), os.getpid(), port, mount_path=f"/{server['name']}/"
+            )
+            registered.append(Path(server["path"]))
+
+    # uvicorn re-raises SIGTERM/SIGINT after a graceful shutdown, so records
+    # are removed when the lifespan ends rather than after run() returns
+    mounted_lifespan = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        try:
+            async with mounted_lifespan(app) as state:
+                yield state
+        finally:
+            for app_path in registered:
+                GradioMCPServer.deregister_server(app_path)
+
+    app.router.lifespan_context = lifespan
+    uvicorn.run(app, host=host, port=port, log_level="warning")
+
+
+def main(argv=None) -> None:
+    """Worker entry point: serve the servers listed in a JSON config file"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve several Gradio MCP servers on one port")
+    parser.add_argument("--config", required=True, help="JSON list of server configs")
+    parser.add_argument("--port", type=int, required=True)
+    parser.add_argument("--host", default="0.0.0.0")
+    args = parser.parse_args(argv)
+
+    with open(args.config) as f:
+        servers = json.load(f)
+    serve(servers, args.port, args.host)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Gradio MCP Output Drain
+
+Continuously reads a child process's stdout/stderr pipes on background
+threads, so a chatty child never blocks on a full pipe buffer. Lines go to a
+size-capped rotating log file and to an in-memory tail buffer that UIs can
+read without touching the file.
+"""
+
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import IO, Deque, List, Optional, Tuple, Union
+
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUP_COUNT = 3
+DEFAULT_TAIL_LINES = 500
+
+
+class OutputDrain:
+    """Drain one process's output streams into a rotating log and a tail buffer
+
+    Args:
+        log_path: Log file; rotated to ``<name>.1`` ... ``<name>.<backup_count>``
+        max_bytes: Size at which the log file is rotated
+        backup_count: Number of rotated files to keep
+        tail_lines: Number of recent lines kept in memory
+    """
+
+    def __init__(
+        self,
+        log_path: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backup_count: int = DEFAULT_BACKUP_COUNT,
+        tail_lines: int = DEFAULT_TAIL_LINES,
+    ):
+        self.log_path = Path(log_path)
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self._tail: Deque[Tuple[float, str, str]] = deque(maxlen=tail_lines)
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+        self.log_path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.log_path, "a", encoding="utf-8")
+        self._size = self._file.tell()
+
+    def attach(self, stream: Optional[IO], label: str) -> None:
+        """Start draining ``stream`` (text or binary), tagging lines with ``label``"""
+        if stream is None:
+            return
+        thread = threading.Thread(
+            target=self._drain,
+            args=(stream, label),
+            name=f"drain-{self.log_path.stem}-{label}",
+            daemon=True,
+        )
+        self._threads.append(thread)
+        thread.start()
+
+    def _drain(self, stream: IO, label: str) -> None:
+        try:
+            while True:
+                line = stream.readline()
+                if not line:
+                    break
+                if isinstance(line, bytes):
+                    line = line.decode("utf-8", errors="replace")
+                self.write(line.rstrip("\r\n"), label)
+        except (OSError, ValueError):
+            # Stream closed underneath us
+            pass
+        finally:
+            try:
+                stream.close()
+            except Exception:
+                pass
+
+    def write(self, line: str, label: str = "stdout") -> None:
+        """Record one line of output"""
+        now = time.time()
+        entry = f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))} [{label}] {line}\n"
+        size = len(entry.encode("utf-8"))
+        with self._lock:
+            self._tail.append((now, label, line))
+            if self._file.closed:
+                return
+            if self.max_bytes and self._size + size > self.max_bytes:
+                self._rotate()
+            self._file.write(entry)
+            self._file.flush()
+            self._size += size
+
+    def _rotate(self) -> None:
+        self._file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                source = self.log_path.with_name(f"{self.log_path.name}.{index}")
+                if source.exists():
+                    source.replace(self.log_path.with_name(f"{self.log_path.name}.{index + 1}"))
+            self.log_path.replace(self.log_path.with_name(f"{self.log_path.name}.1"))
+        self._file = open(self.log_path, "w", encoding="utf-8")
+        self._size = 0
+
+    def tail(self, lines: int = 50, label: Optional[str] = None) -> List[str]:
+        """Return the most recent output lines, optionally only from ``label``"""
+        with self._lock:
+            entries = list(self._tail)
+        if label is not None:
+            entries = [entry for entry in entries if entry[1] == label]
+        return [entry[2] for entry in entries[-lines:]] if lines > 0 else []
+
+    def join(self, timeout: Optional[float] = None) -> bool:
+        """Wait for the streams to reach EOF; returns True if they all did"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._threads:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            thread.join(remaining)
+        return not any(thread.is_alive() for thread in self._threads)
+
+    def close(self, timeout: float = 1.0) -> None:
+        """Finish draining (up to ``timeout``) and close the log file"""
+        self.join(timeout)
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
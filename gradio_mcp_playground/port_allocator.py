@@ -0,0 +1,187 @@
+"""Gradio MCP Port Allocator
+
+Hands out local ports for servers and agents. Reservations are recorded in a
+JSON file under the config dir and updated under a file lock, so concurrent
+launches in any process never receive the same port. Each reservation is owned
+by a PID and is dropped once that process exits.
+"""
+
+import atexit
+import json
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+from .utils import atomic_write, file_lock
+
+# Optional imports
+try:
+    import psutil
+
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+DEFAULT_START_PORT = 7860
+DEFAULT_PORT_COUNT = 100
+
+
+def _pid_alive(pid: int) -> bool:
+    if HAS_PSUTIL:
+        return psutil.pid_exists(pid)
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _can_bind(port: int) -> bool:
+    """Check whether nothing is listening on ``port``"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        try:
+            s.bind(("", port))
+            return True
+        except OSError:
+            return False
+
+
+class PortAllocator:
+    """Atomic, cross-process port reservations
+
+    Typical use is ``reserve()`` before spawning a process, then ``assign()``
+    to hand the reservation to the child so it lives exactly as long as the
+    child does. Reservations still owned by this process are released at exit.
+    """
+
+    def __init__(self, state_dir: Optional[Union[str, Path]] = None):
+        if state_dir is None:
+            from .config_manager import get_config_dir
+
+            state_dir = get_config_dir()
+        self.state_dir = Path(state_dir)
+        self.state_path = self.state_dir / "ports.json"
+        self.lock_path = self.state_dir / "ports.lock"
+        self._held: set = set()
+        self._held_lock = threading.Lock()
+        atexit.register(self._release_held)
+
+    def _load_locked(self) -> Dict[int, Dict[str, Any]]:
+        try:
+            with open(self.state_path) as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        reservations = {}
+        for port, info in raw.get("reservations", {}).items():
+            # Drop reservations whose owning process has exited
+            if _pid_alive(info.get("pid", -1)):
+                reservations[int(port)] = info
+        return reservations
+
+    def _save_locked(self, reservations: Dict[int, Dict[str, Any]]) -> None:
+        payload = {"reservations": {str(port): info for port, info in sorted(reservations.items())}}
+        atomic_write(self.state_path, json.dumps(payload, indent=2).encode("utf-8"))
+
+    def reserve(
+        self,
+        preferred: Optional[int] = None,
+        start: int = DEFAULT_START_PORT,
+        count: int = DEFAULT_PORT_COUNT,
+        label: str = "",
+    ) -> int:
+        """Reserve a free port for the calling process
+
+        Args:
+            preferred: Port to try first (e.g. one the user asked for)
+            start: First port of the range to scan after ``preferred``
+            count: Number of ports in the range
+            label: Free-form description stored with the reservation
+
+        Returns:
+            The reserved port. If the whole range is taken, a port chosen by
+            the OS (bind to port 0) is reserved instead.
+        """
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.lock_path):
+            reservations = self._load_locked()
+
+            candidates = range(start, start + count)
+            if preferred:
+                candidates = [preferred] + [p for p in candidates if p != preferred]
+
+            port = None
+            for candidate in candidates:
+                if candidate not in reservations and _can_bind(candidate):
+                    port = candidate
+                    break
+
+            while port is None:
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+                    s.bind(("", 0))
+                    candidate = s.getsockname()[1]
+                if candidate not in reservations:
+                    port = candidate
+
+            reservations[port] = {"pid": os.getpid(), "label": label, "reserved_at": time.time()}
+            self._save_locked(reservations)
+
+        with self._held_lock:
+            self._held.add(port)
+        return port
+
+    def assign(self, port: int, pid: int) -> None:
+        """Transfer a reservation to ``pid`` (usually the launched child)"""
+        with file_lock(self.lock_path):
+            reservations = self._load_locked()
+            info = reservations.setdefault(port, {"label": "", "reserved_at": time.time()})
+            info["pid"] = pid
+            self._save_locked(reservations)
+
+        with self._held_lock:
+            self._held.discard(port)
+
+    def release(self, port: int) -> None:
+        """Drop a reservation"""
+        if not self.state_path.exists():
+            return
+        with file_lock(self.lock_path):
+            reservations = self._load_locked()
+            if reservations.pop(port, None) is not None:
+                self._save_locked(reservations)
+
+        with self._held_lock:
+            self._held.discard(port)
+
+    def reservations(self) -> Dict[int, Dict[str, Any]]:
+        """Return the live reservations"""
+        if not self.state_path.exists():
+            return {}
+        with file_lock(self.lock_path):
+            return self._load_locked()
+
+    def _release_held(self) -> None:
+        with self._held_lock:
+            held = list(self._held)
+        for port in held:
+            try:
+                self.release(port)
+            except Exception:
+                pass
+
+
+_shared_allocator: Optional[PortAllocator] = None
+_shared_allocator_lock = threading.Lock()
+
+
+def get_port_allocator() -> PortAllocator:
+    """Return the process-wide allocator for the default config dir"""
+    global _shared_allocator
+    with _shared_allocator_lock:
+        if _shared_allocator is None:
+            _shared_allocator = PortAllocator()
+        return _shared_allocator
@@ -0,0 +1,679 @@
+"""Gradio MCP Pre-fork Launcher
+
+A long-lived "zygote" interpreter imports the heavy dependencies (gradio,
+pydantic, ...) once, then forks a child per launch request to run a server or
+agent script. Forking an already warm interpreter takes milliseconds instead of
+the seconds a cold ``python app.py`` spends on imports.
+
+The zygote is opt-in (``GMP_PREFORK=1``) and POSIX only. Once enabled it is
+started on demand in the background; until it is ready, and whenever it is
+unavailable, ``spawn_app`` falls back to ``subprocess.Popen``. It exits on its
+own when idle, or with ``PreforkLauncher.shutdown``.
+
+This module only imports the standard library at the top level because it is
+also executed directly as the zygote script.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import runpy
+import select
+import selectors
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+HAS_PREFORK = hasattr(os, "fork") and hasattr(socket, "AF_UNIX") and hasattr(socket, "send_fds")
+
+# Modules imported by the zygote before it starts forking
+DEFAULT_PRELOAD = ("gradio", "pydantic", "httpx")
+
+# The zygote exits after this many seconds without requests or live children
+DEFAULT_IDLE_TIMEOUT = 1800.0
+
+# Seconds an unanswered zygote start is considered "in progress"
+STARTUP_GRACE = 120.0
+
+# Signals whose zygote handlers must not run in a freshly forked child
+_CHILD_SIGNALS = {signal.SIGTERM, signal.SIGINT} if HAS_PREFORK else set()
+
+_HEADER = struct.Struct("!I")
+_MAX_FDS = 4
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except OSError:
+        return False
+
+
+def _send_message(sock: socket.socket, payload: Dict[str, Any], fds: Sequence[int] = ()) -> None:
+    data = json.dumps(payload).encode("utf-8")
+    message = _HEADER.pack(len(data)) + data
+    if fds:
+        sent = socket.send_fds(sock, [message], list(fds))
+        message = message[sent:]
+    sock.sendall(message)
+
+
+def _recv_message(sock: socket.socket) -> "tuple[Dict[str, Any], List[int]]":
+    data, fds, _flags, _addr = socket.recv_fds(sock, 1 << 16, _MAX_FDS)
+    while len(data) < _HEADER.size:
+        chunk = sock.recv(1 << 16)
+        if not chunk:
+            raise ConnectionError("connection closed mid-message")
+        data += chunk
+    (length,) = _HEADER.unpack_from(data)
+    while len(data) < _HEADER.size + length:
+        chunk = sock.recv(1 << 16)
+        if not chunk:
+            raise ConnectionError("connection closed mid-message")
+        data += chunk
+    return json.loads(data[_HEADER.size : _HEADER.size + length]), list(fds)
+
+
+# Zygote side
+
+
+def _run_child(request: Dict[str, Any], fds: List[int], inherited: List[Any]) -> None:
+    """Body of a forked child; never returns"""
+    code = 1
+    try:
+        os.setsid()
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.pthread_sigmask(signal.SIG_UNBLOCK, _CHILD_SIGNALS)
+        for obj in inherited:
+            try:
+                obj.close() if hasattr(obj, "close") else os.close(obj)
+            except OSError:
+                pass
+
+        stdin_fd, stdout_fd, stderr_fd, status_fd = fds
+        os.close(status_fd)
+        for target, fd in ((0, stdin_fd), (1, stdout_fd), (2, stderr_fd)):
+            os.dup2(fd, target)
+        for fd in {stdin_fd, stdout_fd, stderr_fd}:
+            if fd > 2:
+                os.close(fd)
+
+        os.chdir(request.get("cwd") or os.getcwd())
+        os.environ.clear()
+        os.environ.update(request.get("env") or {})
+
+        script = os.path.abspath(request["script"])
+        sys.argv = [script] + list(request.get("args") or [])
+        # The zygote dropped its own script directory from sys.path, so the
+        # first entry is a real one that must stay importable
+        sys.path.insert(0, os.path.dirname(script))
+
+        runpy.run_path(script, run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def serve(socket_path: str, preload: Sequence[str], idle_timeout: float) -> None:
+    """Run the zygote: preload modules, then fork a child per request"""
+    preloaded = []
+    for name in preload:
+        try:
+            importlib.import_module(name)
+            preloaded.append(name)
+        except Exception:
+            pass
+
+    # Bind under a temporary name, then atomically move into place
+    tmp_path = f"{socket_path}.{os.getpid()}"
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(tmp_path)
+    os.chmod(tmp_path, 0o600)
+    listener.listen(16)
+    os.replace(tmp_path, socket_path)
+    socket_inode = os.stat(socket_path).st_ino
+
+    wake_r, wake_w = socket.socketpair()
+    wake_r.setblocking(False)
+    wake_w.setblocking(False)
+    signal.set_wakeup_fd(wake_w.fileno())
+    signal.signal(signal.SIGCHLD, lambda *_: None)
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    selector = selectors.DefaultSelector()
+    selector.register(listener, selectors.EVENT_READ)
+    selector.register(wake_r, selectors.EVENT_READ)
+
+    children: Dict[int, int] = {}  # pid -> write end of its status pipe
+    last_activity = time.monotonic()
+
+    def reap() -> None:
+        while children:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            status_fd = children.pop(pid, None)
+            if status_fd is not None:
+                try:
+                    os.write(status_fd, f"{os.waitstatus_to_exitcode(status)}\n".encode())
+                except OSError:
+                    pass
+                os.close(status_fd)
+
+    def owns_socket() -> bool:
+        try:
+            return os.stat(socket_path).st_ino == socket_inode
+        except OSError:
+            return False
+
+    running = True
+    try:
+        while running:
+            for key, _ in selector.select(timeout=1.0):
+                if key.fileobj is wake_r:
+                    try:
+                        while wake_r.recv(512):
+                            pass
+                    except BlockingIOError:
+                        pass
+                    continue
+
+                conn, _ = listener.accept()
+                last_activity = time.monotonic()
+                fds: List[int] = []
+                try:
+                    conn.settimeout(5)
+                    request, fds = _recv_message(conn)
+                    op = request.get("op")
+                    if op == "ping":
+                        _send_message(conn, {"pid": os.getpid(), "preloaded": preloaded})
+                    elif op == "shutdown":
+                        _send_message(conn, {"ok": True})
+                        running = False
+                    elif op == "spawn" and len(fds) == 4:
+                        sys.stdout.flush()
+                        sys.stderr.flush()
+                        # Hold signals sent to the child before it resets the
+                        # zygote's handlers; they are delivered once it has
+                        signal.pthread_sigmask(signal.SIG_BLOCK, _CHILD_SIGNALS)
+                        pid = os.fork()
+                        if pid == 0:
+                            inherited = [listener, conn, wake_r, wake_w, *children.values()]
+                            _run_child(request, fds, inherited)
+                        signal.pthread_sigmask(signal.SIG_UNBLOCK, _CHILD_SIGNALS)
+                        children[pid] = fds[3]
+                        for fd in fds[:3]:
+                            os.close(fd)
+                        fds = []
+                        _send_message(conn, {"pid": pid})
+                    else:
+                        _send_message(conn, {"error": f"bad request: {op}"})
+                except Exception as e:
+                    try:
+                        _send_message(conn, {"error": str(e)})
+                    except OSError:
+                        pass
+                finally:
+                    for fd in fds:
+                        os.close(fd)
+                    conn.close()
+
+            reap()
+            idle = time.monotonic() - last_activity > idle_timeout
+            if not children and (idle or not owns_socket()):
+                running = False
+    finally:
+        if owns_socket():
+            try:
+                os.unlink(socket_path)
+            except OSError:
+                pass
+        listener.close()
+
+
+# Launcher side
+
+
+class ForkedProcess:
+    """``subprocess.Popen``-like handle for a process forked by the zygote
+
+    The child is the zygote's, not ours, so its exit status arrives over a
+    pipe the zygote writes to when it reaps the child.
+    """
+
+    def __init__(self, pid: int, status_fd: int, args: List[str], stdout=None, stderr=None):
+        self.pid = pid
+        self.args = args
+        self.stdin = None
+        self.stdout = stdout
+        self.stderr = stderr
+        self.returncode: Optional[int] = None
+        self._status = os.fdopen(status_fd, "rb", buffering=0)
+        self._status_closed = False
+
+    def _collect_status(self, timeout: float) -> None:
+        if self._status_closed:
+            # Zygote went away; fall back to checking the PID
+            if not _pid_alive(self.pid):
+                self.returncode = -1
+            elif timeout:
+                time.sleep(min(timeout, 0.05))
+            return
+
+        ready, _, _ = select.select([self._status], [], [], timeout)
+        if not ready:
+            return
+        data = self._status.read(32)
+        self._status.close()
+        self._status_closed = True
+        if data.strip():
+            self.returncode = int(data.strip())
+        elif not _pid_alive(self.pid):
+            self.returncode = -1
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            self._collect_status(0)
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.returncode is None:
+            remaining = 1.0 if deadline is None else deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            self._collect_status(remaining)
+        return self.returncode
+
+    def send_signal(self, sig: int) -> None:
+        # Like Popen, never signal a PID that may have been recycled
+        if self.poll() is None:
+            try:
+                os.kill(self.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    def terminate(self) -> None:
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        self.send_signal(signal.SIGKILL)
+
+    def communicate(self, input=None, timeout: Optional[float] = None):
+        """Read stdout/stderr to EOF and wait for the process"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        streams = {s: [] for s in (self.stdout, self.stderr) if s is not None}
+        open_streams = list(streams)
+        while open_streams:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise subprocess.TimeoutExpired(self.args, timeout)
+            ready, _, _ = select.select(open_streams, [], [], remaining)
+            for stream in ready:
+                chunk = os.read(stream.fileno(), 1 << 16)
+                if chunk:
+                    streams[stream].append(chunk)
+                else:
+                    open_streams.remove(stream)
+
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        self.wait(remaining)
+
+        def collect(stream):
+            if stream is None:
+                return None
+            data = b"".join(streams[stream])
+            stream.close()
+            encoding = getattr(stream, "encoding", None)
+            if encoding:
+                return data.decode(encoding, errors=getattr(stream, "errors", None) or "strict")
+            return data
+
+        return collect(self.stdout), collect(self.stderr)
+
+
+class PreforkLauncher:
+    """Starts, finds and talks to the zygote for one state directory"""
+
+    def __init__(
+        self,
+        state_dir: Optional[Union[str, Path]] = None,
+        preload: Optional[Sequence[str]] = None,
+        idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+    ):
+        if state_dir is None:
+            from .config_manager import get_config_dir
+
+            state_dir = get_config_dir() / "zygote"
+        if preload is None:
+            env_preload = os.environ.get("GMP_PREFORK_PRELOAD")
+            preload = env_preload.split(",") if env_preload else DEFAULT_PRELOAD
+        self.state_dir = Path(state_dir)
+        self.preload = tuple(name.strip() for name in preload if name.strip())
+        self.idle_timeout = idle_timeout
+
+        # One zygote per interpreter and preload set
+        key = hashlib.sha1(
+            json.dumps([sys.executable, self.preload, self._preload_versions()]).encode("utf-8")
+        ).hexdigest()[:12]
+        self.socket_path = self.state_dir / f"{key}.sock"
+        self.pid_path = self.state_dir / f"{key}.pid"
+        self.log_path = self.state_dir / f"{key}.log"
+
+    def _preload_versions(self) -> List[Optional[str]]:
+        """Installed versions, so an upgrade gets a fresh zygote"""
+        from importlib import metadata
+
+        versions = []
+        for name in self.preload:
+            try:
+                versions.append(metadata.version(name))
+            except Exception:
+                versions.append(None)
+        return versions
+
+    def _request(
+        self, payload: Dict[str, Any], fds: Sequence[int] = (), timeout: float = 5.0
+    ) -> Dict[str, Any]:
+        return self._read_reply(self._send_request(payload, fds, timeout))
+
+    def _send_request(
+        self, payload: Dict[str, Any], fds: Sequence[int] = (), timeout: float = 5.0
+    ) -> socket.socket:
+        """Connect and send ``payload``; the caller reads the reply from the socket"""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(timeout)
+            sock.connect(str(self.socket_path))
+            _send_message(sock, payload, fds)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    @staticmethod
+    def _read_reply(sock: socket.socket) -> Dict[str, Any]:
+        with sock:
+            reply, _ = _recv_message(sock)
+        if "error" in reply:
+            raise RuntimeError(reply["error"])
+        return reply
+
+    def is_ready(self) -> bool:
+        """Check whether a zygote is answering on the socket"""
+        if not self.socket_path.exists():
+            return False
+        try:
+            self._request({"op": "ping"}, timeout=1.0)
+            return True
+        except (OSError, RuntimeError, ValueError):
+            return False
+
+    def ensure_started(self, wait: float = 0.0) -> bool:
+        """Start the zygote in the background unless one is running or starting
+
+        Args:
+            wait: Seconds to wait for it to become ready
+
+        Returns:
+            True if the zygote is ready to take requests.
+        """
+        if not HAS_PREFORK:
+            return False
+        if self.is_ready():
+            return True
+
+        from .utils import file_lock
+
+        self.state_dir.mkdir(parents=True, exist_ok=True)
+        with file_lock(self.state_dir / "zygote.lock"):
+            if not self.is_ready() and not self._starting():
+                with open(self.log_path, "ab") as log:
+                    process = subprocess.Popen(
+                        [
+                            sys.executable,
+                            os.path.abspath(__file__),
+                            "--socket",
+                            str(self.socket_path),
+                            "--preload",
+                            ",".join(self.preload),
+                            "--idle-timeout",
+                            str(self.idle_timeout),
+                        ],
+                        stdin=subprocess.DEVNULL,
+                        stdout=log,
+                        stderr=log,
+                        start_new_session=True,
+                        env={**os.environ, "GRADIO_ANALYTICS_ENABLED": "False"},
+                    )
+                self.pid_path.write_text(f"{process.pid} {time.time()}")
+
+        deadline = time.monotonic() + wait
+        while True:
+            if self.is_ready():
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+
+    def _starting(self) -> bool:
+        """Whether a zygote process was started recently and is still alive"""
+        try:
+            pid, started = self.pid_path.read_text().split()
+        except (OSError, ValueError):
+            return False
+        return _pid_alive(int(pid)) and time.time() - float(started) < STARTUP_GRACE
+
+    def spawn(
+        self,
+        script: Union[str, Path],
+        args: Sequence[str] = (),
+        cwd: Optional[Union[str, Path]] = None,
+        env: Optional[Dict[str, str]] = None,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        encoding: Optional[str] = None,
+        errors: Optional[str] = None,
+    ) -> Optional[ForkedProcess]:
+        """Fork ``script`` from the zygote
+
+        ``stdout``/``stderr`` accept ``subprocess.DEVNULL``, ``subprocess.PIPE``,
+        None (inherit) or a file object / descriptor, as with Popen.
+
+        Returns:
+            A ForkedProcess, or None if the zygote could not take the request.
+
+        Raises:
+            OSError: The request reached the zygote but no reply confirmed the
+                fork, so the child may be running and a cold start could clash.
+        """
+        to_close: List[int] = []
+        parent_ends: List[int] = []
+
+        def child_fd(spec, default_fd: int, for_write: bool = True) -> int:
+            if spec is None:
+                return default_fd
+            if spec == subprocess.DEVNULL:
+                fd = os.open(os.devnull, os.O_WRONLY if for_write else os.O_RDONLY)
+                to_close.append(fd)
+                return fd
+            if spec == subprocess.PIPE:
+                read_fd, write_fd = os.pipe()
+                parent_ends.append(read_fd)
+                to_close.append(write_fd)
+                return write_fd
+            return spec if isinstance(spec, int) else spec.fileno()
+
+        def open_parent_end(spec):
+            if spec != subprocess.PIPE:
+                return None
+            fd = parent_ends.pop(0)
+            if encoding or errors:
+                return os.fdopen(fd, "r", encoding=encoding or "utf-8", errors=errors)
+            return os.fdopen(fd, "rb")
+
+        def close_all() -> None:
+            for fd in to_close + parent_ends + [status_r]:
+                os.close(fd)
+
+        status_r, status_w = os.pipe()
+        to_close.append(status_w)
+        try:
+            fds = [
+                child_fd(subprocess.DEVNULL, 0, for_write=False),
+                child_fd(stdout, 1),
+                child_fd(stderr, 2),
+                status_w,
+            ]
+            request = {
+                "op": "spawn",
+                "script": str(script),
+                "args": [str(a) for a in args],
+                "cwd": str(cwd) if cwd else os.getcwd(),
+                "env": dict(os.environ if env is None else env),
+            }
+            sock = self._send_request(request, fds)
+        except OSError:
+            close_all()
+            return None
+
+        try:
+            reply = self._read_reply(sock)
+        except RuntimeError:
+            # The zygote answered that it did not fork
+            close_all()
+            return None
+        except (OSError, ValueError) as e:
+            close_all()
+            raise OSError(f"Prefork zygote did not confirm the spawn of {script}: {e}") from e
+
+        for fd in to_close:
+            os.close(fd)
+        out = open_parent_end(stdout)
+        err = open_parent_end(stderr)
+        return ForkedProcess(
+            reply["pid"], status_r, [sys.executable, str(script), *args], stdout=out, stderr=err
+        )
+
+    def shutdown(self) -> None:
+        """Ask the zygote to exit; children it already forked keep running"""
+        try:
+            self._request({"op": "shutdown"}, timeout=1.0)
+        except (OSError, RuntimeError, ValueError):
+            pass
+
+
+_shared_launcher: Optional[PreforkLauncher] = None
+_shared_launcher_lock = threading.Lock()
+
+
+def prefork_enabled() -> bool:
+    """Whether launches should try the zygote (opt-in with ``GMP_PREFORK=1``)"""
+    return HAS_PREFORK and os.environ.get("GMP_PREFORK", "0") == "1"
+
+
+def get_prefork_launcher() -> PreforkLauncher:
+    """Return the process-wide launcher for the default config dir"""
+    global _shared_launcher
+    with _shared_launcher_lock:
+        if _shared_launcher is None:
+            _shared_launcher = PreforkLauncher()
+        return _shared_launcher
+
+
+def spawn_app(
+    script: Union[str, Path],
+    args: Sequence[str] = (),
+    cwd: Optional[Union[str, Path]] = None,
+    env: Optional[Dict[str, str]] = None,
+    stdout=subprocess.DEVNULL,
+    stderr=subprocess.DEVNULL,
+    encoding: Optional[str] = None,
+    errors: Optional[str] = None,
+    start_new_session: bool = False,
+    creationflags: int = 0,
+):
+    """Run ``python script`` from the warm zygote, or cold if it is not ready
+
+    Returns:
+        A ForkedProcess or a subprocess.Popen; both expose the same interface.
+    """
+    if prefork_enabled():
+        launcher = get_prefork_launcher()
+        # Never block a launch on zygote startup; later launches benefit
+        if launcher.ensure_started(wait=0):
+            process = launcher.spawn(
+                script,
+                args,
+                cwd=cwd,
+                env=env,
+                stdout=stdout,
+                stderr=stderr,
+                encoding=encoding,
+                errors=errors,
+            )
+            if process is not None:
+                return process
+
+    return subprocess.Popen(
+        [sys.executable, str(script), *args],
+        cwd=str(cwd) if cwd else None,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=stdout,
+        stderr=stderr,
+        encoding=encoding,
+        errors=errors,
+        start_new_session=start_new_session,
+        creationflags=creationflags,
+    )
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Gradio MCP pre-fork zygote")
+    parser.add_argument("--socket", required=True)
+    parser.add_argument("--preload", default=",".join(DEFAULT_PRELOAD))
+    parser.add_argument("--idle-timeout", type=float, default=DEFAULT_IDLE_TIMEOUT)
+    cli_args = parser.parse_args()
+
+    # Running as a script puts this package's directory first on sys.path,
+    # where its modules would shadow top-level ones in the children
+    if sys.path and os.path.abspath(sys.path[0]) == os.path.dirname(os.path.abspath(__file__)):
+        sys.path.pop(0)
+
+    serve(
+        cli_args.socket,
+        [name for name in cli_args.preload.split(",") if name],
+        cli_args.idle_timeout,
+    )
@@ -0,0 +1,119 @@
+"""Gradio MCP Readiness Probes
+
+Waits until a freshly launched server or agent actually accepts HTTP on its
+port, polling with exponential backoff up to a deadline. A launch counts as
+ready when a TCP connect succeeds and, if an HTTP path is given, a GET on it
+answers with a non-5xx status. If the process exits first, that is reported
+together with its exit code instead of waiting out the deadline.
+"""
+
+import http.client
+import socket
+import time
+from typing import NamedTuple, Optional
+
+DEFAULT_READY_TIMEOUT = 60.0
+DEFAULT_HTTP_PATH = "/"
+
+
+class ReadinessResult(NamedTuple):
+    """Outcome of waiting for a launch to start serving"""
+
+    ready: bool
+    elapsed: float  # seconds from the start of waiting to ready or failure
+    reason: str
+    attempts: int
+    exit_code: Optional[int] = None
+
+
+def probe_port(
+    port: int,
+    host: str = "127.0.0.1",
+    http_path: Optional[str] = DEFAULT_HTTP_PATH,
+    timeout: float = 1.0,
+) -> Optional[str]:
+    """Probe ``port`` once
+
+    Returns:
+        None if the port serves, otherwise a short description of what failed
+    """
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            pass
+    except OSError as e:
+        return f"connect failed: {e.strerror or e}"
+
+    if http_path is None:
+        return None
+
+    connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("GET", http_path)
+        status = connection.getresponse().status
+    except (OSError, http.client.HTTPException) as e:
+        return f"HTTP GET {http_path} failed: {e}"
+    finally:
+        connection.close()
+
+    if status >= 500:
+        return f"HTTP GET {http_path} returned {status}"
+    return None
+
+
+def wait_until_ready(
+    port: int,
+    process=None,
+    host: str = "127.0.0.1",
+    timeout: float = DEFAULT_READY_TIMEOUT,
+    http_path: Optional[str] = DEFAULT_HTTP_PATH,
+    initial_delay: float = 0.05,
+    max_delay: float = 1.0,
+) -> ReadinessResult:
+    """Poll ``port`` until it serves, ``process`` exits, or ``timeout`` passes
+
+    Args:
+        port: Port the launched app was told to listen on
+        process: Popen-like handle; when it exits the wait fails immediately
+        host: Host to connect to
+        timeout: Deadline in seconds
+        http_path: Path to GET once the port accepts connections, or None to
+            only check the TCP connect
+        initial_delay: First backoff delay, doubled after each failed probe
+        max_delay: Upper bound for the backoff delay
+
+    Returns:
+        A ReadinessResult with the time to ready, or why the launch failed
+    """
+    start = time.monotonic()
+    deadline = start + timeout
+    delay = initial_delay
+    attempts = 0
+
+    while True:
+        if process is not None:
+            exit_code = process.poll()
+            if exit_code is not None:
+                return ReadinessResult(
+                    False,
+                    time.monotonic() - start,
+                    f"process exited with code {exit_code} before serving on port {port}",
+                    attempts,
+                    exit_code,
+                )
+
+        attempts += 1
+        remaining = deadline - time.monotonic()
+        last_error = probe_port(port, host, http_path, timeout=max(0.1, min(remaining, 2.0)))
+        if last_error is None:
+            return ReadinessResult(True, time.monotonic() - start, "serving", attempts)
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return ReadinessResult(
+                False,
+                time.monotonic() - start,
+                f"not serving on port {port} after {timeout:.0f}s ({last_error})",
+                attempts,
+            )
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
@@ -7,14 +7,33 @@ Based on claude-desktop-mcp-playground registry with enhanced search and install
 import json
 import os
 import platform
+import threading
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from .search_index import SearchIndex
+
+# Relative weight of a term match in each field when ranking search results
+SEARCH_FIELD_WEIGHTS = {
+    "id": 3.0,
+    "name": 2.5,
+    "tags": 2.0,
+    "package": 1.5,
+    "category": 1.0,
+    "description": 1.0,
+}
 
 
 class ServerRegistry:
     """Enhanced registry for MCP servers and Gradio templates"""
 
+    # Built-in entries and their built search indexes, compiled by the first
+    # instance and shared by every later one. Instances get their own dicts
+    # and index copies, so custom entries never leak into the shared ones.
+    _builtin: Optional[Tuple[Dict[str, Any], Dict[str, Any], SearchIndex, SearchIndex]] = None
+    _builtin_lock = threading.Lock()
+
     def __init__(self):
         self.registry_path = Path(__file__).parent / "registry.json"
         self.templates_path = Path(__file__).parent / "templates"
@@ -23,11 +42,11 @@ class ServerRegistry:
 
     def _load_registry(self) -> None:
         """Load the comprehensive server registry"""
-        # Load comprehensive MCP server registry
-        self.mcp_servers = self._get_mcp_server_registry()
-
-        # Load Gradio templates registry
-        self.templates = self._get_builtin_registry()
+        mcp_servers, templates, mcp_index, template_index = self._get_builtin_snapshot()
+        self.mcp_servers = dict(mcp_servers)
+        self.templates = dict(templates)
+        self._mcp_index = mcp_index.copy()
+        self._template_index = template_index.copy()
 
         # Load custom registry if exists
         if self.custom_registry_path.exists():
@@ -35,6 +54,68 @@ class ServerRegistry:
                 custom = json.load(f)
             # Merge custom entries into templates
             self.templates.update(custom)
+            for template_id, template_info in custom.items():
+                self._index_entry(self._template_index, template_id, template_info)
+
+    def _get_builtin_snapshot(
+        self,
+    ) -> Tuple[Dict[str, Any], Dict[str, Any], SearchIndex, SearchIndex]:
+        """Built-in MCP servers and templates with their search indexes, built once"""
+        with ServerRegistry._builtin_lock:
+            if ServerRegistry._builtin is None:
+                mcp_servers = self._get_mcp_server_registry()
+                mcp_index = SearchIndex(SEARCH_FIELD_WEIGHTS, fuzzy=True)
+                for server_id, server_info in mcp_servers.items():
+                    self._index_entry(mcp_index, server_id, server_info)
+
+                templates = self._get_builtin_registry()
+                template_index = SearchIndex(SEARCH_FIELD_WEIGHTS, fuzzy=True)
+                for template_id, template_info in templates.items():
+                    self._index_entry(template_index, template_id, template_info)
+
+                ServerRegistry._builtin = (mcp_servers, templates, mcp_index, template_index)
+            return ServerRegistry._builtin
+
+    @staticmethod
+    def _index_entry(index: SearchIndex, entry_id: str, info: Dict[str, Any]) -> None:
+        """Add a registry entry's searchable fields to ``index``"""
+        index.add(
+            entry_id,
+            {
+                "id": entry_id,
+                "name": info.get("name", ""),
+                "description": info.get("description", ""),
+                "tags": " ".join(info.get("tags", [])),
+                "package": info.get("package", ""),
+                "category": info.get("category", ""),
+            },
+        )
+
+    def _ranked_ids(
+        self,
+        index: SearchIndex,
+        entries: Dict[str, Dict[str, Any]],
+        query: str,
+        category: Optional[str],
+    ) -> List[str]:
+        """IDs of ``entries`` matching ``query``, best first"""
+        query = query.strip().lower()
+        if not query:
+            # An empty query matches everything, in registry order
+            return [
+                entry_id
+                for entry_id, info in entries.items()
+                if not category or info.get("category") == category
+            ]
+
+        def in_category(entry_id: str) -> bool:
+            return entries[entry_id].get("category") == category
+
+        where = in_category if category else None
+        ranked = [entry_id for entry_id, _ in index.search(query, where=where)]
+        # An exact ID match always comes first
+        ranked.sort(key=lambda entry_id: entry_id != query)
+        return ranked
 
     def _get_mcp_server_registry(self) -> Dict[str, Dict[str, Any]]:
         """Get comprehensive MCP server registry with 80+ servers"""
@@ -352,63 +433,24 @@ class ServerRegistry:
     def search_mcp_servers(
         self, query: str, category: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Search for MCP servers in the registry"""
-        query = query.lower()
-        results = []
-
-        for server_id, server_info in self.mcp_servers.items():
-            # Filter by category if specified
-            if category and server_info.get("category") != category:
-                continue
-
-            # Search in server ID, name, description, and package
-            searchable_text = f"{server_id} {server_info['name']} {server_info['description']} {server_info['category']} {server_info.get('package', '')}".lower()
-
-            if query in searchable_text:
-                results.append({"id": server_id, "type": "mcp_server", **server_info})
-
-        # Sort by relevance (exact matches first, then partial matches)
-        def relevance_score(server):
-            score = 0
-            server_text = f"{server['id']} {server['name']}".lower()
-
-            if query == server["id"]:
-                score += 100
-            elif query in server["id"]:
-                score += 50
-            elif query in server["name"].lower():
-                score += 30
-            elif query in server["description"].lower():
-                score += 10
-
-            return score
+        """Search for MCP servers in the registry, ranked by relevance
 
-        results.sort(key=relevance_score, reverse=True)
-        return results
+        Every word of the query must match a word (or the start of one) in the
+        server's ID, name, description, category or package. A word that
+        matches nothing is matched against similarly spelled ones instead.
+        """
+        return [
+            {"id": server_id, "type": "mcp_server", **self.mcp_servers[server_id]}
+            for server_id in self._ranked_ids(self._mcp_index, self.mcp_servers, query, category)
+        ]
 
     def search_templates(self, query: str, category: Optional[str] = None) -> List[Dict[str, Any]]:
-        """Search for Gradio templates in the registry"""
-        query = query.lower()
+        """Search for Gradio templates in the registry, ranked by relevance"""
         results = []
-
-        for server_id, server_info in self.templates.items():
-            # Filter by category if specified
-            if category and server_info.get("category") != category:
-                continue
-
-            # Search in various fields
-            searchable = [
-                server_id,
-                server_info.get("name", "").lower(),
-                server_info.get("description", "").lower(),
-                " ".join(server_info.get("tags", [])).lower(),
-            ]
-
-            if any(query in field for field in searchable):
-                server_info_copy = dict(server_info)
-                server_info_copy["type"] = "template"
-                results.append(server_info_copy)
-
+        for template_id in self._ranked_ids(self._template_index, self.templates, query, category):
+            server_info_copy = dict(self.templates[template_id])
+            server_info_copy["type"] = "template"
+            results.append(server_info_copy)
         return results
 
     def search(
@@ -619,7 +661,8 @@ class ServerRegistry:
             json.dump(custom, f, indent=2)
 
         # Update in-memory registry
-        self.registry[server_id] = custom[server_id]
+        self.templates[server_id] = custom[server_id]
+        self._index_entry(self._template_index, server_id, custom[server_id])
 
     def remove_custom_server(self, server_id: str) -> bool:
         """Remove a custom server from the registry"""
@@ -636,8 +679,9 @@ class ServerRegistry:
                 json.dump(custom, f, indent=2)
 
             # Update in-memory registry
-            if server_id in self.registry and self.registry[server_id].get("author") == "Custom":
-                del self.registry[server_id]
+            if server_id in self.templates and self.templates[server_id].get("author") == "Custom":
+                del self.templates[server_id]
+                self._template_index.remove(server_id)
 
             return True
 
@@ -865,3 +909,15 @@ if __name__ == "__main__":
                 },
             },
         }
+
+
+# Global registry instance
+_registry = None
+
+
+def get_registry() -> ServerRegistry:
+    """Get or create the global registry instance"""
+    global _registry
+    if _registry is None:
+        _registry = ServerRegistry()
+    return _registry
@@ -0,0 +1,386 @@
+"""Gradio MCP Registry Search Index
+
+An inverted index over registry entries, built once when the registry loads.
+Entries are tokenized per field (id, name, description, tags, ...), and each
+term's postings store a BM25F weight: term frequencies are normalized by field
+length, weighted per field and saturated. A query is then a handful of dict
+lookups plus a bisect over the sorted vocabulary for prefix matches ("calc"
+finds "calculator"), instead of a scan over every entry.
+
+Query words that match nothing can fall back to a trigram index over the
+vocabulary, so "filesytem" still finds "filesystem".
+
+``TfidfMatrix`` scores free text against every document at once as a sparse
+matrix-vector product, for similarity ranking rather than keyword search.
+"""
+
+import bisect
+import heapq
+import math
+import re
+from collections import Counter, defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+try:
+    import numpy as np
+
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Prefix matches rank below whole-word matches of the same term, and one- or
+# two-letter words only match whole words
+PREFIX_WEIGHT = 0.6
+PREFIX_MIN_LENGTH = 3
+MAX_PREFIX_EXPANSIONS = 50
+
+# Typo matches rank below prefix matches and need a word long enough for
+# trigram overlap to mean something
+FUZZY_WEIGHT = 0.5
+FUZZY_MIN_LENGTH = 4
+FUZZY_THRESHOLD = 0.3
+MAX_FUZZY_EXPANSIONS = 5
+
+# Words too common to say anything about what a document is for; similarity
+# scoring ignores them so a request like "something for the ..." matches nothing
+STOPWORDS = frozenset(
+    """
+    a about above after again all also an and any are as at be been before being
+    below between both but by can could did do does doing down during each few
+    for from further had has have having here how i if in into is it its itself
+    just me more most my no nor not now of off on once only or other our out over
+    own same she should so some something such than that the their them then
+    there these they this those through to too under until up use used using very
+    want was we were what when where which while who whom why will with would you
+    your
+    """.split()
+)
+
+
+def _rank_key(item: Tuple[str, float]) -> Tuple[float, str]:
+    """Sort key for ``(doc_id, score)``: best score first, then by ID"""
+    return -item[1], item[0]
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase ``text`` and split it into alphanumeric tokens"""
+    return _TOKEN_RE.findall(text.lower())
+
+
+def trigrams(term: str) -> Set[str]:
+    """Character trigrams of ``term``, padded so word starts weigh more"""
+    padded = f"  {term} "
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    """Maps trigrams to the terms containing them, for typo-tolerant lookups"""
+
+    def __init__(self, terms: Iterable[str] = ()):
+        self._postings: Dict[str, List[str]] = defaultdict(list)
+        self._sizes: Dict[str, int] = {}
+        for term in terms:
+            self.add(term)
+
+    def __len__(self) -> int:
+        return len(self._sizes)
+
+    def add(self, term: str) -> None:
+        if term in self._sizes:
+            return
+        grams = trigrams(term)
+        self._sizes[term] = len(grams)
+        for gram in grams:
+            self._postings[gram].append(term)
+
+    def similar(
+        self, term: str, threshold: float = FUZZY_THRESHOLD, limit: int = MAX_FUZZY_EXPANSIONS
+    ) -> List[Tuple[str, float]]:
+        """Terms whose trigram Jaccard similarity to ``term`` is at least ``threshold``
+
+        Returns:
+            At most ``limit`` ``(term, similarity)`` pairs, most similar first
+        """
+        grams = trigrams(term)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        # |A ∩ B| / |A ∪ B| >= t needs at least t * |A| shared trigrams
+        minimum = threshold * len(grams)
+        candidates = []
+        for candidate, count in shared.items():
+            if count < minimum:
+                continue
+            similarity = count / (len(grams) + self._sizes[candidate] - count)
+            if similarity >= threshold:
+                candidates.append((candidate, similarity))
+        return heapq.nsmallest(limit, candidates, key=lambda item: (-item[1], item[0]))
+
+
+class SearchIndex:
+    """BM25F-ranked inverted index with prefix matching
+
+    Documents are added with ``add`` as ``{field: text}``; ``search`` builds
+    the postings lazily on first use after a change. A query token matches a
+    term exactly or as its prefix; with ``fuzzy``, a token that matches
+    nothing is matched against similarly spelled terms instead.
+    """
+
+    def __init__(
+        self,
+        field_weights: Dict[str, float],
+        k1: float = 1.2,
+        b: float = 0.75,
+        fuzzy: bool = False,
+    ):
+        self.field_weights = field_weights
+        self.k1 = k1
+        self.b = b
+        self.fuzzy = fuzzy
+        self._docs: Dict[str, Dict[str, List[str]]] = {}
+        # (postings, sorted vocabulary, trigrams), swapped as one so readers
+        # never mix builds
+        self._built: Tuple[Dict[str, Dict[str, float]], List[str], Optional[TrigramIndex]] = (
+            {},
+            [],
+            None,
+        )
+        self._dirty = False
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._docs
+
+    def add(self, doc_id: str, fields: Dict[str, str]) -> None:
+        """Index (or re-index) ``doc_id`` with the text of its fields"""
+        self._docs[doc_id] = {
+            field: tokenize(text or "")
+            for field, text in fields.items()
+            if field in self.field_weights
+        }
+        self._dirty = True
+
+    def remove(self, doc_id: str) -> None:
+        """Drop ``doc_id`` from the index"""
+        if self._docs.pop(doc_id, None) is not None:
+            self._dirty = True
+
+    def copy(self) -> "SearchIndex":
+        """An independent index over the same documents
+
+        The postings are built first if needed and shared by both indexes
+        (builds never modify them) until either one changes.
+        """
+        if self._dirty:
+            self._build()
+        clone = SearchIndex(self.field_weights, self.k1, self.b, self.fuzzy)
+        clone._docs = dict(self._docs)
+        clone._built = self._built
+        return clone
+
+    def _build(self) -> None:
+        """Compute BM25F weights for every (term, document) pair"""
+        self._dirty = False
+        average_length = {}
+        for field in self.field_weights:
+            lengths = [len(doc.get(field, ())) for doc in self._docs.values()]
+            average_length[field] = (sum(lengths) / len(lengths)) if lengths else 0.0
+
+        # Length-normalized, field-weighted term frequency per document
+        frequencies: Dict[str, Dict[str, float]] = defaultdict(dict)
+        for doc_id, doc in self._docs.items():
+            for field, tokens in doc.items():
+                if not tokens:
+                    continue
+                norm = 1 - self.b + self.b * len(tokens) / (average_length[field] or 1.0)
+                weight = self.field_weights[field] / norm
+                for token in tokens:
+                    frequencies[token][doc_id] = frequencies[token].get(doc_id, 0.0) + weight
+
+        count = len(self._docs)
+        postings = {}
+        for term, docs in frequencies.items():
+            idf = math.log(1 + (count - len(docs) + 0.5) / (len(docs) + 0.5))
+            weights = [
+                (doc_id, idf * tf * (self.k1 + 1) / (tf + self.k1)) for doc_id, tf in docs.items()
+            ]
+            # Stored best first, so a one-term query needs no sort
+            if len(weights) > 1:
+                weights.sort(key=_rank_key)
+            postings[term] = dict(weights)
+
+        vocabulary = sorted(postings)
+        trigram_index = None
+        if self.fuzzy:
+            # Misspelled numbers are not worth matching
+            trigram_index = TrigramIndex(term for term in vocabulary if not term.isdigit())
+        self._built = (postings, vocabulary, trigram_index)
+
+    @staticmethod
+    def _expand(vocabulary: List[str], token: str) -> List[Tuple[str, float]]:
+        """Vocabulary terms matching ``token`` exactly or by prefix, with their weight"""
+        start = bisect.bisect_left(vocabulary, token)
+        if len(token) < PREFIX_MIN_LENGTH:
+            exact = start < len(vocabulary) and vocabulary[start] == token
+            return [(token, 1.0)] if exact else []
+
+        matches = []
+        for term in vocabulary[start : start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(token):
+                break
+            matches.append((term, 1.0 if term == token else PREFIX_WEIGHT))
+        return matches
+
+    def search(
+        self,
+        query: str,
+        limit: Optional[int] = None,
+        where: Optional[Callable[[str], bool]] = None,
+        match_all: bool = True,
+    ) -> List[Tuple[str, float]]:
+        """Rank documents matching ``query``
+
+        Args:
+            query: Free text; an empty query matches nothing
+            limit: Maximum number of results
+            where: Optional predicate on document IDs applied before ranking
+            match_all: Require every token to match, rather than any token
+
+        Returns:
+            ``(doc_id, score)`` pairs, best first
+        """
+        if self._dirty:
+            self._build()
+        postings, vocabulary, trigram_index = self._built
+
+        scores: Optional[Dict[str, float]] = None
+        presorted = False
+        for token in dict.fromkeys(tokenize(query)):
+            expansions = self._expand(vocabulary, token)
+            if not expansions and trigram_index is not None and len(token) >= FUZZY_MIN_LENGTH:
+                expansions = [
+                    (term, FUZZY_WEIGHT * similarity)
+                    for term, similarity in trigram_index.similar(token)
+                ]
+            if not expansions and not match_all:
+                continue
+            if len(expansions) == 1 and expansions[0][1] == 1.0:
+                # Only the term itself: its postings are the scores (read only)
+                token_scores = postings[token]
+                presorted = scores is None
+            else:
+                # Best match of this token per document; expansions don't add up
+                token_scores = {}
+                for term, weight in expansions:
+                    for doc_id, score in postings[term].items():
+                        score *= weight
+                        if score > token_scores.get(doc_id, 0.0):
+                            token_scores[doc_id] = score
+
+            if scores is None:
+                scores = token_scores
+            elif match_all:
+                presorted = False
+                smaller, larger = sorted((scores, token_scores), key=len)
+                scores = {
+                    doc_id: score + larger[doc_id]
+                    for doc_id, score in smaller.items()
+                    if doc_id in larger
+                }
+            else:
+                presorted = False
+                scores = dict(scores)
+                for doc_id, score in token_scores.items():
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+            if not scores and match_all:
+                return []
+
+        if not scores:
+            return []
+        ranked: Iterable[Tuple[str, float]] = scores.items()
+        if where is not None:
+            ranked = [(doc_id, score) for doc_id, score in ranked if where(doc_id)]
+        if presorted:
+            return list(ranked)[:limit]
+        if limit is not None:
+            return heapq.nsmallest(limit, ranked, key=_rank_key)
+        return sorted(ranked, key=_rank_key)
+
+
+class TfidfMatrix:
+    """Sparse, L2-normalized TF-IDF vectors of documents (requires numpy)
+
+    The matrix is stored column-wise: for each term, the rows of the documents
+    containing it and their weights. Scoring a query is a matrix-vector
+    product that only reads the columns of the query's terms.
+    """
+
+    def __init__(self, documents: Dict[str, str], stopwords: Iterable[str] = ()):
+        self.doc_ids = list(documents)
+        self._stopwords = frozenset(stopwords)
+
+        postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        for row, text in enumerate(documents.values()):
+            terms = (token for token in tokenize(text) if token not in self._stopwords)
+            for term, count in Counter(terms).items():
+                postings[term].append((row, count))
+
+        count = len(self.doc_ids)
+        self._columns: Dict[str, int] = {}
+        idf = []
+        indptr = [0]
+        rows = []
+        weights = []
+        for column, (term, docs) in enumerate(postings.items()):
+            self._columns[term] = column
+            idf.append(math.log((1 + count) / (1 + len(docs))) + 1)
+            for row, frequency in docs:
+                rows.append(row)
+                weights.append((1 + math.log(frequency)) * idf[-1])
+            indptr.append(len(rows))
+
+        self._idf = np.array(idf)
+        self._indptr = np.array(indptr, dtype=np.int64)
+        self._rows = np.array(rows, dtype=np.int64)
+        self._data = np.array(weights, dtype=np.float64)
+        if len(self._rows):
+            norms = np.sqrt(np.bincount(self._rows, weights=self._data**2, minlength=count))
+            self._data /= norms[self._rows]
+
+    def __len__(self) -> int:
+        return len(self.doc_ids)
+
+    def scores(self, query: str) -> "np.ndarray":
+        """Cosine similarity of ``query`` to every document, in ``doc_ids`` order"""
+        frequencies = Counter(token for token in tokenize(query) if token in self._columns)
+        scores = np.zeros(len(self.doc_ids))
+        if not frequencies:
+            return scores
+
+        columns = np.array([self._columns[term] for term in frequencies])
+        weights = (1 + np.log(np.array(list(frequencies.values())))) * self._idf[columns]
+        weights /= np.sqrt(np.dot(weights, weights))
+        for column, weight in zip(columns, weights):
+            start, end = self._indptr[column], self._indptr[column + 1]
+            scores[self._rows[start:end]] += weight * self._data[start:end]
+        return scores
+
+
+def top_indices(
+    scores: "np.ndarray", limit: Optional[int] = None, min_score: float = 0.0
+) -> "np.ndarray":
+    """Indices of the scores above ``min_score``, best first (ties by index)
+
+    With ``limit``, only the best ``limit`` are selected and sorted.
+    """
+    candidates = np.flatnonzero(scores > min_score)
+    if limit is not None and len(candidates) > limit:
+        if limit <= 0:
+            return candidates[:0]
+        candidates = np.sort(candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]])
+    return candidates[np.lexsort((candidates, -scores[candidates]))]
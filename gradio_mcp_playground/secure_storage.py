@@ -5,11 +5,14 @@ Uses industry-standard encryption practices with the cryptography library.
 """
 
 import base64
+import copy
+import functools
 import hashlib
 import json
 import os
+import threading
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 # Optional imports for encryption
 try:
@@ -21,13 +24,70 @@ try:
 except ImportError:
     HAS_CRYPTOGRAPHY = False
 
+from .utils import atomic_write, file_lock
+
+# api_keys.enc layout: this header, then one Fernet-encrypted JSON record per line.
+# Files without the header are the legacy single-blob format and are migrated.
+KEYS_FILE_HEADER = b"GMPKEYS2\n"
+
+# Rewrite the record log once it holds this many more records than live keys
+COMPACTION_SLACK = 64
+
+
+# Process-wide keyring: ciphers derived from (salt, machine id) so PBKDF2 runs
+# once per process instead of once per SecureStorage construction
+_keyring_lock = threading.Lock()
+_derived_ciphers: Dict[Tuple[bytes, str], Any] = {}
+
+# Shared instance handed out by get_secure_storage()
+_shared_storage_lock = threading.Lock()
+_shared_storage: Optional["SecureStorage"] = None
+
+
+@functools.lru_cache(maxsize=1)
+def _get_machine_id() -> str:
+    """Get a machine-specific identifier (computed once per process)"""
+    try:
+        # Try to get machine ID (works on most systems)
+        if os.name == "nt":  # Windows
+            import subprocess
+
+            result = subprocess.run(
+                ["wmic", "csproduct", "get", "UUID"], capture_output=True, text=True
+            )
+            if result.returncode == 0:
+                lines = result.stdout.strip().split("\n")
+                if len(lines) > 1:
+                    return lines[1].strip()
+        else:  # Unix-like
+            machine_id_file = Path("/etc/machine-id")
+            if machine_id_file.exists():
+                return machine_id_file.read_text().strip()
+
+            # Fallback to other system identifiers
+            try:
+                import subprocess
+
+                result = subprocess.run(["hostid"], capture_output=True, text=True)
+                if result.returncode == 0:
+                    return result.stdout.strip()
+            except:
+                pass
+    except:
+        pass
+
+    # Fallback: use home directory path hash (stable per user)
+    return hashlib.sha256(str(Path.home()).encode()).hexdigest()[:16]
+
 
 class SecureStorage:
     """Secure storage for API keys and sensitive configuration
 
     This class provides encrypted storage for API keys at rest using the
-    cryptography library. Keys are stored in an encrypted JSON file in the
-    ~/.gradio-mcp/ directory.
+    cryptography library. Keys are stored in ~/.gradio-mcp/api_keys.enc as an
+    append-only log of individually encrypted records, so a change only writes
+    the affected entries. Writers hold an advisory lock and the log is compacted
+    with an atomic replace.
     """
 
     def __init__(self, config_dir: Optional[Path] = None):
@@ -45,6 +105,16 @@ class SecureStorage:
 
         self.keys_file = self.config_dir / "api_keys.enc"
         self.salt_file = self.config_dir / "salt.key"
+        self.lock_file = self.config_dir / "api_keys.lock"
+
+        # Decrypted view of keys_file, reused while the file's stat is unchanged.
+        # _view_offset is how far the record log has been parsed (None for legacy
+        # files) and _view_records how many records it holds.
+        self._keys_view: Optional[Dict[str, Any]] = None
+        self._keys_signature: Optional[Tuple[int, int, int]] = None
+        self._view_offset: Optional[int] = None
+        self._view_records = 0
+        self._view_lock = threading.Lock()
 
         # Generate or load encryption key
         self._setup_encryption()
@@ -60,52 +130,28 @@ class SecureStorage:
             with open(self.salt_file, "rb") as f:
                 salt = f.read()
 
-        # Generate key from machine-specific data
+        # Generate key from machine-specific data, reusing an already derived key
         machine_id = self._get_machine_id()
-        password = machine_id.encode("utf-8")
+        keyring_key = (salt, machine_id)
+
+        with _keyring_lock:
+            cipher = _derived_ciphers.get(keyring_key)
+            if cipher is None:
+                kdf = PBKDF2HMAC(
+                    algorithm=hashes.SHA256(),
+                    length=32,
+                    salt=salt,
+                    iterations=100000,
+                )
+                key = base64.urlsafe_b64encode(kdf.derive(machine_id.encode("utf-8")))
+                cipher = Fernet(key)
+                _derived_ciphers[keyring_key] = cipher
 
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=salt,
-            iterations=100000,
-        )
-        key = base64.urlsafe_b64encode(kdf.derive(password))
-        self.cipher = Fernet(key)
+        self.cipher = cipher
 
     def _get_machine_id(self) -> str:
         """Get a machine-specific identifier"""
-        try:
-            # Try to get machine ID (works on most systems)
-            if os.name == "nt":  # Windows
-                import subprocess
-
-                result = subprocess.run(
-                    ["wmic", "csproduct", "get", "UUID"], capture_output=True, text=True
-                )
-                if result.returncode == 0:
-                    lines = result.stdout.strip().split("\n")
-                    if len(lines) > 1:
-                        return lines[1].strip()
-            else:  # Unix-like
-                machine_id_file = Path("/etc/machine-id")
-                if machine_id_file.exists():
-                    return machine_id_file.read_text().strip()
-
-                # Fallback to other system identifiers
-                try:
-                    import subprocess
-
-                    result = subprocess.run(["hostid"], capture_output=True, text=True)
-                    if result.returncode == 0:
-                        return result.stdout.strip()
-                except:
-                    pass
-        except:
-            pass
-
-        # Fallback: use home directory path hash (stable per user)
-        return hashlib.sha256(str(Path.home()).encode()).hexdigest()[:16]
+        return _get_machine_id()
 
     def store_key(self, service: str, key_name: str, key_value: str) -> bool:
         """Store an encrypted API key for a service
@@ -118,27 +164,46 @@ class SecureStorage:
         Returns:
             bool: True if successful
         """
-        try:
-            # Load existing keys
-            keys = self._load_keys()
+        return self.store_many({service: {key_name: key_value}})
 
-            # Initialize service if it doesn't exist
-            if service not in keys:
-                keys[service] = {}
+    def store_many(self, keys: Dict[str, Dict[str, str]]) -> bool:
+        """Store several encrypted API keys with a single write
 
-            # Encrypt and store new key
-            encrypted_key = self.cipher.encrypt(key_value.encode("utf-8"))
-            keys[service][key_name] = {
-                "value": base64.urlsafe_b64encode(encrypted_key).decode("utf-8"),
-                "created_at": self._get_timestamp(),
-                "updated_at": self._get_timestamp(),
-            }
+        Args:
+            keys: Nested dict of service -> key_name -> key_value
+
+        Returns:
+            bool: True if successful
+        """
+        try:
+            current = self._keys_snapshot()
+            timestamp = self._get_timestamp()
 
-            # Save back to file
-            return self._save_keys(keys)
+            records = []
+            for service, service_keys in keys.items():
+                for key_name, key_value in service_keys.items():
+                    existing = current.get(service, {}).get(key_name, {})
+                    encrypted_key = self.cipher.encrypt(key_value.encode("utf-8"))
+                    records.append(
+                        {
+                            "op": "set",
+                            "service": service,
+                            "key_name": key_name,
+                            "entry": {
+                                "value": base64.urlsafe_b64encode(encrypted_key).decode("utf-8"),
+                                "created_at": existing.get("created_at", timestamp),
+                                "updated_at": timestamp,
+                            },
+                        }
+                    )
+
+            if not records:
+                return True
+
+            return self._append_records(records)
 
         except Exception as e:
-            print(f"Error storing API key: {e}")
+            print(f"Error storing API keys: {e}")
             return False
 
     def retrieve_key(self, service: str, key_name: str) -> Optional[str]:
@@ -152,7 +217,7 @@ class SecureStorage:
             str or None: Decrypted API key if found
         """
         try:
-            keys = self._load_keys()
+            keys = self._keys_snapshot()
 
             if service not in keys or key_name not in keys[service]:
                 return None
@@ -178,23 +243,17 @@ class SecureStorage:
             bool: True if successful
         """
         try:
-            keys = self._load_keys()
+            keys = self._keys_snapshot()
 
             if service not in keys:
                 return True  # Already doesn't exist
 
-            if key_name is None:
-                # Delete all keys for the service
-                del keys[service]
-            else:
-                # Delete specific key
-                if key_name in keys[service]:
-                    del keys[service][key_name]
-                    # If no more keys for this service, remove the service
-                    if not keys[service]:
-                        del keys[service]
+            if key_name is not None and key_name not in keys[service]:
+                return True
 
-            return self._save_keys(keys)
+            return self._append_records(
+                [{"op": "delete", "service": service, "key_name": key_name}]
+            )
 
         except Exception as e:
             print(f"Error deleting API key: {e}")
@@ -207,7 +266,7 @@ class SecureStorage:
             list: Service names with stored keys
         """
         try:
-            keys = self._load_keys()
+            keys = self._keys_snapshot()
             return list(keys.keys())
         except:
             return []
@@ -222,7 +281,7 @@ class SecureStorage:
             list: Key names for the service
         """
         try:
-            keys = self._load_keys()
+            keys = self._keys_snapshot()
             if service in keys:
                 return list(keys[service].keys())
             return []
@@ -236,7 +295,7 @@ class SecureStorage:
             dict: Nested dict of service -> key_name -> metadata
         """
         try:
-            keys = self._load_keys()
+            keys = self._keys_snapshot()
             info = {}
             for service, service_keys in keys.items():
                 info[service] = {}
@@ -257,42 +316,193 @@ class SecureStorage:
             bool: True if successful
         """
         try:
-            if self.keys_file.exists():
-                self.keys_file.unlink()
+            with file_lock(self.lock_file):
+                if self.keys_file.exists():
+                    self.keys_file.unlink()
+                with self._view_lock:
+                    self._reset_view()
             return True
         except Exception as e:
             print(f"Error clearing API keys: {e}")
             return False
 
-    def _load_keys(self) -> Dict[str, Any]:
-        """Load API keys from encrypted file"""
-        if not self.keys_file.exists():
-            return {}
+    def _file_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Stat identity of the keys file, or None if it does not exist"""
+        try:
+            st = self.keys_file.stat()
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+    def _reset_view(self) -> None:
+        """Forget the decrypted view (caller holds _view_lock)"""
+        self._keys_view = None
+        self._keys_signature = None
+        self._view_offset = None
+        self._view_records = 0
+
+    def _keys_snapshot(self) -> Dict[str, Any]:
+        """Return the decrypted key view, decrypting only what changed on disk
+
+        The returned dict is shared; use ``_load_keys`` for a copy to modify.
+        """
+        signature = self._file_signature()
+
+        with self._view_lock:
+            if self._keys_view is None or signature != self._keys_signature:
+                self._refresh_view(signature)
+            return self._keys_view
+
+    def _refresh_view(self, signature: Optional[Tuple[int, int, int]]) -> None:
+        """Bring the decrypted view up to date with the file (caller holds _view_lock)
+
+        When records were only appended since the last refresh, just the new
+        records are decrypted.
+        """
+        if signature is None:
+            self._reset_view()
+            self._keys_view = {}
+            return
 
         try:
             with open(self.keys_file, "rb") as f:
-                encrypted_data = f.read()
+                header = f.read(len(KEYS_FILE_HEADER))
+
+                if header != KEYS_FILE_HEADER:
+                    # Legacy format: the whole key dict encrypted as one blob
+                    try:
+                        keys = json.loads(self.cipher.decrypt(header + f.read()).decode("utf-8"))
+                    except Exception:
+                        # If we can't decrypt (corruption, key change, etc.), start fresh
+                        keys = {}
+                    self._keys_view = keys
+                    self._keys_signature = signature
+                    self._view_offset = None
+                    self._view_records = 0
+                    return
+
+                appended_only = (
+                    self._keys_view is not None
+                    and self._view_offset is not None
+                    and self._keys_signature is not None
+                    and self._keys_signature[2] == signature[2]
+                    and signature[1] >= self._view_offset
+                )
+                if appended_only:
+                    # Copy service dicts so readers holding the old view are unaffected
+                    keys = {service: dict(entries) for service, entries in self._keys_view.items()}
+                    offset, records = self._view_offset, self._view_records
+                    f.seek(offset)
+                else:
+                    keys, offset, records = {}, len(KEYS_FILE_HEADER), 0
+
+                data = f.read()
+        except FileNotFoundError:
+            self._reset_view()
+            self._keys_view = {}
+            return
+
+        # Only consume complete lines; a partially appended record is read next time
+        end = data.rfind(b"\n") + 1
+        for line in data[:end].splitlines():
+            records += 1
+            try:
+                record = json.loads(self.cipher.decrypt(line).decode("utf-8"))
+            except Exception:
+                continue  # Skip records we can't decrypt
+            self._apply_record(keys, record)
+
+        self._keys_view = keys
+        self._keys_signature = signature
+        self._view_offset = offset + end
+        self._view_records = records
+
+    @staticmethod
+    def _apply_record(keys: Dict[str, Any], record: Dict[str, Any]) -> None:
+        """Apply one log record to a key dict"""
+        service = record.get("service")
+        key_name = record.get("key_name")
+
+        if record.get("op") == "set":
+            keys[service] = dict(keys.get(service, {}))
+            keys[service][key_name] = record["entry"]
+        elif record.get("op") == "delete" and service in keys:
+            if key_name is None:
+                del keys[service]
+            else:
+                keys[service] = {k: v for k, v in keys[service].items() if k != key_name}
+                # If no more keys for this service, remove the service
+                if not keys[service]:
+                    del keys[service]
 
-            decrypted_data = self.cipher.decrypt(encrypted_data)
-            return json.loads(decrypted_data.decode("utf-8"))
+    def _load_keys(self) -> Dict[str, Any]:
+        """Load API keys from encrypted file"""
+        return copy.deepcopy(self._keys_snapshot())
 
-        except Exception:
-            # If we can't decrypt (corruption, key change, etc.), start fresh
-            return {}
+    def _encrypt_record(self, record: Dict[str, Any]) -> bytes:
+        """Encrypt one log record as a single line"""
+        payload = json.dumps(record, separators=(",", ":")).encode("utf-8")
+        return self.cipher.encrypt(payload) + b"\n"
 
-    def _save_keys(self, keys: Dict[str, Any]) -> bool:
-        """Save API keys to encrypted file"""
+    def _append_records(self, records: List[Dict[str, Any]]) -> bool:
+        """Append encrypted records to the key log under the writer lock"""
         try:
-            data = json.dumps(keys, indent=2)
-            encrypted_data = self.cipher.encrypt(data.encode("utf-8"))
+            with file_lock(self.lock_file):
+                with self._view_lock:
+                    self._refresh_view(self._file_signature())
+                    if self._view_offset is None and self._keys_signature is not None:
+                        # Migrate a legacy single-blob file before appending to it
+                        self._write_all_locked(self._keys_view)
+
+                payload = b"".join(self._encrypt_record(record) for record in records)
+                with open(self.keys_file, "ab") as f:
+                    if f.tell() == 0:
+                        payload = KEYS_FILE_HEADER + payload
+                    f.write(payload)
+                    f.flush()
+                    os.fsync(f.fileno())
+
+                # Set restrictive permissions (owner only)
+                if os.name != "nt":  # Unix-like systems
+                    os.chmod(self.keys_file, 0o600)
+
+                with self._view_lock:
+                    self._refresh_view(self._file_signature())
+                    if self._view_records > self._count_keys(self._keys_view) + COMPACTION_SLACK:
+                        self._write_all_locked(self._keys_view)
+
+            return True
 
-            with open(self.keys_file, "wb") as f:
-                f.write(encrypted_data)
+        except Exception as e:
+            print(f"Error saving API keys: {e}")
+            return False
 
-            # Set restrictive permissions (owner only)
-            if os.name != "nt":  # Unix-like systems
-                os.chmod(self.keys_file, 0o600)
+    @staticmethod
+    def _count_keys(keys: Dict[str, Any]) -> int:
+        """Number of stored keys across all services"""
+        return sum(len(service_keys) for service_keys in keys.values())
+
+    def _write_all_locked(self, keys: Dict[str, Any]) -> None:
+        """Atomically rewrite the log with one record per key (caller holds both locks)"""
+        records = [
+            {"op": "set", "service": service, "key_name": key_name, "entry": entry}
+            for service, service_keys in keys.items()
+            for key_name, entry in service_keys.items()
+        ]
+        payload = KEYS_FILE_HEADER + b"".join(self._encrypt_record(r) for r in records)
+        atomic_write(self.keys_file, payload, mode=0o600)
+
+        self._keys_view = {service: dict(entries) for service, entries in keys.items()}
+        self._keys_signature = self._file_signature()
+        self._view_offset = len(payload)
+        self._view_records = len(records)
 
+    def _save_keys(self, keys: Dict[str, Any]) -> bool:
+        """Replace all stored API keys with ``keys``"""
+        try:
+            with file_lock(self.lock_file):
+                with self._view_lock:
+                    self._write_all_locked(keys)
             return True
 
         except Exception as e:
@@ -316,7 +526,7 @@ class SecureStorage:
             dict or None: Key metadata
         """
         try:
-            keys = self._load_keys()
+            keys = self._keys_snapshot()
             if service in keys and key_name in keys[service]:
                 info = keys[service][key_name].copy()
                 info.pop("value", None)  # Remove actual key value
@@ -339,27 +549,9 @@ class SecureStorage:
         Returns:
             bool: True if successful
         """
-        try:
-            keys = self._load_keys()
-
-            if service not in keys or key_name not in keys[service]:
-                # Key doesn't exist, create it
-                return self.store_key(service, key_name, key_value)
-
-            # Update existing key
-            encrypted_key = self.cipher.encrypt(key_value.encode("utf-8"))
-            keys[service][key_name]["value"] = base64.urlsafe_b64encode(encrypted_key).decode(
-                "utf-8"
-            )
-            keys[service][key_name]["updated_at"] = self._get_timestamp()
-
-            return self._save_keys(keys)
-
-        except Exception as e:
-            print(f"Error updating API key: {e}")
-            return False
+        # Creates the key if it doesn't exist, keeps created_at if it does
+        return self.store_many({service: {key_name: key_value}})
 
-    # Integration methods for MCP server installation
     def store_server_keys(self, server_name: str, api_keys: Dict[str, str]) -> bool:
         """Store multiple API keys for an MCP server during installation
 
@@ -370,11 +562,7 @@ class SecureStorage:
         Returns:
             bool: True if all keys stored successfully
         """
-        success = True
-        for key_name, key_value in api_keys.items():
-            if not self.store_key(server_name, key_name, key_value):
-                success = False
-        return success
+        return self.store_many({server_name: api_keys})
 
     def retrieve_server_keys(self, server_name: str) -> Dict[str, str]:
         """Retrieve all API keys for an MCP server
@@ -475,15 +663,16 @@ class SecureStorage:
             import_data = json.loads(decrypted.decode("utf-8"))
 
             # Merge with existing keys
-            current_keys = self._load_keys()
             imported_keys = import_data.get("keys", {})
+            records = [
+                {"op": "set", "service": service, "key_name": key_name, "entry": entry}
+                for service, service_keys in imported_keys.items()
+                for key_name, entry in service_keys.items()
+            ]
+            if not records:
+                return True
 
-            for service, service_keys in imported_keys.items():
-                if service not in current_keys:
-                    current_keys[service] = {}
-                current_keys[service].update(service_keys)
-
-            return self._save_keys(current_keys)
+            return self._append_records(records)
 
         except Exception as e:
             print(f"Error importing keys: {e}")
@@ -512,16 +701,24 @@ class SecureTokenStorage(SecureStorage):
 
 
 def get_secure_storage() -> Optional[SecureStorage]:
-    """Get secure storage instance if cryptography is available
+    """Get the shared secure storage instance if cryptography is available
+
+    The instance is created once per process, so the key derivation and the
+    decrypted key view are reused by every caller.
 
     Returns:
         SecureStorage or None: Storage instance if available
     """
+    global _shared_storage
+
     if not HAS_CRYPTOGRAPHY:
         return None
 
-    try:
-        return SecureStorage()
-    except Exception as e:
-        print(f"Could not initialize secure storage: {e}")
-        return None
+    with _shared_storage_lock:
+        if _shared_storage is None:
+            try:
+                _shared_storage = SecureStorage()
+            except Exception as e:
+                print(f"Could not initialize secure storage: {e}")
+                return None
+        return _shared_storage
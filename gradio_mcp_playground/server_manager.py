@@ -4,13 +4,21 @@ Manages creation and configuration of Gradio apps as MCP servers.
 """
 
 import asyncio
+import hashlib
 import json
 import os
 import subprocess
 import sys
-from datetime import datetime
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from .metrics_sampler import get_metrics_sampler
+from .prefork import spawn_app
+from .readiness import DEFAULT_READY_TIMEOUT, ReadinessResult, wait_until_ready
+from .utils import atomic_write, tail_lines
 
 # Optional imports
 try:
@@ -27,6 +35,13 @@ try:
 except ImportError:
     HAS_MCP = False
 
+try:
+    import psutil
+
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
 try:
     from pydantic import BaseModel
 
@@ -41,6 +56,142 @@ except ImportError:
                 setattr(self, k, v)
 
 
+# Only the most recent lines are parsed when a log is first seen (or rotated)
+CLAUDE_LOG_TAIL_LINES = 200
+
+# If more than this many bytes were appended between refreshes, reseed from the
+# tail instead of parsing everything in between
+CLAUDE_LOG_MAX_INCREMENT = 4 * 1024 * 1024
+
+
+class _ClaudeLogState:
+    """Running summary of one Claude Desktop server log"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._reset(None)
+
+    def _reset(self, inode: Optional[int]) -> None:
+        self.inode = inode
+        self.offset = 0
+        self.last_server_started = None
+        self.last_transport_closed = None
+        self.last_message_activity = None
+        self.last_activity = None
+        self.errors: Deque[str] = deque(maxlen=5)
+
+    def refresh(self, log_file: Path) -> None:
+        """Consume whatever was appended to ``log_file`` since the last call"""
+        st = log_file.stat()
+        if st.st_ino != self.inode or st.st_size < self.offset:
+            # New, replaced or truncated file
+            self._reset(st.st_ino)
+            self._seed_from_tail(log_file, st.st_size)
+            return
+
+        if st.st_size == self.offset:
+            return
+
+        if st.st_size - self.offset > CLAUDE_LOG_MAX_INCREMENT:
+            self._reset(st.st_ino)
+            self._seed_from_tail(log_file, st.st_size)
+            return
+
+        with open(log_file, "rb") as f:
+            f.seek(self.offset)
+            data = f.read(st.st_size - self.offset)
+
+        # Leave a trailing partial line for the next refresh
+        end = data.rfind(b"\n") + 1
+        if end:
+            self._parse_lines(data[:end].decode("utf-8", errors="replace").splitlines())
+            self.offset += end
+
+    def _seed_from_tail(self, log_file: Path, size: int) -> None:
+        lines = tail_lines(log_file, CLAUDE_LOG_TAIL_LINES)
+        if lines and not lines[-1].endswith("\n"):
+            # Partial last line: parse it once it is complete
+            partial = lines.pop()
+            self.offset = size - len(partial.encode("utf-8"))
+        else:
+            self.offset = size
+        self._parse_lines(lines)
+
+    def _parse_lines(self, lines: List[str]) -> None:
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+
+            # Parse timestamp and message
+            if not line.startswith("202"):  # Handles 2024, 2025, etc.
+                continue
+            parts = line.split(" ", 3)
+            if len(parts) < 4:
+                continue
+
+            timestamp_str = parts[0]
+            level = parts[2] if parts[2].startswith("[") else None
+            message = parts[3]
+
+            try:
+                timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
+            except ValueError:
+                continue
+            self.last_activity = timestamp
+
+            # Track important events with timestamps
+            if "Server started and connected successfully" in message:
+                self.last_server_started = timestamp
+            elif "Client transport closed" in message or "Server transport closed" in message:
+                self.last_transport_closed = timestamp
+            elif "Message from server:" in message or "Message to server:" in message:
+                # Any message activity indicates the server is running
+                self.last_message_activity = timestamp
+            elif level and ("Server disconnected" in message or "error" in level.lower()):
+                self.errors.append(message)
+
+    def status(self) -> Dict[str, Any]:
+        """Derive the current status from the accumulated events"""
+        status: Dict[str, Any] = {}
+
+        # Determine current status based on the most recent events
+        if self.last_message_activity and self.last_activity:
+            # If we've seen message activity in the last 5 minutes, server is running
+            now = datetime.now(timezone.utc)
+            if (now - self.last_message_activity) < timedelta(minutes=5):
+                status["running"] = True
+                status["status_message"] = "Running"
+            else:
+                status["running"] = False
+                status["status_message"] = "Inactive"
+        elif self.last_server_started and self.last_transport_closed:
+            # Compare timestamps to see which event was more recent
+            if self.last_server_started > self.last_transport_closed:
+                status["running"] = True
+                status["status_message"] = "Running"
+            else:
+                status["running"] = False
+                status["status_message"] = "Disconnected"
+        elif self.last_server_started:
+            status["running"] = True
+            status["status_message"] = "Running"
+        elif self.errors:
+            status["running"] = False
+            status["status_message"] = "Error"
+        else:
+            status["running"] = False
+            status["status_message"] = "Stopped"
+
+        status["last_seen"] = self.last_activity.isoformat() if self.last_activity else None
+        status["errors"] = list(self.errors)  # Keep last 5 errors
+        return status
+
+
+_claude_log_states: Dict[str, _ClaudeLogState] = {}
+_claude_log_states_lock = threading.Lock()
+
+
 class MCPTool(BaseModel):
     """Represents an MCP tool"""
 
@@ -188,6 +339,13 @@ class GradioMCPServer:
         self.app_path = app_path or Path("app.py")
         self.config = self._load_config()
         self.process: Optional[subprocess.Popen] = None
+        self.port: Optional[int] = None
+        self.ready_seconds: Optional[float] = None
+
+    @property
+    def metrics_key(self) -> str:
+        """Key of this server in the metrics sampler"""
+        return f"server:{self.app_path.resolve()}"
 
     def _load_config(self) -> Dict[str, Any]:
         """Load server configuration"""
@@ -258,8 +416,17 @@ class GradioMCPServer:
         return gr.TabbedInterface(interfaces, tab_names)
 
     def start(self, port: int = 7860, reload: bool = False, public: bool = False):
-        """Start the Gradio MCP server"""
-        cmd = [sys.executable, str(self.app_path)]
+        """Start the Gradio MCP server
+
+        ``port`` is a preference: if another server already holds it, the next
+        free port is used instead. The chosen port is available as ``self.port``.
+        """
+        from .port_allocator import get_port_allocator
+
+        allocator = get_port_allocator()
+        port = allocator.reserve(preferred=port, label=str(self.app_path))
+        self.port = port
+
         env = os.environ.copy()
 
         # Set Gradio environment variables
@@ -273,24 +440,46 @@ class GradioMCPServer:
         if public:
             env["GRADIO_SHARE"] = "true"
 
-        # Start process in background with suppressed output
-        self.process = subprocess.Popen(
-            cmd,
-            env=env,
-            cwd=str(self.app_path.parent),
-            stdout=subprocess.DEVNULL,  # Suppress stdout
-            stderr=subprocess.DEVNULL,  # Suppress stderr
-            stdin=subprocess.DEVNULL,  # No input
-            creationflags=(
-                subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
-            ),  # Hide window on Windows
-        )
+        # Start process in background with suppressed output, forked from the
+        # warm pre-fork zygote when it is running
+        try:
+            self.process = spawn_app(
+                self.app_path,
+                env=env,
+                cwd=self.app_path.parent,
+                stdout=subprocess.DEVNULL,  # Suppress stdout
+                stderr=subprocess.DEVNULL,  # Suppress stderr
+                creationflags=(
+                    subprocess.CREATE_NO_WINDOW if sys.platform == "win32" else 0
+                ),  # Hide window on Windows
+            )
+        except Exception:
+            allocator.release(port)
+            raise
+
+        # The port now lives as long as the server process
+        allocator.assign(port, self.process.pid)
+        get_metrics_sampler().track(self.metrics_key, self.process.pid)
 
         # Save process info
         self._save_process_info(port)
 
         return self.process
 
+    def wait_until_ready(self, timeout: float = DEFAULT_READY_TIMEOUT) -> ReadinessResult:
+        """Block until the started server answers HTTP on its port
+
+        Fails early if the process exits. On success the time to ready is kept
+        in ``self.ready_seconds``.
+        """
+        if self.process is None or self.port is None:
+            return ReadinessResult(False, 0.0, "server has not been started", 0)
+
+        result = wait_until_ready(self.port, process=self.process, timeout=timeout)
+        if result.ready:
+            self.ready_seconds = result.elapsed
+        return result
+
     def stop(self):
         """Stop the Gradio MCP server"""
         if self.process:
@@ -298,56 +487,135 @@ class GradioMCPServer:
             self.process.wait()
             self.process = None
             self._remove_process_info()
+            get_metrics_sampler().untrack(self.metrics_key)
+            if self.port is not None:
+                from .port_allocator import get_port_allocator
+
+                get_port_allocator().release(self.port)
 
     def _save_process_info(self, port: int):
-        """Save process information for management"""
+        """Save process information for management
+
+        The record is written next to the app (``.mcp_server.json``) and to the
+        central run registry that ``find_running_servers`` reads.
+        """
+        info = self.register_server(self.app_path, self.process.pid, port)
+
+        info_path = self.app_path.parent / ".mcp_server.json"
+        with open(info_path, "w") as f:
+            json.dump(info, f)
+
+    @staticmethod
+    def register_server(app_path: Path, pid: int, port: int, **extra: Any) -> Dict[str, Any]:
+        """Write the run registry record for an app served by process ``pid``
+
+        Returns:
+            The record that was written
+        """
         info = {
-            "pid": self.process.pid,
+            "pid": pid,
             "port": port,
             "started": datetime.now().isoformat(),
-            "app_path": str(self.app_path),
+            "app_path": str(app_path),
+            **extra,
         }
+        if HAS_PSUTIL:
+            try:
+                # Lets liveness checks tell our process from a recycled PID
+                info["create_time"] = psutil.Process(pid).create_time()
+            except psutil.Error:
+                pass
 
-        info_path = self.app_path.parent / ".mcp_server.json"
-        with open(info_path, "w") as f:
-            json.dump(info, f)
+        registry_file = GradioMCPServer._registry_file(app_path)
+        registry_file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write(registry_file, json.dumps(info).encode("utf-8"))
+        return info
 
     def _remove_process_info(self):
         """Remove process information file"""
         info_path = self.app_path.parent / ".mcp_server.json"
         if info_path.exists():
             info_path.unlink()
+        self._registry_file(self.app_path).unlink(missing_ok=True)
+
+    @staticmethod
+    def run_registry_dir() -> Path:
+        """Directory holding one record per started server"""
+        from .config_manager import RUN_REGISTRY_DIRNAME, get_config_dir
+
+        return get_config_dir() / RUN_REGISTRY_DIRNAME
+
+    @staticmethod
+    def _registry_file(app_path: Path) -> Path:
+        """Registry record path for an app, keyed by its absolute path"""
+        key = hashlib.sha1(str(Path(app_path).resolve()).encode("utf-8")).hexdigest()[:16]
+        return GradioMCPServer.run_registry_dir() / f"{key}.json"
+
+    @staticmethod
+    def _live_pids(records: List[Dict[str, Any]]) -> set:
+        """Return the PIDs from ``records`` whose processes are still running"""
+        if HAS_PSUTIL:
+            # One pass over the process table instead of a probe per record
+            existing = set(psutil.pids())
+            alive = set()
+            for info in records:
+                pid = info.get("pid")
+                if pid not in existing:
+                    continue
+                create_time = info.get("create_time")
+                if create_time is not None:
+                    try:
+                        if abs(psutil.Process(pid).create_time() - create_time) > 1.0:
+                            continue
+                    except psutil.Error:
+                        continue
+                alive.add(pid)
+            return alive
+
+        alive = set()
+        for info in records:
+            try:
+                os.kill(info["pid"], 0)
+                alive.add(info["pid"])
+            except (OSError, KeyError, TypeError):
+                continue
+        return alive
 
     @staticmethod
     def find_running_servers() -> List[Dict[str, Any]]:
         """Find all running Gradio MCP servers"""
         servers = []
 
-        # Look for .mcp_server.json files
-        for info_file in Path(".").rglob(".mcp_server.json"):
-            try:
-                with open(info_file) as f:
-                    info = json.load(f)
-
-                # Check if process is still running
-                try:
-                    os.kill(info["pid"], 0)
-                    info["running"] = True
-                except OSError:
-                    info["running"] = False
+        registry_dir = GradioMCPServer.run_registry_dir()
+        if not registry_dir.is_dir():
+            return servers
 
-                servers.append(info)
+        for record in registry_dir.glob("*.json"):
+            try:
+                with open(record) as f:
+                    servers.append(json.load(f))
             except Exception:
                 continue
 
+        alive = GradioMCPServer._live_pids(servers)
+        for info in servers:
+            info["running"] = info.get("pid") in alive
+
         return servers
 
     @staticmethod
-    def find_claude_desktop_servers() -> List[Dict[str, Any]]:
-        """Find MCP servers managed by Claude Desktop"""
-        servers = []
+    def deregister_server(app_path: Path) -> None:
+        """Drop the run registry record for an app, e.g. after killing it"""
+        GradioMCPServer._registry_file(app_path).unlink(missing_ok=True)
 
-        # Path to Claude Desktop configuration and logs
+    @staticmethod
+    def find_claude_desktop_paths() -> Tuple[Optional[Path], Optional[Path]]:
+        """Locate the Claude Desktop config file and logs directory
+
+        Returns:
+            ``(config_path, logs_path)``, or ``(None, None)`` when Claude
+            Desktop does not appear to be installed.
+        """
         # Handle both Windows and WSL paths
         if os.name == "nt":
             # Native Windows
@@ -377,11 +645,23 @@ class GradioMCPServer:
                         claude_logs_path = logs_path
                         break
 
-            # If still not found, return empty list
+            # If still not found, there is nothing to report
             if not claude_config_path:
-                return servers
+                return None, None
 
         if not claude_config_path.exists() or not claude_logs_path.exists():
+            return None, None
+
+        return claude_config_path, claude_logs_path
+
+    @staticmethod
+    def find_claude_desktop_servers() -> List[Dict[str, Any]]:
+        """Find MCP servers managed by Claude Desktop"""
+        servers = []
+
+        # Path to Claude Desktop configuration and logs
+        claude_config_path, claude_logs_path = GradioMCPServer.find_claude_desktop_paths()
+        if not claude_config_path:
             return servers
 
         try:
@@ -419,97 +699,24 @@ class GradioMCPServer:
 
     @staticmethod
     def _parse_claude_server_log(log_file: Path) -> Dict[str, Any]:
-        """Parse Claude Desktop server log to determine status"""
+        """Parse Claude Desktop server log to determine status
+
+        Parsing is incremental: the derived state and byte offset are kept per
+        file, so later calls only read what was appended since the last one.
+        """
         status = {"running": False, "last_seen": None, "errors": [], "status_message": "Stopped"}
 
         try:
-            # Read the last 200 lines of the log file for recent status
-            with open(log_file, encoding="utf-8") as f:
-                lines = f.readlines()
-                recent_lines = lines[-200:] if len(lines) > 200 else lines
-
-            # Track timestamped events to determine current state
-            last_server_started = None
-            last_transport_closed = None
-            last_message_activity = None
-            last_activity = None
-            errors = []
-
-            for line in recent_lines:
-                line = line.strip()
-                if not line:
-                    continue
-
-                # Parse timestamp and message
-                if line.startswith("202"):  # Handles 2024, 2025, etc.
-                    parts = line.split(" ", 3)
-                    if len(parts) >= 4:
-                        timestamp_str = parts[0]
-                        level = parts[2] if parts[2].startswith("[") else None
-                        message = parts[3] if len(parts) > 3 else ""
-
-                        # Parse timestamp
-                        try:
-                            from datetime import datetime
-
-                            timestamp = datetime.fromisoformat(timestamp_str.replace("Z", "+00:00"))
-                            last_activity = timestamp
-                        except:
-                            timestamp = None
-
-                        # Track important events with timestamps
-                        if timestamp:
-                            if "Server started and connected successfully" in message:
-                                last_server_started = timestamp
-                            elif (
-                                "Client transport closed" in message
-                                or "Server transport closed" in message
-                            ):
-                                last_transport_closed = timestamp
-                            elif (
-                                "Message from server:" in message or "Message to server:" in message
-                            ):
-                                # Any message activity indicates the server is running
-                                last_message_activity = timestamp
-                            elif (
-                                "Server disconnected" in message or "error" in level.lower()
-                                if level
-                                else False
-                            ):
-                                errors.append(message)
-
-            # Determine current status based on the most recent events
-            if last_message_activity and last_activity:
-                # If we've seen message activity in the last 5 minutes, server is running
-                from datetime import datetime, timedelta, timezone
-
-                now = datetime.now(timezone.utc)
-                if (now - last_message_activity) < timedelta(minutes=5):
-                    status["running"] = True
-                    status["status_message"] = "Running"
-                else:
-                    status["running"] = False
-                    status["status_message"] = "Inactive"
-            elif last_server_started and last_transport_closed:
-                # Compare timestamps to see which event was more recent
-                if last_server_started > last_transport_closed:
-                    status["running"] = True
-                    status["status_message"] = "Running"
-                else:
-                    status["running"] = False
-                    status["status_message"] = "Disconnected"
-            elif last_server_started:
-                status["running"] = True
-                status["status_message"] = "Running"
-            elif errors:
-                status["running"] = False
-                status["status_message"] = "Error"
-            else:
-                status["running"] = False
-                status["status_message"] = "Stopped"
+            key = str(log_file)
+            with _claude_log_states_lock:
+                state = _claude_log_states.get(key)
+                if state is None:
+                    state = _ClaudeLogState()
+                    _claude_log_states[key] = state
 
-            status["last_seen"] = last_activity.isoformat() if last_activity else None
-            status["errors"] = errors[-5:]  # Keep last 5 errors
+            with state.lock:
+                state.refresh(log_file)
+                status.update(state.status())
 
         except Exception as e:
             status["errors"] = [f"Failed to parse log: {str(e)}"]
@@ -520,9 +727,9 @@ class GradioMCPServer:
     @staticmethod
     def create_template_server(template: str, name: str, directory: Path) -> Dict[str, Any]:
         """Create a new server from a template"""
-        from .registry import ServerRegistry
+        from .registry import get_registry
 
-        registry = ServerRegistry()
+        registry = get_registry()
         template_data = registry.get_template(template)
 
         if not template_data:
@@ -622,6 +829,7 @@ class GradioMCPServer:
                     pass
             except (OSError, json.JSONDecodeError):
                 pass
+            GradioMCPServer.deregister_server(directory / "app.py")
 
         # Get list of files to remove
         files_to_remove = list(directory.rglob("*"))
@@ -3,9 +3,12 @@ Unified Gradio MCP Playground Dashboard
 Combines the main dashboard with agent builder functionality
 """
 
+import asyncio
 import logging
 import os
 import sys
+import threading
+import time
 import warnings
 from pathlib import Path
 from typing import Tuple
@@ -52,7 +55,27 @@ except ImportError:
     HAS_CONFIG_MANAGER = False
 
 try:
-    from .registry import ServerRegistry
+    from .change_bus import (
+        TOPIC_AGENTS,
+        TOPIC_HEALTH,
+        TOPIC_SERVERS,
+        get_change_bus,
+        watch_server_sources,
+    )
+
+    HAS_CHANGE_BUS = True
+except ImportError:
+    HAS_CHANGE_BUS = False
+
+try:
+    from .health_monitor import HealthReport, annotate_servers, format_health, get_health_monitor
+
+    HAS_HEALTH_MONITOR = True
+except ImportError:
+    HAS_HEALTH_MONITOR = False
+
+try:
+    from .registry import get_registry
 
     HAS_REGISTRY = True
 except ImportError:
@@ -132,6 +155,11 @@ if not HAS_CONTROL_PANEL:
         HAS_CONTROL_PANEL = False
 
 
+# Re-render pushed views at least this often to catch changes no watcher sees
+# (e.g. a process that exited on its own)
+CHANGE_RESYNC_INTERVAL = 30.0
+
+
 def _get_connected_servers_info(coding_agent):
     """Get information about connected MCP servers"""
     if not coding_agent or not hasattr(coding_agent, "_mcp_servers"):
@@ -155,7 +183,22 @@ def create_unified_dashboard():
         raise ImportError("Gradio is required for web dashboard functionality")
 
     config_manager = ConfigManager()
-    registry = ServerRegistry()
+    registry = get_registry()
+
+    # File watchers feed the change bus; dashboards re-render only on changes
+    change_bus = get_change_bus() if HAS_CHANGE_BUS else None
+    if change_bus and HAS_CONFIG_MANAGER:
+        try:
+            watch_server_sources(change_bus, config_manager)
+        except Exception as e:
+            print(f"Warning: Could not watch server sources: {e}")
+
+    # Probes running servers over HTTP/MCP; status changes arrive on the bus
+    health_monitor = get_health_monitor() if HAS_HEALTH_MONITOR else None
+
+    # Bus version the shared server catalog was last invalidated for, so one
+    # change triggers one rebuild no matter how many sessions are open
+    catalog_sync = {"version": 0, "lock": threading.Lock()}
 
     # Initialize server manager if available
     if HAS_SERVER_MANAGER:
@@ -1294,13 +1337,16 @@ Ready to use this template? Click the button above or use the Quick Create tab t
 
                                 # Refresh deployed agents list
                                 def refresh_deployed_agents():
-                                    """Get list of deployed agents with their ports"""
+                                    """Get list of deployed agents, valued by their URL"""
                                     if control_panel and control_panel.agent_runner:
-                                        agents = control_panel.agent_runner.list_agents()
+                                        runner = control_panel.agent_runner
                                         choices = []
-                                        for name, info in agents.items():
-                                            if info.get("status") == "running" and info.get("port"):
-                                                choices.append(f"{name} (port {info['port']})")
+                                        for name, info in runner.list_agents().items():
+                                            port = info.get("port")
+                                            if info.get("status") == "running" and port:
+                                                path = info.get("url_path") or ""
+                                                label = f"{name} (port {port}{path})"
+                                                choices.append((label, runner.agent_url(info)))
                                         if choices:
                                             return gr.update(choices=choices, value=None)
                                         else:
@@ -1318,16 +1364,12 @@ Ready to use this template? Click the button above or use the Quick Create tab t
                                     ):
                                         return '<div style="text-align: center; padding: 50px; color: #666;">Select a deployed agent to view it here</div>'
 
-                                    # Extract port from selection
-                                    import re
-
-                                    port_match = re.search(r"\(port (\d+)\)", agent_selection)
-                                    if port_match:
-                                        port = port_match.group(1)
+                                    # The selection's value is the agent's URL, mount path included
+                                    if agent_selection.startswith("http"):
                                         # Create iframe HTML
                                         iframe_html = f"""
                                         <iframe 
-                                            src="http://localhost:{port}" 
+                                            src="{agent_selection}" 
                                             width="100%" 
                                             height="600px" 
                                             style="border: 1px solid #ddd; border-radius: 8px;"
@@ -1335,13 +1377,50 @@ Ready to use this template? Click the button above or use the Quick Create tab t
                                         </iframe>
                                         """
                                         return iframe_html
-                                    return '<div style="text-align: center; padding: 50px; color: #f00;">Could not determine agent port</div>'
+                                    return '<div style="text-align: center; padding: 50px; color: #f00;">Could not determine agent URL</div>'
 
-                                # Auto-refresh deployed agents dropdown
-                                deployed_agents_timer = gr.Timer(10.0)
-                                deployed_agents_timer.tick(
-                                    fn=refresh_deployed_agents, outputs=[deployed_agent_dropdown]
-                                )
+                                async def push_agent_changes():
+                                    """Load-time stream: update the agent list when agents change
+
+                                    Waits on the change bus between updates, so an idle
+                                    session holds no thread or timer.
+                                    """
+                                    seen = {TOPIC_AGENTS: change_bus.version(TOPIC_AGENTS)}
+                                    choices = None
+                                    while True:
+                                        update = await asyncio.to_thread(refresh_deployed_agents)
+                                        if update.get("choices") != choices:
+                                            choices = update.get("choices")
+                                            yield update
+                                        else:
+                                            # Nothing to send, but lets the queue notice
+                                            # closed sessions
+                                            yield gr.update()
+                                        seen = await change_bus.wait_async(
+                                            [TOPIC_AGENTS], seen, timeout=CHANGE_RESYNC_INTERVAL
+                                        )
+
+                                if (
+                                    change_bus
+                                    and control_panel.agent_runner
+                                    and change_bus.watch(
+                                        control_panel.agent_runner.workspace_dir, TOPIC_AGENTS
+                                    )
+                                ):
+                                    # Pushed from the change bus (agent runner + workspace)
+                                    dashboard.load(
+                                        push_agent_changes,
+                                        outputs=[deployed_agent_dropdown],
+                                        show_progress="hidden",
+                                        concurrency_limit=None,
+                                    )
+                                else:
+                                    # Auto-refresh deployed agents dropdown
+                                    deployed_agents_timer = gr.Timer(10.0)
+                                    deployed_agents_timer.tick(
+                                        fn=refresh_deployed_agents,
+                                        outputs=[deployed_agent_dropdown],
+                                    )
 
                                 # Open agent button handler
                                 open_agent_btn.click(
@@ -2234,21 +2313,29 @@ Ready to use this template? Click the button above or use the Quick Create tab t
             except Exception as e:
                 return f"❌ Error creating server: {str(e)}"
 
-        def refresh_servers():
-            """Refresh the servers list"""
-            if not HAS_CONFIG_MANAGER:
-                return [], gr.update(choices=[], value=None)
+        def _server_rows(servers=None):
+            """Build dataframe rows and dropdown choices from the server catalog
 
-            servers = config_manager.list_servers()
+            Args:
+                servers: A previous ``list_servers()`` result to re-annotate instead
+                    of reading the catalog again.
+            """
+            if servers is None:
+                servers = config_manager.list_servers()
+            if health_monitor:
+                annotate_servers(servers, health_monitor)
 
             # Format for dataframe
             data = []
             choices = []
             for server in servers:
+                status = "Running" if server.get("running") else "Stopped"
+                if server.get("health"):
+                    status = f"Running · {format_health(HealthReport(**server['health']))}"
                 data.append(
                     [
                         server.get("name", ""),
-                        "Running" if server.get("running") else "Stopped",
+                        status,
                         server.get("source", "local"),
                         server.get("command", ""),
                         server.get("last_seen", ""),
@@ -2257,8 +2344,57 @@ Ready to use this template? Click the button above or use the Quick Create tab t
                 )
                 choices.append(server.get("name", ""))
 
+            return data, choices
+
+        def refresh_servers():
+            """Refresh the servers list"""
+            if not HAS_CONFIG_MANAGER:
+                return [], gr.update(choices=[], value=None)
+
+            data, choices = _server_rows()
             return data, gr.update(choices=choices, value=None)
 
+        def _load_servers(version):
+            """Read the server catalog as of change bus ``version``"""
+            with catalog_sync["lock"]:
+                if catalog_sync["version"] != version:
+                    # The catalog's own watcher may not have fired yet
+                    config_manager.invalidate_servers()
+                    catalog_sync["version"] = version
+            return config_manager.list_servers()
+
+        async def push_server_changes():
+            """Load-time stream: update the servers view when servers or health change
+
+            Waits on the change bus between updates, so an idle session holds no
+            thread or timer. Health-only changes re-annotate the last catalog
+            snapshot, and the table and choices are only sent when they differ.
+            """
+            topics = [TOPIC_SERVERS, TOPIC_HEALTH]
+            seen = {topic: change_bus.version(topic) for topic in topics}
+            servers = rows = choices = None
+            while True:
+                versions = await change_bus.wait_async(
+                    topics, seen, timeout=CHANGE_RESYNC_INTERVAL
+                )
+                # Timeouts resync too, for changes no watcher sees (e.g. a
+                # process that exited on its own)
+                if servers is None or versions == seen or (
+                    versions[TOPIC_SERVERS] != seen[TOPIC_SERVERS]
+                ):
+                    servers = await asyncio.to_thread(_load_servers, versions[TOPIC_SERVERS])
+                seen = versions
+
+                data, new_choices = _server_rows(servers)
+                table_update = gr.update(value=data) if data != rows else gr.update()
+                # Keep the user's selection; only the available choices move
+                choices_update = (
+                    gr.update(choices=new_choices) if new_choices != choices else gr.update()
+                )
+                rows, choices = data, new_choices
+                # Sent even when empty so the queue notices closed sessions
+                yield table_update, choices_update
+
         def show_template_info(template_name):
             """Show template information"""
             if not HAS_REGISTRY:
@@ -3152,6 +3288,16 @@ To complete installation, run the command above or use the MCP Connections tab t
             # Add another load event to refresh servers
             dashboard.load(refresh_servers, outputs=[servers_list, server_dropdown])
 
+            # Push later changes from the file watchers and health probes instead
+            # of re-running discovery
+            if change_bus and (change_bus.is_watching or health_monitor):
+                dashboard.load(
+                    push_server_changes,
+                    outputs=[servers_list, server_dropdown],
+                    show_progress="hidden",
+                    concurrency_limit=None,
+                )
+
         # Initialize registry with all servers on load
         if "registry_results_df" in locals() and HAS_REGISTRY:
             # Show all servers when the page loads
@@ -4,12 +4,15 @@ Utility functions for the Gradio MCP Playground.
 """
 
 import hashlib
+import os
 import socket
 import subprocess
 import sys
+import tempfile
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 # Optional imports
 try:
@@ -19,19 +22,109 @@ try:
 except ImportError:
     HAS_PSUTIL = False
 
+# Advisory file locking is platform specific
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:
+    HAS_FCNTL = False
+
+try:
+    import msvcrt
+
+    HAS_MSVCRT = True
+except ImportError:
+    HAS_MSVCRT = False
+
+
+@contextmanager
+def file_lock(lock_path: Union[str, Path], shared: bool = False) -> Iterator[None]:
+    """Hold an advisory lock on ``lock_path`` (shared for readers, exclusive for writers)
+
+    Locks are taken on a fresh file handle, so they also serialize threads of the
+    same process. Not reentrant: do not nest locks on the same path.
+    """
+    with open(lock_path, "a+b") as handle:
+        if HAS_FCNTL:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        elif HAS_MSVCRT:
+            # msvcrt only offers exclusive byte-range locks
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if HAS_FCNTL:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+            elif HAS_MSVCRT:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def atomic_write(target: Union[str, Path], payload: bytes, mode: Optional[int] = None) -> None:
+    """Write bytes to a temp file next to ``target`` and atomically move it into place
+
+    Readers see either the previous or the new contents, never a partial write.
+    """
+    target = Path(target)
+    fd, tmp_path = tempfile.mkstemp(
+        dir=str(target.parent), prefix=f".{target.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None and os.name != "nt":
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def tail_lines(
+    path: Union[str, Path], count: int, encoding: str = "utf-8", block_size: int = 64 * 1024
+) -> List[str]:
+    """Return the last ``count`` lines of a file without reading the whole file
+
+    Blocks are read backwards from the end until enough newlines are seen, so
+    the cost depends on ``count`` rather than on the file size.
+    """
+    if count <= 0:
+        return []
+
+    with open(path, "rb") as f:
+        position = f.seek(0, os.SEEK_END)
+        chunks = []
+        newlines = 0
+        # One extra newline guarantees the first kept line is complete
+        while position > 0 and newlines <= count:
+            read_size = min(block_size, position)
+            position -= read_size
+            f.seek(position)
+            chunk = f.read(read_size)
+            chunks.append(chunk)
+            newlines += chunk.count(b"\n")
+
+    data = b"".join(reversed(chunks)).replace(b"\r\n", b"\n")
+    lines = data.decode(encoding, errors="replace").splitlines(keepends=True)
+    return lines[-count:]
+
 
 def find_free_port(start_port: int = 7860, max_attempts: int = 100) -> int:
-    """Find a free port starting from the given port"""
-    for i in range(max_attempts):
-        port = start_port + i
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            try:
-                s.bind(("", port))
-                return port
-            except OSError:
-                continue
-
-    raise RuntimeError(f"Could not find free port after {max_attempts} attempts")
+    """Find a free port starting from the given port
+
+    The port is reserved through the shared port allocator for the lifetime of
+    the calling process, so concurrent callers never get the same port.
+    """
+    from .port_allocator import get_port_allocator
+
+    return get_port_allocator().reserve(start=start_port, count=max_attempts)
 
 
 def is_port_in_use(port: int, host: str = "127.0.0.1") -> bool:
@@ -21,7 +21,8 @@ except ImportError:
 
 # Always available imports
 from .config_manager import ConfigManager
-from .registry import ServerRegistry
+from .registry import get_registry
+from .utils import tail_lines
 
 # Optional imports that depend on other modules
 try:
@@ -38,6 +39,13 @@ try:
 except ImportError:
     HAS_CLIENT_MANAGER = False
 
+try:
+    from .health_monitor import HealthReport, annotate_servers, format_health, get_health_monitor
+
+    HAS_HEALTH_MONITOR = True
+except ImportError:
+    HAS_HEALTH_MONITOR = False
+
 try:
     from .coding_agent import CodingAgent
 
@@ -270,7 +278,8 @@ def create_dashboard():
         raise ImportError("Gradio is required for web dashboard functionality")
 
     config_manager = ConfigManager()
-    registry = ServerRegistry()
+    registry = get_registry()
+    health_monitor = get_health_monitor() if HAS_HEALTH_MONITOR else None
     
     # Check if caching is disabled via environment variable
     use_cache = os.environ.get('GMP_DISABLE_CACHE', '').lower() not in ['1', 'true', 'yes']
@@ -1872,6 +1881,8 @@ def create_dashboard():
         def refresh_servers():
             """Refresh the servers list"""
             servers = config_manager.list_servers()
+            if health_monitor:
+                annotate_servers(servers, health_monitor)
             data = []
             for server in servers:
                 # Determine status with appropriate emoji
@@ -1879,6 +1890,9 @@ def create_dashboard():
                 if server.get("running"):
                     if server.get("source") == "claude_desktop":
                         status_display = f"🟢 {status}"
+                    elif server.get("health"):
+                        # Probed over HTTP/MCP, so a wedged server is not "Running"
+                        status_display = format_health(HealthReport(**server["health"]))
                     else:
                         status_display = "🟢 Running"
                 elif server.get("errors"):
@@ -2114,11 +2128,8 @@ def create_dashboard():
 
                 if log_file.exists():
                     try:
-                        with open(log_file, encoding="utf-8") as f:
-                            lines = f.readlines()
-                            # Show last 50 lines
-                            recent_lines = lines[-50:] if len(lines) > 50 else lines
-                            logs_content = "".join(recent_lines)
+                        # Show last 50 lines
+                        logs_content = "".join(tail_lines(log_file, 50))
                     except Exception as e:
                         logs_content = f"Error reading log file: {str(e)}"
                 else:
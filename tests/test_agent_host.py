@@ -0,0 +1,82 @@
+"""Tests for the shared agent host"""
+
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+_spec = importlib.util.spec_from_file_location(
+    "agent_host", Path(__file__).resolve().parent.parent / "agent" / "core" / "agent_host.py"
+)
+agent_host = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(agent_host)
+
+AGENT = """
+import gradio as gr
+calls = []
+
+def echo(text):
+    calls.append(text)
+    return f"{NAME}:{text}:{len(calls)}"
+
+demo = gr.Interface(echo, "text", "text", api_name="echo")
+if __name__ == "__main__":
+    demo.launch(server_port=1)
+    raise RuntimeError("launch() should not return in the shared host")
+"""
+
+
+@pytest.fixture
+def client():
+    with TestClient(agent_host.create_app()) as client:
+        yield client
+
+
+def _write_agent(tmp_path, name):
+    path = tmp_path / f"{name}.py"
+    path.write_text(f"NAME = {name!r}\n" + AGENT)
+    return path
+
+
+class TestAgentHost:
+    def test_agents_are_mounted_with_separate_globals(self, client, tmp_path):
+        for name in ("one", "two"):
+            response = client.post(
+                "/_host/agents", json={"name": name, "file": str(_write_agent(tmp_path, name))}
+            )
+            assert response.json() == {"name": name, "path": f"/agents/{name}"}
+
+        assert sorted(client.get("/_host/health").json()["agents"]) == ["one", "two"]
+        assert client.get("/agents/one/").status_code == 200
+        assert client.get("/agents/two/config").json()["components"]
+
+        host = client.app.state.host
+        one = host._agents["one"]["blocks"].fns
+        two = host._agents["two"]["blocks"].fns
+        one_fn = next(iter(one.values())).fn
+        two_fn = next(iter(two.values())).fn
+        assert one_fn("a") == "one:a:1"
+        assert one_fn("b") == "one:b:2"
+        assert two_fn("a") == "two:a:1"
+
+    def test_remove_agent(self, client, tmp_path):
+        agent_file = _write_agent(tmp_path, "one")
+        client.post("/_host/agents", json={"name": "one", "file": str(agent_file)})
+
+        assert client.delete("/_host/agents/one").json()["removed"] is True
+        assert client.get("/agents/one/").status_code == 404
+        assert client.delete("/_host/agents/one").status_code == 404
+
+    def test_script_errors_are_reported(self, client, tmp_path):
+        broken = tmp_path / "broken.py"
+        broken.write_text("raise ValueError('bad agent')\n")
+
+        response = client.post("/_host/agents", json={"name": "broken", "file": str(broken)})
+
+        assert response.status_code == 400
+        assert "bad agent" in response.json()["detail"]
+        assert client.get("/_host/health").json()["agents"] == {}
@@ -1,6 +1,9 @@
 """Tests for the cache manager"""
 
 import json
+import os
+import shutil
+import sys
 import time
 import tempfile
 from pathlib import Path
@@ -8,7 +11,7 @@ from datetime import datetime, timedelta
 
 import pytest
 
-from gradio_mcp_playground.cache_manager import CacheManager
+from gradio_mcp_playground.cache_manager import CACHE_FORMAT_VERSION, CacheManager
 
 
 class TestCacheManager:
@@ -184,5 +187,374 @@ class TestCacheManager:
         assert "secret456" not in str(metadata)
 
 
+class TestCacheFileFormat:
+    """Test cases for the on-disk cache entry format"""
+
+    @pytest.fixture
+    def cache_manager(self):
+        """Create a CacheManager instance with temp directory"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield CacheManager(cache_dir=Path(tmpdir))
+
+    def test_server_cache_is_versioned_json(self, cache_manager):
+        """Server entries are compact JSON with a format version, not pickles"""
+        config = {"command": "npx", "args": ["-y", "@test/server"]}
+        data = {"tools": {"echo": {"name": "echo"}}, "server_info": {"version": "1.0"}}
+
+        cache_manager.set_server_cache("test-server", config, data)
+
+        files = list(cache_manager.servers_cache_dir.glob("*"))
+        assert len(files) == 1
+        assert files[0].suffix == ".json"
+        entry = json.loads(files[0].read_text())
+        assert entry["version"] == CACHE_FORMAT_VERSION
+        assert cache_manager.get_server_cache("test-server", config) == data
+
+    def test_write_leaves_no_temp_files(self, cache_manager):
+        """Atomic writes replace the target and clean up after themselves"""
+        cache_manager.set_tools_cache("server", [{"name": "a"}])
+        cache_manager.set_tools_cache("server", [{"name": "b"}])
+
+        assert [f.name for f in cache_manager.tools_cache_dir.iterdir()] == ["server_tools.json"]
+        assert cache_manager.get_tools_cache("server") == [{"name": "b"}]
+
+    def test_failed_write_keeps_previous_entry(self, cache_manager):
+        """A write that cannot be serialized leaves the old entry intact"""
+        cache_manager.set_tools_cache("server", [{"name": "a"}])
+        cache_manager.set_tools_cache("server", [{"name": object()}])
+
+        assert cache_manager.get_tools_cache("server") == [{"name": "a"}]
+        assert len(list(cache_manager.tools_cache_dir.iterdir())) == 1
+
+    def test_corrupt_or_outdated_entries_are_misses(self, cache_manager):
+        """Truncated files and entries from other format versions are ignored"""
+        cache_file = cache_manager.tools_cache_dir / "server_tools.json"
+
+        cache_file.write_text('{"version": 2, "data": [')
+        assert cache_manager.get_tools_cache("server") is None
+
+        cache_file.write_text(json.dumps([{"name": "legacy"}], indent=2))
+        assert cache_manager.get_tools_cache("server") is None
+
+        cache_file.write_text(json.dumps({"version": CACHE_FORMAT_VERSION + 1, "data": []}))
+        assert cache_manager.get_tools_cache("server") is None
+
+
+class TestServerFingerprint:
+    """Test cases for content-based server cache invalidation"""
+
+    @pytest.fixture
+    def cache_manager(self):
+        """Create a CacheManager instance with temp directory"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield CacheManager(cache_dir=Path(tmpdir))
+
+    @pytest.fixture
+    def script(self, tmp_path):
+        """Create a server script whose mtime feeds the fingerprint"""
+        path = tmp_path / "server.js"
+        path.write_text("// server")
+        return path
+
+    def test_hit_survives_ttl(self, cache_manager, script):
+        """Entries stay valid past the TTL while the fingerprint is unchanged"""
+        config = {"command": "node", "args": [str(script)], "env": {"API_KEY": "x"}}
+        cache_manager.set_server_cache("srv", config, {"tools": {}})
+
+        entry_file = next(cache_manager.servers_cache_dir.glob("srv_*.json"))
+        old = time.time() - cache_manager.DEFAULT_TTL * 2
+        os.utime(entry_file, (old, old))
+
+        assert cache_manager.get_server_cache("srv", config) == {"tools": {}}
+
+    def test_env_names_change_fingerprint(self, cache_manager, script):
+        """Adding an env var invalidates, changing its value does not"""
+        config = {"command": "node", "args": [str(script)], "env": {"API_KEY": "x"}}
+        cache_manager.set_server_cache("srv", config, {"tools": {}})
+
+        assert cache_manager.get_server_cache("srv", {**config, "env": {"API_KEY": "y"}})
+        assert cache_manager.get_server_cache(
+            "srv", {**config, "env": {"API_KEY": "x", "ROOT": "/"}}
+        ) is None
+
+    def test_script_mtime_changes_fingerprint(self, cache_manager, script):
+        """Reinstalling/updating the server script invalidates the entry"""
+        config = {"command": "node", "args": [str(script)]}
+        cache_manager.set_server_cache("srv", config, {"tools": {}})
+
+        newer = time.time() + 10
+        os.utime(script, (newer, newer))
+
+        assert cache_manager.get_server_cache("srv", config) is None
+
+    def test_server_version_mismatch_is_miss(self, cache_manager, script):
+        """A different serverInfo.version from a live server invalidates the entry"""
+        config = {"command": "node", "args": [str(script)]}
+        data = {"tools": {}, "server_info": {"name": "srv", "version": "1.0.0"}}
+        cache_manager.set_server_cache("srv", config, data)
+
+        assert cache_manager.get_server_cache("srv", config, server_version="1.0.0") == data
+        assert cache_manager.get_server_cache("srv", config, server_version="1.1.0") is None
+
+    def test_tool_definitions_are_not_masked(self, cache_manager, script):
+        """Tools named like secrets and their schemas come back unchanged"""
+        config = {"command": "node", "args": [str(script)]}
+        tools = {
+            "search_keywords": {
+                "name": "search_keywords",
+                "inputSchema": {
+                    "type": "object",
+                    "properties": {
+                        "api_key": {"type": "string"},
+                        "max_tokens": {"type": "integer"},
+                    },
+                },
+            }
+        }
+        cache_manager.set_server_cache(
+            "srv", config, {"tools": tools, "server_info": {"name": "srv", "token": "t"}}
+        )
+
+        cached = cache_manager.get_server_cache("srv", config)
+        assert cached["tools"] == tools
+        assert cached["server_info"]["token"] == "***MASKED***"
+
+    def test_fingerprint_is_memoized(self, cache_manager, script, monkeypatch):
+        """Repeated lookups re-stat the marker's files instead of scanning PATH"""
+        which_calls = []
+        real_which = shutil.which
+        monkeypatch.setattr(shutil, "which", lambda cmd: which_calls.append(cmd) or real_which(cmd))
+        config = {"command": "node", "args": [str(script)]}
+        cache_manager.set_server_cache("srv", config, {"tools": {}})
+
+        for _ in range(3):
+            assert cache_manager.get_server_cache("srv", config) == {"tools": {}}
+        assert which_calls == ["node"]
+
+        newer = time.time() + 10
+        os.utime(script, (newer, newer))
+        assert cache_manager.get_server_cache("srv", config) is None
+        assert which_calls == ["node", "node"]
+
+    def test_npx_package_version(self, cache_manager, tmp_path, monkeypatch):
+        """The installed npx package version is part of the fingerprint"""
+        monkeypatch.setattr(Path, "home", lambda: tmp_path)
+        package_dir = tmp_path / ".npm" / "_npx" / "abc" / "node_modules" / "@test" / "server"
+        package_json = package_dir / "package.json"
+        package_json.parent.mkdir(parents=True)
+        package_json.write_text(json.dumps({"version": "1.0.0"}))
+
+        config = {"command": "npx", "args": ["-y", "@test/server@latest"]}
+        assert cache_manager._get_installed_package_version("npx", "@test/server@latest") == "1.0.0"
+        cache_manager.set_server_cache("srv", config, {"tools": {}})
+        assert cache_manager.get_server_cache("srv", config) is not None
+
+        package_json.write_text(json.dumps({"version": "1.1.0"}))
+        assert cache_manager.get_server_cache("srv", config) is None
+
+
+class TestL1Cache:
+    """Test cases for the in-process L1 cache"""
+
+    @pytest.fixture
+    def temp_cache_dir(self):
+        """Create a temporary cache directory"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    def test_repeated_lookups_hit_l1(self, temp_cache_dir):
+        """Only the first lookup after a cold start decodes from disk"""
+        writer = CacheManager(cache_dir=temp_cache_dir)
+        writer.set_tools_cache("server", [{"name": "a"}])
+
+        reader = CacheManager(cache_dir=temp_cache_dir)
+        for _ in range(3):
+            assert reader.get_tools_cache("server") == [{"name": "a"}]
+
+        lookups = reader.get_cache_stats()["lookups"]
+        assert lookups["l2_hits"] == 1
+        assert lookups["l1_hits"] == 2
+        assert lookups["l1_hit_ratio"] == pytest.approx(2 / 3)
+
+    def test_revalidates_against_other_writers(self, temp_cache_dir):
+        """A write from another process/instance is seen on the next lookup"""
+        reader = CacheManager(cache_dir=temp_cache_dir)
+        writer = CacheManager(cache_dir=temp_cache_dir)
+
+        writer.set_tools_cache("server", [{"name": "a"}])
+        assert reader.get_tools_cache("server") == [{"name": "a"}]
+
+        writer.set_tools_cache("server", [{"name": "b"}])
+        assert reader.get_tools_cache("server") == [{"name": "b"}]
+
+        writer.clear_cache("tools")
+        assert reader.get_tools_cache("server") is None
+        assert reader.get_cache_stats()["lookups"]["misses"] == 1
+
+    def test_l1_is_size_bounded(self, temp_cache_dir, monkeypatch):
+        """The L1 cache evicts least recently used entries beyond its size"""
+        monkeypatch.setenv("GMP_CACHE_L1_SIZE", "2")
+        cache_manager = CacheManager(cache_dir=temp_cache_dir)
+
+        for name in ["a", "b", "c"]:
+            cache_manager.set_tools_cache(name, [])
+
+        stats = cache_manager.get_cache_stats()
+        assert stats["l1_entries"] == 2
+        assert stats["l1_max_entries"] == 2
+
+
+class TestCacheSizeCap:
+    """Test cases for size accounting and LRU eviction"""
+
+    @pytest.fixture
+    def temp_cache_dir(self):
+        """Create a temporary cache directory"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            yield Path(tmpdir)
+
+    def test_stats_track_sizes_incrementally(self, temp_cache_dir):
+        """Stats come from the index and match what is on disk"""
+        cache_manager = CacheManager(cache_dir=temp_cache_dir)
+        cache_manager.set_tools_cache("a", [{"name": "x"}])
+        cache_manager.set_tools_cache("a", [{"name": "x" * 100}])
+        cache_manager.set_server_cache("srv", {"command": "node", "args": []}, {"tools": {}})
+
+        stats = cache_manager.get_cache_stats()
+        on_disk = sum(
+            f.stat().st_size
+            for d in (cache_manager.servers_cache_dir, cache_manager.tools_cache_dir)
+            for f in d.iterdir()
+        )
+        assert stats["files"] == {"servers": 1, "tools": 1, "configs": 0, "discovery": 0}
+        assert stats["size"] == on_disk
+
+        # Another instance (process) sees the same totals without rescanning
+        assert CacheManager(cache_dir=temp_cache_dir).get_cache_stats()["size"] == on_disk
+
+        cache_manager.clear_cache("tools")
+        stats = cache_manager.get_cache_stats()
+        assert stats["files"]["tools"] == 0
+        assert stats["size"] == next(cache_manager.servers_cache_dir.iterdir()).stat().st_size
+
+    def test_writes_append_to_the_index_journal(self, temp_cache_dir, monkeypatch):
+        """Writes append a record instead of rewriting index.json, until compaction"""
+        monkeypatch.setattr(CacheManager, "INDEX_COMPACT_RECORDS", 5)
+        writer = CacheManager(cache_dir=temp_cache_dir)
+        reader = CacheManager(cache_dir=temp_cache_dir)
+        writer.set_tools_cache("a", [{"name": "a"}])
+        snapshot = writer.index_file.read_bytes()
+        assert reader.get_cache_stats()["files"]["tools"] == 1
+
+        for name in ["b", "c", "d"]:
+            writer.set_tools_cache(name, [{"name": name}])
+        assert writer.index_file.read_bytes() == snapshot
+        assert len(writer.journal_file.read_bytes().splitlines()) == 3
+        assert reader.get_cache_stats()["files"]["tools"] == 4
+
+        for name in ["e", "f", "g"]:
+            writer.set_tools_cache(name, [{"name": name}])
+        assert writer.index_file.read_bytes() != snapshot
+        assert len(writer.journal_file.read_bytes().splitlines()) < 3
+
+        stats = reader.get_cache_stats()
+        assert stats["files"]["tools"] == 7
+        assert stats["size"] == sum(f.stat().st_size for f in writer.tools_cache_dir.iterdir())
+
+    def test_evicts_least_recently_used(self, temp_cache_dir):
+        """Writes beyond the cap evict the entries accessed longest ago"""
+        payload = [{"blob": "x" * 1000}]
+        entry_size = len(json.dumps({"version": CACHE_FORMAT_VERSION, "data": payload},
+                                    separators=(",", ":")))
+        cache_manager = CacheManager(
+            cache_dir=temp_cache_dir, max_size_mb=(entry_size * 3.5) / (1024 * 1024)
+        )
+
+        for name in ["a", "b", "c"]:
+            cache_manager.set_tools_cache(name, payload)
+            time.sleep(0.01)
+
+        # Touch "a" so "b" becomes the least recently used entry
+        assert cache_manager.get_tools_cache("a") == payload
+        cache_manager.set_tools_cache("d", payload)
+
+        assert cache_manager.get_tools_cache("b") is None
+        for name in ["a", "c", "d"]:
+            assert cache_manager.get_tools_cache(name) == payload
+        assert cache_manager.get_cache_stats()["size"] <= cache_manager.max_size_bytes
+
+    def test_gc_reconciles_and_enforces_cap(self, temp_cache_dir):
+        """gc picks up files written behind the index's back and trims to the cap"""
+        cache_manager = CacheManager(cache_dir=temp_cache_dir)
+        cache_manager.set_tools_cache("a", [{"blob": "x" * 1000}])
+        stray = cache_manager.tools_cache_dir / "stray_tools.json"
+        stray.write_text("x" * 5000)
+        stale_tmp = cache_manager.tools_cache_dir / ".a_tools.json.123.tmp"
+        stale_tmp.write_text("partial")
+        old = time.time() - 7200
+        os.utime(stray, (old, old))
+        os.utime(stale_tmp, (old, old))
+
+        result = cache_manager.gc(max_size_mb=2000 / (1024 * 1024))
+
+        assert result["temp_files_removed"] == 1
+        assert result["removed"] == 1
+        assert not stray.exists()
+        assert cache_manager.get_tools_cache("a") is not None
+        assert result["size"] == cache_manager.get_cache_stats()["size"]
+        assert result["size"] <= 2000
+
+
+FAKE_MCP_SERVER = """
+import json
+import sys
+
+for line in sys.stdin:
+    request = json.loads(line)
+    if request["method"] == "initialize":
+        result = {"serverInfo": {"name": "fake", "version": "1.0.0"}}
+    elif request["method"] == "tools/list":
+        result = {"tools": [{"name": "echo", "description": "Echo text"}]}
+    else:
+        result = {}
+    print(json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": result}), flush=True)
+"""
+
+
+class TestCacheWarm:
+    """Test cases for prefetching server schemas into the cache"""
+
+    def test_warm_servers_cache(self, tmp_path, monkeypatch):
+        """Servers are started in parallel and their tools land in the cache"""
+        from gradio_mcp_playground import cache_manager as cache_module
+        from gradio_mcp_playground.parallel_server_loader import warm_servers_cache
+
+        cache_manager = CacheManager(cache_dir=tmp_path / "cache")
+        monkeypatch.setattr(cache_module, "_cache_manager", cache_manager)
+
+        script = tmp_path / "fake_server.py"
+        script.write_text(FAKE_MCP_SERVER)
+        servers = {
+            "fake-a": {"command": sys.executable, "args": [str(script)]},
+            "fake-b": {"command": sys.executable, "args": [str(script)]},
+            "broken": {"command": str(tmp_path / "missing-binary"), "args": []},
+        }
+
+        started = time.perf_counter()
+        results = warm_servers_cache(servers, max_workers=3)
+        elapsed = time.perf_counter() - started
+
+        assert [r["name"] for r in results] == ["fake-a", "fake-b", "broken"]
+        assert [r["success"] for r in results] == [True, True, False]
+        assert results[0]["tools"] == 1
+        assert results[2]["error"]
+        # Both servers were started concurrently (each start waits ~2s)
+        assert elapsed < 4
+
+        cached = cache_manager.get_server_cache("fake-a", servers["fake-a"])
+        assert set(cached["tools"]) == {"echo"}
+        assert cached["server_info"]["version"] == "1.0.0"
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
\ No newline at end of file
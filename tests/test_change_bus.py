@@ -0,0 +1,168 @@
+"""Tests for the dashboard change bus"""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from gradio_mcp_playground import change_bus as change_bus_module
+from gradio_mcp_playground.change_bus import (
+    TOPIC_AGENTS,
+    TOPIC_SERVERS,
+    ChangeBus,
+    get_change_bus,
+    watch_server_sources,
+)
+
+requires_watchdog = pytest.mark.skipif(
+    not change_bus_module.HAS_WATCHDOG, reason="watchdog not installed"
+)
+
+
+@pytest.fixture
+def bus():
+    bus = ChangeBus()
+    yield bus
+    bus.close()
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return predicate()
+
+
+class TestChangeBus:
+    def test_publish_bumps_only_its_topic(self, bus):
+        assert bus.version(TOPIC_SERVERS) == 0
+
+        assert bus.publish(TOPIC_SERVERS) == 1
+        assert bus.publish(TOPIC_SERVERS) == 2
+
+        assert bus.version(TOPIC_SERVERS) == 2
+        assert bus.version(TOPIC_AGENTS) == 0
+
+    def test_wait_wakes_on_publish(self, bus):
+        threading.Timer(0.05, bus.publish, args=(TOPIC_AGENTS,)).start()
+
+        versions = bus.wait([TOPIC_SERVERS, TOPIC_AGENTS], since={}, timeout=5)
+
+        assert versions == {TOPIC_SERVERS: 0, TOPIC_AGENTS: 1}
+
+    def test_wait_times_out_without_changes(self, bus):
+        bus.publish(TOPIC_SERVERS)
+        since = {TOPIC_SERVERS: 1}
+
+        assert bus.wait([TOPIC_SERVERS], since, timeout=0.05) == since
+
+    def test_wait_async_wakes_on_publish_from_a_thread(self, bus):
+        async def wait():
+            threading.Timer(0.05, bus.publish, args=(TOPIC_SERVERS,)).start()
+            return await bus.wait_async([TOPIC_SERVERS], since={}, timeout=5)
+
+        assert asyncio.run(wait()) == {TOPIC_SERVERS: 1}
+        assert not bus._async_waiters
+
+    def test_wait_async_times_out_without_changes(self, bus):
+        bus.publish(TOPIC_AGENTS)
+        since = {TOPIC_AGENTS: 1}
+
+        assert asyncio.run(bus.wait_async([TOPIC_AGENTS], since, timeout=0.05)) == since
+        assert not bus._async_waiters
+
+    def test_shared_instance(self):
+        assert get_change_bus() is get_change_bus()
+
+    def test_watch_missing_directory(self, bus, tmp_path):
+        assert bus.watch(tmp_path / "missing", TOPIC_SERVERS) is False
+        assert not bus.is_watching
+
+    @requires_watchdog
+    def test_file_change_publishes_within_a_second(self, bus, tmp_path):
+        assert bus.watch(tmp_path, TOPIC_SERVERS)
+        assert bus.watch(tmp_path, TOPIC_SERVERS)  # idempotent
+
+        started = time.monotonic()
+        (tmp_path / "servers.json").write_text("{}")
+
+        assert _wait_for(lambda: bus.version(TOPIC_SERVERS) > 0)
+        assert time.monotonic() - started < 1.0
+
+    @requires_watchdog
+    def test_reads_and_noise_do_not_publish(self, bus, tmp_path):
+        target = tmp_path / "servers.json"
+        target.write_text("{}")
+        (tmp_path / "__pycache__").mkdir()
+        bus.watch(tmp_path, TOPIC_SERVERS)
+
+        target.read_text()
+        (tmp_path / "__pycache__" / "mod.pyc").write_bytes(b"x")
+        (tmp_path / "scratch.tmp").write_text("x")
+        time.sleep(0.3)
+
+        assert bus.version(TOPIC_SERVERS) == 0
+
+    @requires_watchdog
+    def test_watch_server_sources(self, bus, tmp_path, monkeypatch):
+        from gradio_mcp_playground.config_manager import ConfigManager
+        from gradio_mcp_playground.server_manager import GradioMCPServer
+
+        monkeypatch.setenv("GMP_DISABLE_FILE_WATCH", "1")
+        monkeypatch.setattr(GradioMCPServer, "find_running_servers", staticmethod(lambda: []))
+        monkeypatch.setattr(
+            GradioMCPServer, "find_claude_desktop_paths", staticmethod(lambda: (None, None))
+        )
+        app_dir = tmp_path / "elsewhere"
+        app_dir.mkdir()
+
+        config_dir = tmp_path / "config"
+        config_dir.mkdir()
+        manager = ConfigManager()
+        manager.config_dir = config_dir
+        manager.servers_path = config_dir / "servers.json"
+        manager.add_server({"name": "demo", "path": str(app_dir / "app.py")})
+
+        assert watch_server_sources(bus, manager)
+        version = bus.version(TOPIC_SERVERS)
+
+        (app_dir / "app.py").write_text("print('changed')\n")
+
+        assert _wait_for(lambda: bus.version(TOPIC_SERVERS) > version)
+
+    @requires_watchdog
+    def test_server_sources_ignore_unrelated_writes(self, bus, tmp_path, monkeypatch):
+        from gradio_mcp_playground.config_manager import ConfigManager
+        from gradio_mcp_playground.server_manager import GradioMCPServer
+
+        monkeypatch.setenv("GMP_DISABLE_FILE_WATCH", "1")
+        monkeypatch.setattr(GradioMCPServer, "find_running_servers", staticmethod(lambda: []))
+        monkeypatch.setattr(
+            GradioMCPServer, "find_claude_desktop_paths", staticmethod(lambda: (None, None))
+        )
+        app_dir = tmp_path / "elsewhere"
+        app_dir.mkdir()
+
+        config_dir = tmp_path / "config"
+        (config_dir / "logs").mkdir(parents=True)
+        manager = ConfigManager()
+        manager.config_dir = config_dir
+        manager.servers_path = config_dir / "servers.json"
+        manager.add_server({"name": "demo", "path": str(app_dir / "app.py")})
+
+        assert watch_server_sources(bus, manager)
+        time.sleep(0.2)
+        version = bus.version(TOPIC_SERVERS)
+
+        (config_dir / "ports.json").write_text("{}")
+        (config_dir / "api_keys.enc").write_bytes(b"x")
+        (config_dir / "logs" / "agent.log").write_text("line\n")
+        (app_dir / "output.db").write_bytes(b"x")
+        time.sleep(0.3)
+        assert bus.version(TOPIC_SERVERS) == version
+
+        manager.servers_path.write_text("[]")
+        assert _wait_for(lambda: bus.version(TOPIC_SERVERS) > version)
@@ -0,0 +1,126 @@
+"""Tests for the ConfigManager server catalog"""
+
+import json
+import time
+from pathlib import Path
+
+import pytest
+
+from gradio_mcp_playground import config_manager as config_module
+from gradio_mcp_playground.config_manager import ConfigManager
+from gradio_mcp_playground.server_manager import GradioMCPServer
+
+
+@pytest.fixture
+def manager(tmp_path, monkeypatch):
+    """ConfigManager pointed at a temporary config directory"""
+    calls = {"running": 0}
+
+    def fake_running_servers():
+        calls["running"] += 1
+        return []
+
+    monkeypatch.setattr(GradioMCPServer, "find_running_servers", staticmethod(fake_running_servers))
+    monkeypatch.setattr(
+        GradioMCPServer, "find_claude_desktop_paths", staticmethod(lambda: (None, None))
+    )
+
+    cm = ConfigManager()
+    cm.config_dir = tmp_path
+    cm.config_path = tmp_path / "config.json"
+    cm.servers_path = tmp_path / "servers.json"
+    cm.calls = calls
+    yield cm
+    cm._server_catalog().close()
+    config_module._catalogs.pop((tmp_path, tmp_path / "servers.json"), None)
+
+
+def _write_servers(path: Path, names):
+    servers = [{"name": n, "path": f"/srv/{n}/app.py"} for n in names]
+    path.write_text(json.dumps({"servers": servers}))
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.05)
+    return predicate()
+
+
+class TestServerCatalog:
+    def test_list_servers_is_memoized(self, manager):
+        _write_servers(manager.servers_path, ["alpha", "beta"])
+
+        first = manager.list_servers()
+        second = manager.list_servers()
+
+        assert [s["name"] for s in first] == ["alpha", "beta"]
+        assert first == second
+        assert manager.calls["running"] == 1
+
+    def test_catalog_shared_between_instances(self, manager):
+        _write_servers(manager.servers_path, ["alpha"])
+        manager.list_servers()
+
+        other = ConfigManager()
+        other.config_dir = manager.config_dir
+        other.servers_path = manager.servers_path
+
+        assert other.get_server("alpha")["name"] == "alpha"
+        assert manager.calls["running"] == 1
+
+    def test_get_server_uses_index(self, manager):
+        _write_servers(manager.servers_path, ["alpha", "beta"])
+
+        assert manager.get_server("beta")["path"] == "/srv/beta/app.py"
+        assert manager.get_server("missing") is None
+
+    def test_returned_entries_are_copies(self, manager):
+        _write_servers(manager.servers_path, ["alpha"])
+
+        manager.get_server("alpha")["name"] = "mutated"
+        manager.list_servers()[0]["path"] = "mutated"
+
+        assert manager.get_server("alpha")["path"] == "/srv/alpha/app.py"
+
+    def test_mutations_invalidate(self, manager):
+        manager.add_server({"name": "alpha", "path": "/srv/alpha/app.py"})
+        assert manager.get_server("alpha") is not None
+
+        manager.update_server("alpha", {"description": "updated"})
+        assert manager.get_server("alpha")["description"] == "updated"
+
+        manager.remove_server("alpha")
+        assert manager.get_server("alpha") is None
+
+    def test_auto_discovered_server_picked_up(self, manager):
+        manager.list_servers()
+
+        server_dir = manager.config_dir / "servers" / "gamma"
+        server_dir.mkdir(parents=True)
+        (server_dir / "app.py").write_text("print('hi')\n")
+
+        assert _wait_for(lambda: manager.get_server("gamma") is not None)
+
+    @pytest.mark.skipif(not config_module.HAS_WATCHDOG, reason="watchdog not installed")
+    def test_external_edit_invalidates_via_watch(self, manager):
+        _write_servers(manager.servers_path, ["alpha"])
+        manager.list_servers()
+        assert manager._server_catalog()._observer is not None
+
+        _write_servers(manager.servers_path, ["alpha", "delta"])
+
+        assert _wait_for(lambda: manager.get_server("delta") is not None)
+
+    def test_stat_fallback_without_watch(self, manager, monkeypatch):
+        monkeypatch.setenv("GMP_DISABLE_FILE_WATCH", "1")
+        _write_servers(manager.servers_path, ["alpha"])
+        manager.list_servers()
+        assert manager._server_catalog()._observer is None
+
+        _write_servers(manager.servers_path, ["alpha", "epsilon-with-longer-name"])
+
+        assert manager.get_server("epsilon-with-longer-name") is not None
+        assert manager.calls["running"] == 2
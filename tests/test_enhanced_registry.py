@@ -0,0 +1,242 @@
+"""Tests for the agent's enhanced server registry"""
+
+import asyncio
+import http.server
+import importlib.util
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from gradio_mcp_playground.cache_manager import CacheManager
+
+
+@pytest.fixture(scope="module")
+def registry_module():
+    # Loaded by path: the agent.core package imports modules that need the full agent setup
+    spec = importlib.util.spec_from_file_location(
+        "enhanced_registry",
+        Path(__file__).resolve().parent.parent / "agent" / "core" / "registry.py",
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.fixture
+def registry(registry_module):
+    registry = registry_module.EnhancedRegistry()
+    registry.enhanced_registry.clear()
+    for server in [
+        {"id": "postgres", "category": "data", "tags": ["sql", "database"]},
+        {"id": "sqlite", "category": "data", "tags": ["sql", "database", "local"]},
+        {"id": "mysql", "category": "data", "tags": ["sql"]},
+        {"id": "csv", "category": "data", "tags": ["files"]},
+        {"id": "browser", "category": "web", "tags": ["files", "scraping"]},
+    ]:
+        registry.add_custom_server(server)
+    return registry
+
+
+class TestSimilarServers:
+    def test_ranked_by_category_and_tag_overlap(self, registry):
+        assert registry.get_similar_servers("postgres") == ["sqlite", "mysql", "csv"]
+        assert registry.get_similar_servers("browser") == []
+        assert registry.get_similar_servers("missing") == []
+
+        recommendations = registry.get_server_recommendations({"id": "mysql"})
+        assert [server["id"] for server in recommendations] == ["postgres", "sqlite", "csv"]
+
+    def test_independent_of_insertion_order(self, registry, registry_module):
+        reversed_registry = registry_module.EnhancedRegistry()
+        reversed_registry.enhanced_registry.clear()
+        for server in reversed(list(registry.enhanced_registry.values())):
+            reversed_registry.add_custom_server(server)
+
+        for server_id in registry.enhanced_registry:
+            assert registry.get_similar_servers(server_id) == (
+                reversed_registry.get_similar_servers(server_id)
+            )
+
+    def test_changes_invalidate_the_graph(self, registry):
+        assert "mariadb" not in registry.get_similar_servers("mysql")
+
+        registry.add_custom_server({"id": "mariadb", "category": "data", "tags": ["sql"]})
+        assert registry.get_similar_servers("mysql")[0] == "mariadb"
+
+        assert registry.remove_server("mariadb")
+        assert "mariadb" not in registry.get_similar_servers("mysql")
+
+    def test_common_tags_are_not_expanded(self, registry, registry_module, monkeypatch):
+        monkeypatch.setattr(registry_module, "MAX_TAG_FANOUT", 2)
+
+        # "sql" is on three servers, so only "database" brings candidates in
+        assert registry.get_similar_servers("postgres")[0] == "sqlite"
+        assert registry.get_similar_servers("browser") == []
+
+
+class _SourceHandler(http.server.BaseHTTPRequestHandler):
+    """Stands in for GitHub (ETag) and Hugging Face (Last-Modified) searches"""
+
+    requests = []
+    github_items = []
+    spaces = []
+
+    def do_GET(self):
+        type(self).requests.append((self.path, dict(self.headers)))
+        if self.path.startswith("/github.com"):
+            body = json.dumps({"items": self.github_items}).encode()
+            validator = ("ETag", f'"{len(self.github_items)}"', "If-None-Match")
+        elif self.path.startswith("/huggingface.co"):
+            body = json.dumps(self.spaces).encode()
+            validator = ("Last-Modified", "Mon, 05 Oct 2026 10:00:00 GMT", "If-Modified-Since")
+        else:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        header, value, conditional = validator
+        if self.headers.get(conditional) == value:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header(header, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def source_server():
+    _SourceHandler.requests = []
+    _SourceHandler.github_items = [
+        {"id": 1, "name": "gradio-mcp-notes", "description": "Notes", "html_url": "https://x/1"}
+    ]
+    _SourceHandler.spaces = [{"id": "user/mcp-space", "name": "mcp-space", "likes": 3}]
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _SourceHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=[True, False], ids=["aiohttp", "httpx"])
+def discovery_registry(request, registry_module, source_server, tmp_path, monkeypatch):
+    if request.param and not registry_module.HAS_AIOHTTP:
+        pytest.skip("aiohttp not installed")
+    monkeypatch.setattr(registry_module, "HAS_AIOHTTP", request.param)
+    registry = registry_module.EnhancedRegistry()
+    registry.cache_manager = CacheManager(cache_dir=tmp_path)
+    registry.public_sources = [
+        f"{source_server}/github.com/search",
+        f"{source_server}/huggingface.co/api/spaces",
+        f"{source_server}/broken",
+    ]
+    return registry
+
+
+class TestPublicDiscovery:
+    def test_discovered_servers_are_merged(self, discovery_registry):
+        servers = asyncio.run(discovery_registry.discover_public_servers())
+
+        assert sorted(server["id"] for server in servers) == ["github-1", "hf-user/mcp-space"]
+        assert discovery_registry.get_server_by_id("github-1")["source"] == "github"
+        results = asyncio.run(discovery_registry.search_servers("notes"))
+        assert results[0]["id"] == "github-1"
+
+    def test_fresh_results_come_from_the_cache(self, discovery_registry, tmp_path):
+        asyncio.run(discovery_registry.discover_public_servers())
+        requests = len(_SourceHandler.requests)
+
+        asyncio.run(discovery_registry.discover_public_servers())
+        # Only the failing source is retried
+        assert [path for path, _ in _SourceHandler.requests[requests:]] == ["/broken"]
+
+        # Another registry (process) reuses the on-disk results
+        discovery_registry.cache_manager = CacheManager(cache_dir=tmp_path)
+        discovery_registry._discovery_entries.clear()
+        assert len(asyncio.run(discovery_registry.discover_public_servers())) == 2
+
+    def test_stale_sources_are_revalidated(self, discovery_registry):
+        discovery_registry.discovery_interval = 0
+        asyncio.run(discovery_registry.discover_public_servers())
+        requests = len(_SourceHandler.requests)
+
+        servers = asyncio.run(discovery_registry.discover_public_servers())
+        headers = dict(_SourceHandler.requests[requests:])
+        assert headers["/github.com/search"]["If-None-Match"] == '"1"'
+        assert headers["/huggingface.co/api/spaces"]["If-Modified-Since"].startswith("Mon")
+        assert len(servers) == 2
+
+        # A changed source replaces its servers in the registry
+        _SourceHandler.github_items = [
+            {"id": 2, "name": "gradio-mcp-todo", "description": "Todos", "html_url": "https://x/2"},
+            {"id": 3, "name": "gradio-mcp-mail", "description": "Mail", "html_url": "https://x/3"},
+        ]
+        asyncio.run(discovery_registry.discover_public_servers())
+        assert discovery_registry.get_server_by_id("github-1") is None
+        assert discovery_registry.get_server_by_id("github-3")["name"] == "gradio-mcp-mail"
+        results = asyncio.run(discovery_registry.search_servers("notes"))
+        assert "github-1" not in [server["id"] for server in results]
+
+
+class TestRequirementMatching:
+    def test_best_match_first(self, registry_module):
+        registry = registry_module.EnhancedRegistry()
+
+        matches = asyncio.run(registry.find_matching_servers({"functionality": ["calculator"]}))
+        assert matches[0].server["id"] == "calculator"
+        assert matches[0].match_reasons
+        assert [m.confidence for m in matches] == sorted(
+            (m.confidence for m in matches), reverse=True
+        )
+
+        requirements = {
+            "functionality": ["data", "csv"],
+            "ui_preferences": {"complexity": "simple"},
+        }
+        limited = asyncio.run(registry.find_matching_servers(requirements, limit=2))
+        assert len(limited) == 2
+        assert limited[0].server["id"] == "data-analyzer"
+
+    def test_changes_rebuild_the_matrix(self, registry):
+        requirements = {"functionality": ["weather"]}
+        assert asyncio.run(registry.find_matching_servers(requirements)) == []
+
+        registry.add_custom_server(
+            {"id": "weather", "category": "web", "description": "Weather forecasts"}
+        )
+        matches = asyncio.run(registry.find_matching_servers(requirements))
+        assert [m.server["id"] for m in matches] == ["weather"]
+
+    def test_scan_without_numpy(self, registry, registry_module, monkeypatch):
+        monkeypatch.setattr(registry_module, "TfidfMatrix", None)
+
+        matches = asyncio.run(registry.find_matching_servers({"functionality": ["sql"]}))
+        assert {m.server["id"] for m in matches} == {"postgres", "sqlite", "mysql"}
+
+    def test_confidence_is_absolute(self, registry_module):
+        registry = registry_module.EnhancedRegistry()
+
+        # Filler words match nothing, rather than making the best of them a top match
+        for functionality in (["something for the"], ["with"]):
+            requirements = {"functionality": functionality}
+            assert asyncio.run(registry.find_matching_servers(requirements)) == []
+
+        # A weak best match is not scaled up to full text confidence
+        matches = asyncio.run(registry.find_matching_servers({"functionality": ["calculator"]}))
+        assert matches[0].confidence < registry_module.TEXT_MATCH_WEIGHT
+
+        requirements = {
+            "functionality": ["web", "scraping"],
+            "ui_preferences": {"complexity": "simple"},
+        }
+        for match in asyncio.run(registry.find_matching_servers(requirements)):
+            assert 0.0 <= match.confidence <= 1.0
@@ -0,0 +1,141 @@
+"""Tests for the server health monitor"""
+
+import http.server
+import threading
+import time
+
+import pytest
+
+from gradio_mcp_playground import health_monitor as health_monitor_module
+from gradio_mcp_playground.change_bus import TOPIC_HEALTH, get_change_bus
+from gradio_mcp_playground.health_monitor import (
+    MCP_ENDPOINT,
+    STATUS_DEGRADED,
+    STATUS_HEALTHY,
+    STATUS_UNHEALTHY,
+    STATUS_UNKNOWN,
+    HealthMonitor,
+    HealthTarget,
+    _percentile,
+    format_health,
+)
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith("/hang"):
+            time.sleep(2)
+        status = 500 if self.path.startswith("/broken") else 200
+        try:
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+        except OSError:
+            pass  # the probe gave up waiting
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def base_url():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=[True, False], ids=["aiohttp", "http.client"])
+def monitor(request, monkeypatch):
+    if request.param and not health_monitor_module.HAS_AIOHTTP:
+        pytest.skip("aiohttp not installed")
+    monkeypatch.setattr(health_monitor_module, "HAS_AIOHTTP", request.param)
+    monitor = HealthMonitor(interval=0.05, history=10, timeout=0.5)
+    yield monitor
+    monitor.stop()
+
+
+class TestHealthMonitor:
+    def test_serving_server_is_healthy(self, monitor, base_url):
+        monitor.track("ok", f"{base_url}/", f"{base_url}/{MCP_ENDPOINT}")
+
+        for _ in range(3):
+            monitor.probe_once()
+        report = monitor.report("ok")
+
+        assert report.status == STATUS_HEALTHY
+        assert report.probes == 3
+        assert report.error_rate == 0
+        assert 0 < report.p50_ms <= report.p95_ms <= report.p99_ms
+        assert len(monitor.history("ok")) == 3
+
+    def test_unresponsive_server_becomes_unhealthy(self, monitor, base_url):
+        monitor.track("wedged", f"{base_url}/hang")
+
+        monitor.probe_once()
+        assert monitor.report("wedged").status == STATUS_DEGRADED
+
+        monitor.probe_once()
+        monitor.probe_once()
+        report = monitor.report("wedged")
+        assert report.status == STATUS_UNHEALTHY
+        assert report.consecutive_failures == 3
+        assert "timed out" in report.last_error
+
+    def test_mcp_errors_count(self, monitor, base_url):
+        monitor.track("mcp", f"{base_url}/", f"{base_url}/broken")
+
+        monitor.probe_once()
+        report = monitor.report("mcp")
+
+        assert report.status == STATUS_DEGRADED
+        assert report.last_error == "MCP: HTTP 500"
+        assert report.p50_ms is not None  # the web UI still answered
+
+    def test_recovery_and_slow_responses(self, base_url):
+        monitor = HealthMonitor(timeout=0.5, window=4, slow_ms=0.0)
+        monitor.track("flaky", f"{base_url}/broken")
+        monitor.probe_once()
+        monitor.track("flaky", f"{base_url}/broken")  # unchanged target keeps history
+        assert monitor.report("flaky").probes == 1
+
+        # A new URL starts a fresh history; every response is "slow" here
+        monitor.track("flaky", f"{base_url}/")
+        monitor.probe_once()
+        assert monitor.report("flaky").status == STATUS_DEGRADED
+        assert monitor.report("flaky").error_rate == 0
+
+    def test_discovery_and_status_changes_are_published(self, base_url):
+        targets = {"a": HealthTarget(f"{base_url}/")}
+        monitor = HealthMonitor(timeout=0.5, discover=lambda: dict(targets))
+        bus = get_change_bus()
+
+        version = bus.version(TOPIC_HEALTH)
+        monitor.probe_once()
+        assert monitor.report("a").status == STATUS_HEALTHY
+        assert bus.version(TOPIC_HEALTH) == version + 1
+
+        monitor.probe_once()
+        assert bus.version(TOPIC_HEALTH) == version + 1
+
+        targets.clear()
+        monitor.probe_once()
+        assert monitor.tracked() == {}
+        assert monitor.report("a").status == STATUS_UNKNOWN
+
+
+def test_percentiles_and_formatting():
+    values = list(range(1, 101))
+    assert (_percentile(values, 50), _percentile(values, 95), _percentile(values, 99)) == (
+        50,
+        95,
+        99,
+    )
+    assert _percentile([], 50) is None
+
+    monitor = HealthMonitor()
+    assert format_health(monitor.report("missing")) == "⚪ unknown"
@@ -0,0 +1,93 @@
+"""Tests for the background process-metrics sampler"""
+
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from gradio_mcp_playground import metrics_sampler as metrics_sampler_module
+from gradio_mcp_playground.metrics_sampler import MetricsSampler, sparkline
+
+pytestmark = pytest.mark.skipif(
+    not metrics_sampler_module.HAS_PSUTIL, reason="psutil not installed"
+)
+
+
+@pytest.fixture
+def sampler():
+    sampler = MetricsSampler(interval=0.05, history=5)
+    yield sampler
+    sampler.stop()
+
+
+class TestMetricsSampler:
+    def test_samples_tracked_process(self, sampler):
+        sampler.track("self", os.getpid())
+
+        sampler.sample_once()
+        sample = sampler.latest("self")
+
+        assert sample.rss_mb > 0
+        assert sample.num_threads >= 1
+        assert sample.num_fds >= 1
+        assert sampler.system() is not None
+
+    def test_cached_handle_measures_busy_cpu(self, sampler):
+        child = subprocess.Popen([sys.executable, "-c", "while True: pass"])
+        try:
+            sampler.track("busy", child.pid)
+            time.sleep(0.3)
+            sampler.sample_once()
+
+            assert sampler.latest("busy").cpu_percent > 10
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_ring_buffer_is_bounded(self, sampler):
+        sampler.track("self", os.getpid())
+
+        for _ in range(8):
+            sampler.sample_once()
+
+        assert len(sampler.history("self", "rss_mb")) == 5
+        assert len(sampler.system_history()) == 5
+
+    def test_exited_process_keeps_history(self, sampler):
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        sampler.track("child", child.pid)
+        sampler.sample_once()
+
+        child.kill()
+        child.wait()
+        sampler.sample_once()
+
+        assert sampler.latest("child") is None
+        assert len(sampler.history("child")) == 1
+
+        sampler.untrack("child")
+        assert sampler.tracked() == {}
+
+    def test_background_thread_fills_buffers(self, sampler):
+        sampler.track("self", os.getpid())
+        sampler.start()
+
+        deadline = time.monotonic() + 5
+        while len(sampler.history("self")) < 3 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert len(sampler.history("self")) >= 3
+
+
+class TestSparkline:
+    def test_scales_to_maximum(self):
+        assert sparkline([0, 50, 100], maximum=100) == "▁▅█"
+
+    def test_width_keeps_newest(self):
+        assert sparkline([1, 2, 3, 4], width=2) == "▆█"
+
+    def test_empty_and_flat(self):
+        assert sparkline([]) == ""
+        assert sparkline([0, 0]) == "▁▁"
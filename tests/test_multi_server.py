@@ -0,0 +1,91 @@
+"""Tests for serving several Gradio servers from one process"""
+
+import pytest
+
+pytest.importorskip("gradio")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient  # noqa: E402
+
+from gradio_mcp_playground.multi_server import (  # noqa: E402
+    create_multi_server_app,
+    load_blocks,
+    mount_options,
+    split_servers,
+)
+
+APP = """
+import gradio as gr
+from helper import LABEL
+
+def greet(name):
+    return f"{LABEL}: {name}"
+
+demo = gr.Interface(greet, "text", "text")
+if __name__ == "__main__":
+    demo.launch(server_port=1, theme="soft", mcp_server=True)
+    raise RuntimeError("launch() should not return in the multi-server host")
+"""
+
+
+def _write_server(tmp_path, name):
+    directory = tmp_path / name
+    directory.mkdir()
+    (directory / "helper.py").write_text(f"LABEL = {name!r}\n")
+    (directory / "app.py").write_text(APP)
+    return {"name": name, "path": str(directory / "app.py")}
+
+
+class TestLoadBlocks:
+    def test_launch_is_captured(self, tmp_path):
+        server = _write_server(tmp_path, "one")
+
+        blocks, launch_kwargs = load_blocks(server["path"])
+
+        assert launch_kwargs == {"server_port": 1, "theme": "soft", "mcp_server": True}
+        options = mount_options(launch_kwargs)
+        assert "server_port" not in options
+        assert options["ssr_mode"] is False
+
+    def test_sibling_modules_are_isolated(self, tmp_path):
+        one, _ = load_blocks(_write_server(tmp_path, "one")["path"])
+        two, _ = load_blocks(_write_server(tmp_path, "two")["path"])
+
+        assert next(iter(one.fns.values())).fn("x") == "one: x"
+        assert next(iter(two.fns.values())).fn("x") == "two: x"
+
+    def test_script_without_app_is_rejected(self, tmp_path):
+        script = tmp_path / "empty.py"
+        script.write_text("x = 1\n")
+
+        with pytest.raises(ValueError):
+            load_blocks(script)
+
+
+class TestMultiServerApp:
+    def test_servers_are_mounted_and_failures_listed(self, tmp_path):
+        broken = tmp_path / "broken.py"
+        broken.write_text("raise ImportError('missing dependency')\n")
+        servers = [
+            _write_server(tmp_path, "one"),
+            _write_server(tmp_path, "two"),
+            {"name": "broken", "path": str(broken)},
+        ]
+
+        with TestClient(create_multi_server_app(servers)) as client:
+            index = client.get("/").json()
+            assert sorted(index["servers"]) == ["one", "two"]
+            assert index["servers"]["one"]["mcp"] == "/one/gradio_api/mcp/sse"
+            assert "missing dependency" in index["failed"]["broken"]
+            assert client.get("/one/").status_code == 200
+            assert client.get("/two/config").json()["components"]
+
+
+def test_split_servers_round_robin():
+    servers = [{"name": str(i)} for i in range(5)]
+
+    assert [[s["name"] for s in group] for group in split_servers(servers, 2)] == [
+        ["0", "2", "4"],
+        ["1", "3"],
+    ]
+    assert len(split_servers(servers, 10)) == 5
+    assert split_servers(servers, 0) == [servers]
@@ -0,0 +1,74 @@
+"""Tests for draining child process output"""
+
+import subprocess
+import sys
+
+from gradio_mcp_playground.output_drain import OutputDrain
+
+CHATTY = (
+    "import sys\n"
+    "for i in range(20000):\n"
+    "    print('line', i, 'x' * 40)\n"
+    "sys.stderr.write('done\\n')\n"
+)
+
+
+class TestOutputDrain:
+    def test_chatty_child_does_not_block(self, tmp_path):
+        process = subprocess.Popen(
+            [sys.executable, "-c", CHATTY],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        drain = OutputDrain(tmp_path / "agent.log", max_bytes=0)
+        drain.attach(process.stdout, "stdout")
+        drain.attach(process.stderr, "stderr")
+
+        # Far more than a pipe buffer is written; without draining this hangs
+        assert process.wait(timeout=30) == 0
+        assert drain.join(timeout=5)
+        drain.close()
+
+        assert drain.tail(1, label="stdout") == ["line 19999 " + "x" * 40]
+        assert drain.tail(1, label="stderr") == ["done"]
+        assert sum(1 for _ in open(tmp_path / "agent.log")) == 20001
+
+    def test_binary_streams_are_decoded(self, tmp_path):
+        process = subprocess.Popen(
+            [sys.executable, "-c", "print('héllo')"],
+            stdout=subprocess.PIPE,
+            env={"PYTHONIOENCODING": "utf-8"},
+        )
+        drain = OutputDrain(tmp_path / "agent.log")
+        drain.attach(process.stdout, "stdout")
+        process.wait(timeout=10)
+        drain.close()
+
+        assert drain.tail() == ["héllo"]
+
+    def test_log_rotation_caps_size(self, tmp_path):
+        log_path = tmp_path / "agent.log"
+        drain = OutputDrain(log_path, max_bytes=1000, backup_count=2, tail_lines=3)
+
+        for i in range(200):
+            drain.write(f"message {i}")
+        drain.close()
+
+        files = sorted(p.name for p in tmp_path.iterdir())
+        assert files == ["agent.log", "agent.log.1", "agent.log.2"]
+        assert all(p.stat().st_size <= 1000 for p in tmp_path.iterdir())
+        assert "message 199" in log_path.read_text()
+        assert drain.tail(10) == ["message 197", "message 198", "message 199"]
+
+    def test_appends_to_existing_log(self, tmp_path):
+        log_path = tmp_path / "agent.log"
+        log_path.write_text("previous run\n")
+
+        drain = OutputDrain(log_path)
+        drain.write("next run", "stderr")
+        drain.close()
+
+        lines = log_path.read_text().splitlines()
+        assert lines[0] == "previous run"
+        assert lines[1].endswith("[stderr] next run")
@@ -0,0 +1,118 @@
+"""Tests for the shared port allocator"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from gradio_mcp_playground.port_allocator import PortAllocator
+
+
+@pytest.fixture
+def allocator(tmp_path):
+    allocator = PortAllocator(tmp_path)
+    yield allocator
+    allocator._release_held()
+
+
+def _free_range(count):
+    """Find a base port with ``count`` consecutive bindable ports"""
+    for base in range(20000, 60000, 97):
+        sockets = []
+        try:
+            for port in range(base, base + count):
+                s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                sockets.append(s)
+                s.bind(("", port))
+            return base
+        except OSError:
+            continue
+        finally:
+            for s in sockets:
+                s.close()
+    pytest.skip("no free port range")
+
+
+class TestPortAllocator:
+    def test_reservations_are_unique_and_persisted(self, allocator, tmp_path):
+        base = _free_range(5)
+
+        first = allocator.reserve(start=base, count=5)
+        second = allocator.reserve(start=base, count=5)
+
+        assert first == base
+        assert second == base + 1
+        state = json.loads((tmp_path / "ports.json").read_text())
+        assert state["reservations"][str(first)]["pid"] == os.getpid()
+
+    def test_other_instances_see_reservations(self, allocator, tmp_path):
+        base = _free_range(3)
+        other = PortAllocator(tmp_path)
+
+        assert allocator.reserve(start=base, count=3) == base
+        assert other.reserve(start=base, count=3) == base + 1
+
+    def test_concurrent_reservations_do_not_collide(self, tmp_path):
+        base = _free_range(20)
+        allocators = [PortAllocator(tmp_path) for _ in range(4)]
+        ports = []
+        lock = threading.Lock()
+
+        def worker(alloc):
+            for _ in range(5):
+                port = alloc.reserve(start=base, count=20)
+                with lock:
+                    ports.append(port)
+
+        threads = [threading.Thread(target=worker, args=(a,)) for a in allocators]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(ports) == 20
+        assert len(set(ports)) == 20
+
+    def test_preferred_port_in_use_is_skipped(self, allocator):
+        base = _free_range(3)
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as busy:
+            busy.bind(("", base))
+            busy.listen()
+
+            port = allocator.reserve(preferred=base, start=base, count=3)
+
+        assert port == base + 1
+
+    def test_exhausted_range_falls_back_to_os_port(self, allocator):
+        base = _free_range(1)
+        assert allocator.reserve(start=base, count=1) == base
+
+        port = allocator.reserve(start=base, count=1)
+
+        assert port != base
+        assert port in allocator.reservations()
+
+    def test_reservation_dies_with_owner(self, allocator):
+        base = _free_range(2)
+        port = allocator.reserve(start=base, count=2)
+        child = subprocess.Popen([sys.executable, "-c", "pass"])
+        allocator.assign(port, child.pid)
+        assert allocator.reservations()[port]["pid"] == child.pid
+
+        child.wait()
+
+        assert port not in allocator.reservations()
+        assert allocator.reserve(start=base, count=2) == base
+
+    def test_release(self, allocator):
+        base = _free_range(2)
+        port = allocator.reserve(start=base, count=2)
+
+        allocator.release(port)
+
+        assert allocator.reservations() == {}
+        assert allocator.reserve(start=base, count=2) == port
@@ -0,0 +1,179 @@
+"""Tests for the pre-fork launcher"""
+
+import socket
+import subprocess
+import threading
+import time
+
+import pytest
+
+from gradio_mcp_playground import port_allocator, prefork
+from gradio_mcp_playground.port_allocator import PortAllocator
+from gradio_mcp_playground.prefork import ForkedProcess, PreforkLauncher, spawn_app
+from gradio_mcp_playground.server_manager import GradioMCPServer
+
+pytestmark = pytest.mark.skipif(not prefork.HAS_PREFORK, reason="pre-fork needs POSIX fork")
+
+
+@pytest.fixture
+def launcher(tmp_path):
+    # A light preload keeps the zygote fast to start under test
+    launcher = PreforkLauncher(tmp_path / "zygote", preload=("json",), idle_timeout=60)
+    assert launcher.ensure_started(wait=30)
+    yield launcher
+    launcher.shutdown()
+
+
+def _script(tmp_path, name, body):
+    path = tmp_path / name
+    path.write_text(body)
+    return path
+
+
+class TestPreforkLauncher:
+    def test_ensure_started_is_idempotent(self, launcher):
+        pid = launcher.pid_path.read_text().split()[0]
+
+        assert launcher.ensure_started()
+        assert launcher.pid_path.read_text().split()[0] == pid
+
+    def test_spawn_runs_script_with_env_cwd_and_args(self, launcher, tmp_path):
+        app = _script(
+            tmp_path,
+            "app.py",
+            "import os, sys\n"
+            "print(os.environ['GMP_TEST'], os.getcwd(), sys.argv[1:], __name__)\n"
+            "print('oops', file=sys.stderr)\n"
+            "sys.exit(3)\n",
+        )
+        workdir = tmp_path / "work"
+        workdir.mkdir()
+
+        process = launcher.spawn(
+            app,
+            ["--flag"],
+            cwd=workdir,
+            env={"GMP_TEST": "yes"},
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            encoding="utf-8",
+        )
+        assert isinstance(process, ForkedProcess)
+
+        stdout, stderr = process.communicate(timeout=10)
+
+        assert stdout == f"yes {workdir} ['--flag'] __main__\n"
+        assert stderr == "oops\n"
+        assert process.returncode == 3
+
+    def test_uncaught_exception_exits_nonzero(self, launcher, tmp_path):
+        app = _script(tmp_path, "boom.py", "raise ValueError('boom')\n")
+
+        process = launcher.spawn(app, stderr=subprocess.PIPE)
+        _, stderr = process.communicate(timeout=10)
+
+        assert process.returncode == 1
+        assert b"ValueError: boom" in stderr
+
+    def test_terminate_and_wait(self, launcher, tmp_path):
+        app = _script(tmp_path, "sleeper.py", "import time\ntime.sleep(60)\n")
+
+        process = launcher.spawn(app)
+        assert process.poll() is None
+        with pytest.raises(subprocess.TimeoutExpired):
+            process.wait(timeout=0.1)
+
+        process.terminate()
+
+        assert process.wait(timeout=10) == -15
+
+    def test_script_dir_is_prepended_to_sys_path(self, tmp_path, monkeypatch):
+        extra = tmp_path / "extra"
+        extra.mkdir()
+        _script(extra, "extra_mod.py", "VALUE = 'extra'\n")
+        monkeypatch.setenv("PYTHONPATH", str(extra))
+        launcher = PreforkLauncher(tmp_path / "zygote", preload=("json",), idle_timeout=60)
+        assert launcher.ensure_started(wait=30)
+        try:
+            app_dir = tmp_path / "app"
+            app_dir.mkdir()
+            _script(app_dir, "sibling.py", "VALUE = 'sibling'\n")
+            app = _script(
+                app_dir,
+                "app.py",
+                "import extra_mod, sibling\nprint(extra_mod.VALUE, sibling.VALUE)\n",
+            )
+
+            process = launcher.spawn(app, stdout=subprocess.PIPE, encoding="utf-8")
+
+            assert process.communicate(timeout=30)[0] == "extra sibling\n"
+        finally:
+            launcher.shutdown()
+
+    def test_spawn_returns_none_without_zygote(self, tmp_path):
+        launcher = PreforkLauncher(tmp_path / "none", preload=("json",))
+
+        assert launcher.spawn(_script(tmp_path, "a.py", "")) is None
+
+    def test_unconfirmed_spawn_is_not_started_cold(self, tmp_path, monkeypatch):
+        # A zygote that takes the request but never replies may still have forked
+        launcher = PreforkLauncher(tmp_path / "silent", preload=("json",))
+        launcher.state_dir.mkdir(parents=True)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(launcher.socket_path))
+        listener.listen()
+
+        def swallow_request():
+            conn, _ = listener.accept()
+            conn.recv(1 << 16)
+            conn.close()
+
+        thread = threading.Thread(target=swallow_request, daemon=True)
+        thread.start()
+        monkeypatch.setenv("GMP_PREFORK", "1")
+        monkeypatch.setattr(prefork, "_shared_launcher", launcher)
+        monkeypatch.setattr(launcher, "ensure_started", lambda wait=0: True)
+        try:
+            with pytest.raises(OSError, match="did not confirm"):
+                spawn_app(_script(tmp_path, "a.py", ""))
+        finally:
+            thread.join(timeout=5)
+            listener.close()
+
+
+class TestSpawnApp:
+    def test_falls_back_to_popen_when_disabled(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("GMP_PREFORK", "0")
+
+        assert not prefork.prefork_enabled()
+        monkeypatch.delenv("GMP_PREFORK")
+        assert not prefork.prefork_enabled()
+
+        process = spawn_app(_script(tmp_path, "a.py", "print('cold')\n"), stdout=subprocess.PIPE)
+
+        assert isinstance(process, subprocess.Popen)
+        assert process.communicate(timeout=30)[0] == b"cold\n"
+
+    def test_gradio_server_start_uses_zygote(self, launcher, tmp_path, monkeypatch):
+        monkeypatch.setenv("GMP_PREFORK", "1")
+        monkeypatch.setattr(prefork, "_shared_launcher", launcher)
+        monkeypatch.setattr(port_allocator, "_shared_allocator", PortAllocator(tmp_path / "ports"))
+        run_dir = tmp_path / "run"
+        monkeypatch.setattr(GradioMCPServer, "run_registry_dir", staticmethod(lambda: run_dir))
+        app_dir = tmp_path / "server"
+        app_dir.mkdir()
+        app = _script(app_dir, "app.py", "import time\ntime.sleep(60)\n")
+
+        server = GradioMCPServer(app)
+        started = time.monotonic()
+        process = server.start(port=7996)
+        launch_time = time.monotonic() - started
+        try:
+            assert isinstance(process, ForkedProcess)
+            assert launch_time < 1.0
+            assert GradioMCPServer.find_running_servers()[0]["running"] is True
+        finally:
+            server.stop()
+
+        assert process.returncode is not None
+        assert GradioMCPServer.find_running_servers() == []
@@ -0,0 +1,97 @@
+"""Tests for launch readiness probes"""
+
+import http.server
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from gradio_mcp_playground.readiness import probe_port, wait_until_ready
+
+
+def _unused_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    status = 200
+
+    def do_GET(self):
+        self.send_response(self.status)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def http_server():
+    servers = []
+
+    def start(status=200, delay=0.0):
+        port = _unused_port()
+        handler = type("Handler", (_Handler,), {"status": status})
+
+        def serve():
+            time.sleep(delay)
+            server = http.server.HTTPServer(("127.0.0.1", port), handler)
+            servers.append(server)
+            server.serve_forever()
+
+        threading.Thread(target=serve, daemon=True).start()
+        return port
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestReadiness:
+    def test_waits_for_late_listener(self, http_server):
+        port = http_server(delay=0.3)
+
+        result = wait_until_ready(port, timeout=5)
+
+        assert result.ready
+        assert 0.25 < result.elapsed < 5
+        assert result.attempts > 1
+
+    def test_server_errors_are_not_ready(self, http_server):
+        port = http_server(status=503)
+        wait_until_ready(port, timeout=5, http_path=None)
+
+        result = wait_until_ready(port, timeout=0.3)
+
+        assert not result.ready
+        assert "503" in result.reason
+
+    def test_deadline(self):
+        port = _unused_port()
+
+        result = wait_until_ready(port, timeout=0.2)
+
+        assert not result.ready
+        assert f"port {port}" in result.reason
+        assert result.elapsed < 1.5
+
+    def test_exited_process_fails_fast(self):
+        process = subprocess.Popen([sys.executable, "-c", "import sys; sys.exit(3)"])
+
+        result = wait_until_ready(_unused_port(), process=process, timeout=30)
+
+        assert not result.ready
+        assert result.exit_code == 3
+        assert result.elapsed < 10
+
+    def test_probe_port(self, http_server):
+        port = http_server()
+        wait_until_ready(port, timeout=5)
+
+        assert probe_port(port) is None
+        assert probe_port(_unused_port()).startswith("connect failed")
@@ -0,0 +1,204 @@
+"""Tests for the registry search index"""
+
+import asyncio
+import importlib.util
+from pathlib import Path
+
+import pytest
+
+from gradio_mcp_playground.registry import ServerRegistry
+from gradio_mcp_playground.search_index import (
+    HAS_NUMPY,
+    STOPWORDS,
+    SearchIndex,
+    TfidfMatrix,
+    TrigramIndex,
+    tokenize,
+    top_indices,
+)
+
+if HAS_NUMPY:
+    import numpy as np
+
+
+@pytest.fixture
+def index():
+    index = SearchIndex({"id": 3.0, "name": 2.0, "description": 1.0})
+    index.add("filesystem", {"id": "filesystem", "name": "Filesystem", "description": "Read files"})
+    index.add(
+        "backup",
+        {"id": "backup", "name": "Backup", "description": "Copies files from the filesystem"},
+    )
+    index.add("brave-search", {"id": "brave-search", "name": "Brave Search", "description": "Web"})
+    return index
+
+
+class TestSearchIndex:
+    def test_tokenize(self):
+        assert tokenize("Brave-Search @mcp/server_2") == ["brave", "search", "mcp", "server", "2"]
+
+    def test_name_match_outranks_description_mention(self, index):
+        assert [doc for doc, _ in index.search("filesystem")] == ["filesystem", "backup"]
+
+    def test_prefix_matching(self, index):
+        assert [doc for doc, _ in index.search("fil")] == ["filesystem", "backup"]
+        # A whole-word match beats a prefix match
+        whole = dict(index.search("files"))
+        assert whole["backup"] > dict(index.search("file"))["backup"]
+
+    def test_every_token_must_match(self, index):
+        assert [doc for doc, _ in index.search("brave web")] == ["brave-search"]
+        assert index.search("brave files") == []
+        assert index.search("") == []
+
+    def test_short_tokens_match_whole_words_only(self, index):
+        index.add("ai", {"id": "ai", "name": "AI", "description": "Models"})
+        assert [doc for doc, _ in index.search("ai")] == ["ai"]
+        assert index.search("fi") == []
+
+    def test_filter_limit_and_updates(self, index):
+        assert index.search("files", where=lambda doc: doc != "filesystem")[0][0] == "backup"
+        assert len(index.search("files", limit=1)) == 1
+
+        index.remove("backup")
+        index.add("notes", {"id": "notes", "name": "Notes", "description": "Markdown files"})
+        assert sorted(doc for doc, _ in index.search("files")) == ["filesystem", "notes"]
+        assert len(index) == 3
+
+    def test_copies_are_independent(self, index):
+        copy = index.copy()
+        assert copy._built is index._built
+
+        copy.remove("filesystem")
+        assert [doc for doc, _ in copy.search("filesystem")] == ["backup"]
+        assert [doc for doc, _ in index.search("filesystem")] == ["filesystem", "backup"]
+
+
+class TestFuzzySearch:
+    def test_trigram_similarity(self):
+        trigram_index = TrigramIndex(["filesystem", "files", "github", "search"])
+
+        assert trigram_index.similar("filesytem")[0][0] == "filesystem"
+        assert [term for term, _ in trigram_index.similar("serch")] == ["search"]
+        assert trigram_index.similar("zzzz") == []
+        assert len(trigram_index.similar("file", threshold=0.0, limit=2)) == 2
+
+    def test_typos_fall_back_to_similar_terms(self, index):
+        fuzzy = SearchIndex(index.field_weights, fuzzy=True)
+        for doc_id, fields in (
+            ("filesystem", {"id": "filesystem", "name": "Filesystem"}),
+            ("search", {"id": "search", "name": "Brave Search"}),
+        ):
+            fuzzy.add(doc_id, fields)
+
+        assert [doc for doc, _ in fuzzy.search("brave serch")] == ["search"]
+        assert fuzzy.search("filesytem")[0][0] == "filesystem"
+        # Correctly spelled words never pick up fuzzy matches
+        assert [doc for doc, _ in fuzzy.search("search")] == ["search"]
+        assert index.search("filesytem") == []
+
+    def test_match_any(self, index):
+        ranked = [doc for doc, _ in index.search("brave files", match_all=False)]
+        assert sorted(ranked) == ["backup", "brave-search", "filesystem"]
+        assert index.search("unknown words", match_all=False) == []
+
+
+@pytest.mark.skipif(not HAS_NUMPY, reason="numpy not installed")
+class TestTfidfMatrix:
+    def test_scores_are_cosine_similarities(self):
+        matrix = TfidfMatrix(
+            {
+                "calc": "calculator math math",
+                "plot": "math charts",
+                "scrape": "web pages",
+                "empty": "",
+            }
+        )
+
+        scores = matrix.scores("math calculator")
+        assert scores.argmax() == 0
+        assert scores[2] == scores[3] == 0
+        assert np.isclose(matrix.scores("web pages")[2], 1.0)
+        assert not matrix.scores("unknown").any()
+
+    def test_stopwords_are_ignored(self):
+        matrix = TfidfMatrix({"calc": "a calculator for the math", "plot": "the charts"}, STOPWORDS)
+
+        assert not matrix.scores("for the").any()
+        assert np.isclose(matrix.scores("calculator math")[0], 1.0)
+
+    def test_top_indices(self):
+        scores = np.array([0.5, 0.9, 0.0, 0.5, 0.7])
+
+        assert top_indices(scores).tolist() == [1, 4, 0, 3]
+        assert top_indices(scores, limit=2).tolist() == [1, 4]
+        assert top_indices(scores, min_score=0.6).tolist() == [1, 4]
+        assert top_indices(scores, limit=0).tolist() == []
+
+
+class TestRegistrySearch:
+    @pytest.fixture
+    def registry(self, tmp_path):
+        registry = ServerRegistry()
+        registry.custom_registry_path = tmp_path / "custom_registry.json"
+        return registry
+
+    def test_exact_id_first_and_category_filter(self, registry):
+        results = registry.search_mcp_servers("memory")
+        assert results[0]["id"] == "memory"
+        assert results[0]["type"] == "mcp_server"
+
+        assert all(
+            server["category"] == "official"
+            for server in registry.search_mcp_servers("server", category="official")
+        )
+
+    def test_empty_query_returns_everything(self, registry):
+        assert len(registry.search_mcp_servers("")) == len(registry.mcp_servers)
+        assert len(registry.search_templates("  ")) == len(registry.templates)
+
+    def test_templates_searchable_by_tag_prefix(self, registry):
+        assert [t["id"] for t in registry.search_templates("stable-diff")] == ["image-generator"]
+
+    def test_misspelled_queries(self, registry):
+        assert registry.search("filesytem")[0]["id"] == "filesystem"
+        assert registry.search("brave serch")[0]["id"] == "brave-search"
+
+    def test_custom_servers_are_indexed(self, registry):
+        registry.add_custom_server(
+            "weather", "Weather Server", "Forecasts", "tools", "https://example.com", ["forecast"]
+        )
+        assert registry.search_templates("forecast")[0]["id"] == "weather"
+
+        assert registry.remove_custom_server("weather")
+        assert registry.search_templates("forecast") == []
+
+    def test_instances_share_the_builtin_snapshot(self, registry, tmp_path):
+        registry.add_custom_server(
+            "weather", "Weather Server", "Forecasts", "tools", "https://example.com", ["forecast"]
+        )
+        other = ServerRegistry()
+        other.custom_registry_path = tmp_path / "other.json"
+
+        assert other.search_templates("forecast") == []
+        assert "weather" not in ServerRegistry._builtin[1]
+        assert other._mcp_index._built is ServerRegistry._builtin[2]._built
+
+
+def test_enhanced_registry_search():
+    spec = importlib.util.spec_from_file_location(
+        "enhanced_registry",
+        Path(__file__).resolve().parent.parent / "agent" / "core" / "registry.py",
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    registry = module.EnhancedRegistry()
+
+    results = asyncio.run(registry.search_servers("i need a calculater"))
+    assert results[0]["id"] == "calculator"
+    assert results[0]["search_score"] > 0
+
+    registry.add_custom_server({"id": "weather", "name": "Weather", "tags": ["forecast"]})
+    assert asyncio.run(registry.search_servers("wether"))[0]["id"] == "weather"
+    assert registry.remove_server("weather")
+    assert asyncio.run(registry.search_servers("weather")) == []
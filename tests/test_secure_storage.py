@@ -1,11 +1,16 @@
 """Test secure storage functionality"""
 
+import base64
+import json
 import os
 import tempfile
+import threading
 import pytest
 from pathlib import Path
 
 from gradio_mcp_playground.secure_storage import (
+    COMPACTION_SLACK,
+    KEYS_FILE_HEADER,
     SecureStorage,
     SecureTokenStorage,
     get_secure_storage,
@@ -255,6 +260,161 @@ def test_get_secure_storage():
     assert isinstance(storage, SecureStorage)
 
 
+@pytest.mark.skipif(not HAS_CRYPTOGRAPHY, reason="cryptography package not installed")
+class TestUnlockedKeyring:
+    """Test the process-wide keyring and decrypted key view"""
+
+    def test_key_derived_once_per_salt(self, tmp_path, monkeypatch):
+        """Constructing SecureStorage repeatedly runs PBKDF2 only once"""
+        from gradio_mcp_playground import secure_storage as storage_module
+
+        calls = []
+        real_kdf = storage_module.PBKDF2HMAC
+
+        def counting_kdf(*args, **kwargs):
+            calls.append(kwargs.get("salt"))
+            return real_kdf(*args, **kwargs)
+
+        monkeypatch.setattr(storage_module, "PBKDF2HMAC", counting_kdf)
+
+        first = SecureStorage(config_dir=tmp_path)
+        first.store_key("service", "key", "value")
+        for _ in range(3):
+            assert SecureStorage(config_dir=tmp_path).retrieve_key("service", "key") == "value"
+
+        assert len(calls) == 1
+
+    def test_view_follows_other_writers(self, tmp_path):
+        """A cached decrypted view is refreshed when the key file changes"""
+        reader = SecureStorage(config_dir=tmp_path)
+        writer = SecureStorage(config_dir=tmp_path)
+
+        writer.store_key("service", "key", "one")
+        assert reader.retrieve_key("service", "key") == "one"
+
+        writer.update_key("service", "key", "two")
+        assert reader.retrieve_key("service", "key") == "two"
+
+        writer.clear_all_keys()
+        assert reader.retrieve_key("service", "key") is None
+
+    def test_snapshot_not_mutated_by_writes(self, tmp_path):
+        """Callers modifying loaded keys do not corrupt the cached view"""
+        storage = SecureStorage(config_dir=tmp_path)
+        storage.store_key("service", "key", "value")
+
+        keys = storage._load_keys()
+        keys["service"]["other"] = {"value": "bogus"}
+
+        assert storage.list_keys("service") == ["key"]
+
+
+@pytest.mark.skipif(not HAS_CRYPTOGRAPHY, reason="cryptography package not installed")
+class TestKeyRecordLog:
+    """Test the append-only, per-record encrypted key file"""
+
+    def test_store_many_is_one_append(self, tmp_path):
+        """A batch of keys is written as one append of individually encrypted records"""
+        storage = SecureStorage(config_dir=tmp_path)
+        storage.store_key("existing", "key", "value")
+        size_before = storage.keys_file.stat().st_size
+
+        assert storage.store_many({"server": {f"KEY_{i}": f"value-{i}" for i in range(10)}})
+
+        data = storage.keys_file.read_bytes()
+        assert data.startswith(KEYS_FILE_HEADER)
+        assert len(data[len(KEYS_FILE_HEADER):].splitlines()) == 11
+        assert storage.keys_file.stat().st_size > size_before
+        assert storage.retrieve_server_keys("server")["KEY_9"] == "value-9"
+        assert storage.retrieve_key("existing", "key") == "value"
+
+    def test_no_lost_updates_between_instances(self, tmp_path):
+        """Writers that loaded the keys earlier do not overwrite each other"""
+        first = SecureStorage(config_dir=tmp_path)
+        second = SecureStorage(config_dir=tmp_path)
+        first.list_services()
+        second.list_services()
+
+        assert first.store_key("a", "key", "1")
+        assert second.store_key("b", "key", "2")
+        assert first.delete_key("a", "key")
+
+        fresh = SecureStorage(config_dir=tmp_path)
+        assert fresh.list_services() == ["b"]
+        assert fresh.retrieve_key("b", "key") == "2"
+
+    def test_update_keeps_created_at(self, tmp_path):
+        """Updating a key keeps its creation time"""
+        storage = SecureStorage(config_dir=tmp_path)
+        storage.store_key("service", "key", "one")
+        created_at = storage.get_key_info("service", "key")["created_at"]
+
+        storage.update_key("service", "key", "two")
+
+        info = storage.get_key_info("service", "key")
+        assert info["created_at"] == created_at
+        assert storage.retrieve_key("service", "key") == "two"
+
+    def test_log_is_compacted(self, tmp_path):
+        """Rewriting the same key many times keeps the file bounded"""
+        storage = SecureStorage(config_dir=tmp_path)
+        for i in range(COMPACTION_SLACK * 3):
+            storage.store_key("service", "key", f"value-{i}")
+
+        lines = storage.keys_file.read_bytes()[len(KEYS_FILE_HEADER):].splitlines()
+        assert len(lines) <= COMPACTION_SLACK + 1
+        assert SecureStorage(config_dir=tmp_path).retrieve_key("service", "key") == (
+            f"value-{COMPACTION_SLACK * 3 - 1}"
+        )
+
+    def test_legacy_file_is_migrated(self, tmp_path):
+        """Keys in the old single-blob format are readable and migrated on write"""
+        storage = SecureStorage(config_dir=tmp_path)
+        legacy_value = base64.urlsafe_b64encode(storage.cipher.encrypt(b"legacy")).decode()
+        legacy = {
+            "old": {"key": {"value": legacy_value, "created_at": "then", "updated_at": "then"}}
+        }
+        storage.keys_file.write_bytes(storage.cipher.encrypt(json.dumps(legacy).encode()))
+
+        assert storage.retrieve_key("old", "key") == "legacy"
+
+        storage.store_key("new", "key", "value")
+
+        assert storage.keys_file.read_bytes().startswith(KEYS_FILE_HEADER)
+        fresh = SecureStorage(config_dir=tmp_path)
+        assert fresh.retrieve_key("old", "key") == "legacy"
+        assert fresh.retrieve_key("new", "key") == "value"
+
+    def test_concurrent_writers_keep_all_keys(self, tmp_path):
+        """Keys stored by several writers at once all survive
+
+        Each writer has its own instance and file handle, so the advisory lock
+        serializes them exactly as it would separate processes.
+        """
+        SecureStorage(config_dir=tmp_path)  # create the salt up front
+
+        def writer(n):
+            storage = SecureStorage(config_dir=tmp_path)
+            for i in range(10):
+                assert storage.store_key(f"proc{n}", f"key{i}", f"value{i}")
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=60)
+
+        storage = SecureStorage(config_dir=tmp_path)
+        assert sorted(storage.list_services()) == ["proc0", "proc1", "proc2", "proc3"]
+        assert all(len(storage.list_keys(f"proc{n}")) == 10 for n in range(4))
+
+
+@pytest.mark.skipif(not HAS_CRYPTOGRAPHY, reason="cryptography package not installed")
+def test_get_secure_storage_is_shared():
+    """get_secure_storage returns one instance per process"""
+    assert get_secure_storage() is get_secure_storage()
+
+
 def test_get_secure_storage_without_cryptography(monkeypatch):
     """Test get_secure_storage returns None when cryptography is not available"""
     # Mock HAS_CRYPTOGRAPHY to False
@@ -0,0 +1,200 @@
+"""Tests for GradioMCPServer process tracking and log parsing"""
+
+import json
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from gradio_mcp_playground import port_allocator, server_manager
+from gradio_mcp_playground.port_allocator import PortAllocator
+from gradio_mcp_playground.server_manager import GradioMCPServer
+from gradio_mcp_playground.utils import tail_lines
+
+
+@pytest.fixture
+def registry_dir(tmp_path, monkeypatch):
+    run_dir = tmp_path / "run"
+    monkeypatch.setattr(GradioMCPServer, "run_registry_dir", staticmethod(lambda: run_dir))
+    monkeypatch.setattr(port_allocator, "_shared_allocator", PortAllocator(tmp_path / "ports"))
+    monkeypatch.setenv("GMP_PREFORK", "0")
+    return run_dir
+
+
+@pytest.fixture
+def app_path(tmp_path):
+    app_dir = tmp_path / "app"
+    app_dir.mkdir()
+    app = app_dir / "app.py"
+    app.write_text("import time\ntime.sleep(60)\n")
+    return app
+
+
+class TestRunRegistry:
+    def test_start_registers_and_stop_deregisters(self, registry_dir, app_path):
+        server = GradioMCPServer(app_path)
+        server.start(port=7999)
+        try:
+            running = GradioMCPServer.find_running_servers()
+            assert len(running) == 1
+            assert running[0]["app_path"] == str(app_path)
+            assert running[0]["port"] == server.port
+            assert running[0]["running"] is True
+            assert (app_path.parent / ".mcp_server.json").exists()
+            assert port_allocator.get_port_allocator().reservations()[server.port]["pid"] == (
+                server.process.pid
+            )
+        finally:
+            server.stop()
+
+        assert GradioMCPServer.find_running_servers() == []
+        assert port_allocator.get_port_allocator().reservations() == {}
+        assert not (app_path.parent / ".mcp_server.json").exists()
+
+    def test_dead_process_reported_not_running(self, registry_dir, app_path):
+        server = GradioMCPServer(app_path)
+        server.start(port=7998)
+        server.process.kill()
+        server.process.wait()
+
+        running = GradioMCPServer.find_running_servers()
+        assert len(running) == 1
+        assert running[0]["running"] is False
+
+        GradioMCPServer.deregister_server(app_path)
+        assert GradioMCPServer.find_running_servers() == []
+
+    @pytest.mark.skipif(not server_manager.HAS_PSUTIL, reason="psutil not installed")
+    def test_recycled_pid_reported_not_running(self, registry_dir, app_path):
+        registry_dir.mkdir()
+        record = {
+            "pid": os.getpid(),
+            "port": 7997,
+            "app_path": str(app_path),
+            "create_time": 0.0,
+        }
+        (registry_dir / "stale.json").write_text(json.dumps(record))
+
+        assert GradioMCPServer.find_running_servers()[0]["running"] is False
+
+    def test_scan_ignores_working_tree(self, registry_dir, tmp_path, monkeypatch):
+        # A stray per-app record in the working tree is no longer discovered
+        (tmp_path / "nested").mkdir()
+        (tmp_path / "nested" / ".mcp_server.json").write_text(
+            json.dumps({"pid": os.getpid(), "port": 1, "app_path": sys.executable})
+        )
+        monkeypatch.chdir(tmp_path)
+
+        assert GradioMCPServer.find_running_servers() == []
+
+
+class TestReadiness:
+    def test_wait_until_serving(self, registry_dir, tmp_path):
+        app = tmp_path / "http_app.py"
+        app.write_text(
+            "import http.server, os\n"
+            "port = int(os.environ['GRADIO_SERVER_PORT'])\n"
+            "http.server.HTTPServer(('127.0.0.1', port), http.server.SimpleHTTPRequestHandler)"
+            ".serve_forever()\n"
+        )
+        server = GradioMCPServer(app)
+        server.start(port=7996)
+        try:
+            result = server.wait_until_ready(timeout=30)
+        finally:
+            server.stop()
+
+        assert result.ready, result.reason
+        assert server.ready_seconds == result.elapsed
+
+    def test_crash_reported_with_exit_code(self, registry_dir, tmp_path):
+        app = tmp_path / "crash.py"
+        app.write_text("raise SystemExit(4)\n")
+        server = GradioMCPServer(app)
+        server.start(port=7995)
+        try:
+            result = server.wait_until_ready(timeout=30)
+        finally:
+            server.stop()
+
+        assert not result.ready
+        assert result.exit_code == 4
+        assert server.ready_seconds is None
+
+
+def _log_line(ts: datetime, level: str, message: str) -> str:
+    return f"{ts.strftime('%Y-%m-%dT%H:%M:%S.000Z')} [server] [{level}] {message}\n"
+
+
+class TestClaudeLogParsing:
+    def test_tail_lines_reads_from_end(self, tmp_path):
+        log_file = tmp_path / "big.log"
+        log_file.write_text("".join(f"line {i}\n" for i in range(10000)))
+
+        assert tail_lines(log_file, 2) == ["line 9998\n", "line 9999\n"]
+        assert tail_lines(log_file, 3, block_size=5) == [
+            "line 9997\n",
+            "line 9998\n",
+            "line 9999\n",
+        ]
+        assert tail_lines(log_file, 0) == []
+
+    def test_status_updates_incrementally(self, tmp_path, monkeypatch):
+        log_file = tmp_path / "mcp-server-demo.log"
+        now = datetime.now(timezone.utc)
+        log_file.write_text(
+            _log_line(now - timedelta(hours=1), "info", "Server started and connected successfully")
+        )
+
+        status = GradioMCPServer._parse_claude_server_log(log_file)
+        assert status["running"] is True
+        assert status["status_message"] == "Running"
+
+        # Later refreshes only parse appended bytes
+        parsed = []
+        original = server_manager._ClaudeLogState._parse_lines
+        monkeypatch.setattr(
+            server_manager._ClaudeLogState,
+            "_parse_lines",
+            lambda self, lines: (parsed.extend(lines), original(self, lines)),
+        )
+        with open(log_file, "a") as f:
+            f.write(_log_line(now, "info", "Client transport closed"))
+
+        status = GradioMCPServer._parse_claude_server_log(log_file)
+        assert status["status_message"] == "Disconnected"
+        assert len(parsed) == 1
+
+        reparsed = GradioMCPServer._parse_claude_server_log(log_file)
+        assert reparsed["status_message"] == "Disconnected"
+        assert len(parsed) == 1
+
+    def test_partial_line_waits_for_newline(self, tmp_path):
+        log_file = tmp_path / "mcp-server-partial.log"
+        now = datetime.now(timezone.utc)
+        line = _log_line(now, "error", "Server disconnected")
+        log_file.write_text(line[:20])
+
+        assert GradioMCPServer._parse_claude_server_log(log_file)["errors"] == []
+
+        with open(log_file, "a") as f:
+            f.write(line[20:])
+
+        status = GradioMCPServer._parse_claude_server_log(log_file)
+        assert status["errors"] == ["Server disconnected"]
+        assert status["status_message"] == "Error"
+
+    def test_truncated_log_is_reparsed(self, tmp_path):
+        log_file = tmp_path / "mcp-server-rotated.log"
+        now = datetime.now(timezone.utc)
+        log_file.write_text(
+            _log_line(now, "info", "Server started and connected successfully") * 50
+        )
+        assert GradioMCPServer._parse_claude_server_log(log_file)["running"] is True
+
+        log_file.write_text(_log_line(now, "error", "Server disconnected"))
+
+        status = GradioMCPServer._parse_claude_server_log(log_file)
+        assert status["running"] is False
+        assert status["errors"] == ["Server disconnected"]